@@ -0,0 +1,18 @@
+import pytest
+
+
+@pytest.fixture(scope='session')
+def django_db_setup(request, django_test_environment, django_db_blocker):
+    """Тестовая БД pytest из того же снимка, что и у manage.py test."""
+    from core.testing import (
+        TEST_SETTINGS, setup_snapshot_databases, teardown_snapshot_databases,
+    )
+
+    verbosity = request.config.option.verbose
+    with django_db_blocker.unblock():
+        old_config = setup_snapshot_databases(verbosity=verbosity)
+    TEST_SETTINGS.enable()
+    yield
+    TEST_SETTINGS.disable()
+    with django_db_blocker.unblock():
+        teardown_snapshot_databases(old_config, verbosity=verbosity)
@@ -0,0 +1,88 @@
+from http import HTTPStatus
+
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import Group, Post
+
+
+User = get_user_model()
+
+
+class ApiTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.guest_client = Client()
+        cls.user = User.objects.create_user(
+            username='auth', first_name='Иван', last_name='Иванов'
+        )
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        for i in range(1, 16):
+            Post.objects.create(
+                author=cls.user,
+                text=f'Пост {i}',
+                group=cls.group if i % 2 else None,
+            )
+
+    def test_post_list_cursor_pagination(self):
+        """Курсор проходит ленту без пропусков и повторов."""
+        url = reverse('api:post_list') + '?limit=4'
+        texts = []
+        while url:
+            data = self.guest_client.get(url).json()
+            texts += [post['text'] for post in data['results']]
+            url = data['next']
+        self.assertEqual(texts, [f'Пост {i}' for i in range(15, 0, -1)])
+
+    def test_fields_selection(self):
+        """?fields= оставляет в ответе только запрошенные поля."""
+        response = self.guest_client.get(
+            reverse('api:post_list'), {'fields': 'id,author,unknown'}
+        )
+        post = response.json()['results'][0]
+        self.assertEqual(set(post), {'id', 'author'})
+        self.assertEqual(post['author'], 'auth')
+
+    def test_group_and_profile(self):
+        """Лента группы и автора содержит только их посты."""
+        data = self.guest_client.get(
+            reverse('api:group_posts', args=(self.group.slug,))
+        ).json()
+        self.assertEqual(data['group']['title'], self.group.title)
+        self.assertTrue(all(
+            post['group'] == self.group.slug for post in data['results']
+        ))
+        data = self.guest_client.get(
+            reverse('api:profile_posts', args=(self.user.username,))
+        ).json()
+        self.assertEqual(data['author']['full_name'], 'Иван Иванов')
+        self.assertEqual(len(data['results']), 10)
+
+    def test_post_detail_and_not_found(self):
+        """Пост отдаётся по id, несуществующие объекты дают 404."""
+        post = Post.objects.first()
+        data = self.guest_client.get(
+            reverse('api:post_detail', args=(post.id,))
+        ).json()
+        self.assertEqual(data['text'], post.text)
+        for url in (
+            reverse('api:post_detail', args=(0,)),
+            reverse('api:group_posts', args=('unknown',)),
+            reverse('api:profile_posts', args=('unknown',)),
+        ):
+            with self.subTest(url=url):
+                response = self.guest_client.get(url)
+                self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+
+    def test_etag_not_modified(self):
+        """Повторный запрос с тем же ETag получает 304."""
+        url = reverse('api:post_list')
+        etag = self.guest_client.get(url)['ETag']
+        response = self.guest_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
@@ -0,0 +1,147 @@
+import hashlib
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.views.decorators.http import require_safe
+
+from posts.models import Group, Post, User
+from posts.pagination import paginate_by_cursor
+from posts.views import DISPLAYED_POSTS
+
+
+MAX_LIMIT = 100
+
+# Публичное имя поля -> выражение для values().
+POST_FIELDS = {
+    'id': 'id',
+    'text': 'text',
+    'pub_date': 'pub_date',
+    'author': 'author__username',
+    'group': 'group__slug',
+}
+
+
+def json_response(request, data, status=200):
+    """
+    Компактный JSON с ETag: если клиент прислал тот же ETag,
+    отдаём 304 без тела.
+    """
+    content = json.dumps(
+        data,
+        cls=DjangoJSONEncoder,
+        ensure_ascii=False,
+        separators=(',', ':'),
+    ).encode()
+    etag = '"%s"' % hashlib.md5(content).hexdigest()
+    if status == 200:
+        response = get_conditional_response(request, etag=etag)
+        if response is not None:
+            return response
+    response = HttpResponse(
+        content,
+        status=status,
+        content_type='application/json; charset=utf-8',
+    )
+    response['ETag'] = etag
+    return response
+
+
+def not_found(request):
+    return json_response(request, {'detail': 'Не найдено.'}, status=404)
+
+
+def selected_fields(request):
+    """Поля из ?fields=, по умолчанию все."""
+    requested = request.GET.get('fields')
+    if not requested:
+        return list(POST_FIELDS)
+    fields = [
+        name for name in requested.split(',') if name in POST_FIELDS
+    ]
+    return fields or list(POST_FIELDS)
+
+
+def get_limit(request):
+    try:
+        limit = int(request.GET.get('limit', DISPLAYED_POSTS))
+    except ValueError:
+        return DISPLAYED_POSTS
+    return min(max(limit, 1), MAX_LIMIT)
+
+
+def serialize_rows(rows, fields):
+    return [
+        {name: row[POST_FIELDS[name]] for name in fields} for row in rows
+    ]
+
+
+def post_page(request, queryset):
+    """
+    Страница постов через values(): модели не создаются,
+    из базы читаются только запрошенные поля и ключ курсора.
+    """
+    fields = selected_fields(request)
+    columns = {POST_FIELDS[name] for name in fields} | {'id', 'pub_date'}
+    rows, next_cursor = paginate_by_cursor(
+        queryset.values(*columns),
+        request.GET.get('cursor'),
+        get_limit(request),
+    )
+    next_url = None
+    if next_cursor:
+        query = request.GET.copy()
+        query['cursor'] = next_cursor
+        next_url = f'{request.path}?{query.urlencode()}'
+    return {
+        'results': serialize_rows(rows, fields),
+        'next': next_url,
+    }
+
+
+@require_safe
+def post_list(request):
+    return json_response(request, post_page(request, Post.objects.all()))
+
+
+@require_safe
+def group_posts(request, slug):
+    group = Group.objects.filter(slug=slug).values(
+        'id', 'title', 'slug', 'description'
+    ).first()
+    if group is None:
+        return not_found(request)
+    data = post_page(request, Post.objects.filter(group_id=group['id']))
+    data['group'] = {
+        'title': group['title'],
+        'slug': group['slug'],
+        'description': group['description'],
+    }
+    return json_response(request, data)
+
+
+@require_safe
+def profile_posts(request, username):
+    author = User.objects.filter(username=username).values(
+        'id', 'username', 'first_name', 'last_name'
+    ).first()
+    if author is None:
+        return not_found(request)
+    data = post_page(request, Post.objects.filter(author_id=author['id']))
+    data['author'] = {
+        'username': author['username'],
+        'full_name': f'{author["first_name"]} {author["last_name"]}'.strip(),
+    }
+    return json_response(request, data)
+
+
+@require_safe
+def post_detail(request, post_id):
+    fields = selected_fields(request)
+    row = Post.objects.filter(id=post_id).values(
+        *{POST_FIELDS[name] for name in fields}
+    ).first()
+    if row is None:
+        return not_found(request)
+    return json_response(request, serialize_rows([row], fields)[0])
@@ -0,0 +1,106 @@
+import json
+
+from django.contrib import admin
+from django.utils.html import format_html, format_html_join
+
+from .models import RequestProfile, SlowQuery
+from .profiling import top_functions
+
+
+class RequestProfileAdmin(admin.ModelAdmin):
+    list_display = (
+        'pk',
+        'created',
+        'method',
+        'path',
+        'status_code',
+        'duration',
+        'query_count',
+        'query_duration',
+        'user',
+    )
+    list_filter = ('method', 'status_code')
+    search_fields = ('path',)
+    fields = (
+        'created',
+        'method',
+        'path',
+        'status_code',
+        'user',
+        'duration',
+        'query_count',
+        'query_duration',
+        'stats_file',
+        'top_functions_table',
+        'queries_table',
+    )
+    readonly_fields = fields
+    empty_value_display = '-пусто-'
+
+    def has_add_permission(self, request):
+        return False
+
+    def top_functions_table(self, profile):
+        rows = format_html_join(
+            '',
+            '<tr><td>{}</td><td>{}</td><td>{}</td><td>{}</td></tr>',
+            (
+                (f'{row["cumulative"]:.2f}', f'{row["total"]:.2f}',
+                 row['calls'], row['function'])
+                for row in top_functions(profile.stats_file)
+            ),
+        )
+        return format_html(
+            '<table><tr><th>cumtime, мс</th><th>tottime, мс</th>'
+            '<th>вызовов</th><th>функция</th></tr>{}</table>',
+            rows,
+        )
+    top_functions_table.short_description = 'Топ функций'
+
+    def queries_table(self, profile):
+        queries = json.loads(profile.queries or '[]')
+        rows = format_html_join(
+            '',
+            '<tr><td>{}</td><td><code>{}</code></td></tr>',
+            ((f'{query["time"]:.2f}', query['sql']) for query in queries),
+        )
+        return format_html(
+            '<table><tr><th>мс</th><th>SQL</th></tr>{}</table>', rows
+        )
+    queries_table.short_description = 'SQL-запросы'
+
+
+admin.site.register(RequestProfile, RequestProfileAdmin)
+
+
+class SlowQueryAdmin(admin.ModelAdmin):
+    list_display = (
+        'pk',
+        'url_name',
+        'call_site',
+        'count',
+        'max_duration',
+        'total_duration',
+        'last_seen',
+    )
+    list_filter = ('url_name',)
+    search_fields = ('sql', 'call_site')
+    readonly_fields = (
+        'fingerprint',
+        'sql',
+        'plan',
+        'call_site',
+        'url_name',
+        'count',
+        'total_duration',
+        'max_duration',
+        'first_seen',
+        'last_seen',
+    )
+    empty_value_display = '-пусто-'
+
+    def has_add_permission(self, request):
+        return False
+
+
+admin.site.register(SlowQuery, SlowQueryAdmin)
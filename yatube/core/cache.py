@@ -0,0 +1,88 @@
+import math
+import random
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+MISSING = object()
+
+
+def needs_early_refresh(soft_expires, delta, now=None, beta=None):
+    """
+    Вероятностное раннее обновление (XFetch): чем ближе мягкое истечение
+    и чем дольше считается значение (delta), тем вероятнее, что запрос
+    пересчитает его заранее. Пересчёты разных процессов размазываются
+    по времени вместо одновременного промаха в момент истечения.
+    """
+    now = time.time() if now is None else now
+    beta = settings.CACHE_XFETCH_BETA if beta is None else beta
+    # 1 - random() лежит в (0, 1], логарифм от нуля не берётся.
+    return now - delta * beta * math.log(1 - random.random()) >= soft_expires
+
+
+def wait_for_value(key, lock_key, version):
+    """
+    Ждёт, пока держатель блокировки положит значение нужной версии.
+    MISSING, если блокировка снята без записи (значение не кэшируется)
+    или не снята за CACHE_LOCK_TIMEOUT.
+    """
+    deadline = time.monotonic() + settings.CACHE_LOCK_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(settings.CACHE_LOCK_POLL)
+        entry = cache.get(key)
+        if entry is not None and entry[1] == version:
+            return entry[0]
+        if cache.get(lock_key) is None:
+            break
+    return MISSING
+
+
+def store(key, value, version, timeout, delta):
+    cache.set(
+        key,
+        (value, version, time.time() + timeout, delta),
+        timeout + settings.CACHE_STALE_TIMEOUT,
+    )
+
+
+def get_or_compute(key, compute, timeout, version=None, should_cache=None):
+    """
+    Значение из кэша по стабильному ключу key или compute().
+
+    Запись хранит версию данных и мягкий срок timeout; жёсткий срок
+    в кэше на CACHE_STALE_TIMEOUT длиннее. Устаревшую (другая версия,
+    мягкий срок прошёл или сработал needs_early_refresh) запись
+    пересчитывает один запрос - тот, кто взял блокировку key:lock.
+    Остальные в это время отдают устаревшее значение, а если записи нет
+    совсем - ждут результата до CACHE_LOCK_TIMEOUT секунд.
+    should_cache(value) позволяет не сохранять значение (например,
+    ответ с ошибкой).
+    """
+    entry = cache.get(key)
+    if entry is not None:
+        value, entry_version, soft_expires, delta = entry
+        if entry_version == version and not needs_early_refresh(
+            soft_expires, delta
+        ):
+            return value
+    lock_key = f'{key}:lock'
+    locked = cache.add(lock_key, 1, settings.CACHE_LOCK_TIMEOUT)
+    if not locked:
+        if entry is not None:
+            return entry[0]
+        value = wait_for_value(key, lock_key, version)
+        if value is not MISSING:
+            return value
+        # Держатель блокировки не сохранил значение, не успел или упал:
+        # считаем сами, не трогая чужую блокировку.
+    try:
+        started = time.perf_counter()
+        value = compute()
+        delta = time.perf_counter() - started
+        if should_cache is None or should_cache(value):
+            store(key, value, version, timeout, delta)
+    finally:
+        if locked:
+            cache.delete(lock_key)
+    return value
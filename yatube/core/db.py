@@ -0,0 +1,73 @@
+import functools
+import logging
+import random
+import time
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections
+from django.db import transaction
+
+logger = logging.getLogger('core.db')
+
+LOCK_ERRORS = ('database is locked', 'database table is locked', 'busy')
+
+
+def configure_sqlite(sender, connection, **kwargs):
+    """
+    Обработчик connection_created: WAL позволяет читать во время записи,
+    busy_timeout заставляет SQLite ждать блокировку, а не падать сразу.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}')
+        cursor.execute(f'PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT}')
+        # В режиме WAL synchronous=NORMAL не теряет целостность БД.
+        cursor.execute('PRAGMA synchronous=NORMAL')
+
+
+def is_lock_error(error):
+    message = str(error).lower()
+    return any(text in message for text in LOCK_ERRORS)
+
+
+def run_write(func, *args, using=DEFAULT_DB_ALIAS, **kwargs):
+    """
+    Выполняет func в короткой транзакции и повторяет её с экспоненциальной
+    задержкой, если БД занята другим писателем. Внутри внешней транзакции
+    повтор невозможен, поэтому там func просто вызывается.
+    """
+    if connections[using].in_atomic_block:
+        return func(*args, **kwargs)
+    for attempt in range(settings.DB_LOCK_RETRIES + 1):
+        try:
+            with transaction.atomic(using=using):
+                return func(*args, **kwargs)
+        except OperationalError as error:
+            if not is_lock_error(error) or attempt == settings.DB_LOCK_RETRIES:
+                raise
+            delay = settings.DB_LOCK_BACKOFF * 2 ** attempt
+            delay *= random.uniform(0.5, 1.5)
+            logger.warning(
+                'БД занята, повтор %d через %.3f с: %s',
+                attempt + 1, delay, error,
+            )
+            time.sleep(delay)
+
+
+def after_commit(func, *args, using=DEFAULT_DB_ALIAS, **kwargs):
+    """
+    Откладывает func до фиксации текущей транзакции. Кэш не откатывается
+    вместе с БД: если run_write повторит транзакцию, побочные эффекты
+    отменённой попытки пропадут вместе с ней. Вне транзакции func
+    вызывается сразу.
+    """
+    transaction.on_commit(functools.partial(func, *args, **kwargs), using)
+
+
+def retry_on_lock(func):
+    """Декоратор: вызовы func идут через run_write."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return run_write(func, *args, **kwargs)
+    return wrapper
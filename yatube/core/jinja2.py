@@ -0,0 +1,33 @@
+from django.template.defaultfilters import date
+from django.templatetags.static import static
+from django.urls import reverse
+from jinja2 import Environment, FileSystemLoader
+
+from .template_loaders import minify
+
+
+class MinifyingLoader(FileSystemLoader):
+    """Сжимает исходник .html шаблона до компиляции, как и для Django."""
+
+    def get_source(self, environment, template):
+        source, filename, uptodate = super().get_source(environment, template)
+        if filename.endswith('.html'):
+            source = minify(source)
+        return source, filename, uptodate
+
+
+def url(viewname, *args, **kwargs):
+    return reverse(viewname, args=args or None, kwargs=kwargs or None)
+
+
+def environment(**options):
+    """Окружение Jinja2 с теми же хелперами, что и в шаблонах Django."""
+    loader = options.pop('loader')
+    options['loader'] = MinifyingLoader(loader.searchpath)
+    env = Environment(**options)
+    env.globals.update({
+        'static': static,
+        'url': url,
+    })
+    env.filters['date'] = date
+    return env
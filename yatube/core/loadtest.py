@@ -0,0 +1,255 @@
+import itertools
+import random
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from http.cookiejar import CookieJar
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlencode
+from urllib.request import HTTPCookieProcessor, build_opener
+
+from django.conf import settings
+from django.urls import reverse
+
+# Границы корзин гистограммы задержек, мс.
+HISTOGRAM_BUCKETS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+DEFAULT_MIX = {
+    'index': 40,
+    'group_list': 15,
+    'profile': 15,
+    'post_detail': 20,
+    'login': 5,
+    'post_create': 5,
+}
+
+# Сценарии, которым нужны логин и пароль пользователя.
+AUTH_SCENARIOS = ('login', 'post_create')
+
+# Ответ ограничителя попыток входа (users.throttling).
+THROTTLED = 429
+
+
+def parse_mix(value):
+    """'index=4,post_detail=1' -> {'index': 4, 'post_detail': 1}."""
+    mix = {}
+    for item in value.split(','):
+        name, _, weight = item.partition('=')
+        name = name.strip()
+        if name not in DEFAULT_MIX:
+            raise ValueError(f'Неизвестный сценарий: {name}')
+        mix[name] = int(weight or 1)
+    return mix
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0
+    index = min(int(len(sorted_values) * fraction), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def histogram(latencies, buckets=HISTOGRAM_BUCKETS):
+    """Число задержек в каждой корзине (<= границы), последняя - выше всех."""
+    counts = [0] * (len(buckets) + 1)
+    for latency in latencies:
+        for position, bound in enumerate(buckets):
+            if latency <= bound:
+                counts[position] += 1
+                break
+        else:
+            counts[-1] += 1
+    return counts
+
+
+class LoadTest:
+    """
+    Генератор нагрузки на запущенный сервер: пул потоков, у каждого
+    потока своя сессия с cookie. Сценарии выбираются случайно
+    с весами mix, адреса строятся из групп, авторов и постов в БД.
+    Потоки по кругу получают пользователей из usernames с общим паролем,
+    чтобы не упираться в корзину входа одного пользователя.
+    """
+
+    def __init__(self, base_url, mix, targets, usernames=(), password=None,
+                 timeout=10, seed=None):
+        self.base_url = base_url.rstrip('/')
+        self.targets = targets
+        self.usernames = list(usernames)
+        self.next_user = itertools.count()
+        self.password = password
+        self.timeout = timeout
+        self.mix = {
+            name: weight for name, weight in mix.items()
+            if weight > 0 and self.can_run(name)
+        }
+        self.random = random.Random(seed)
+        self.random_lock = threading.Lock()
+        self.local = threading.local()
+        self.results = []
+        self.results_lock = threading.Lock()
+
+    def can_run(self, scenario):
+        if scenario in AUTH_SCENARIOS:
+            return bool(self.usernames and self.password)
+        if scenario == 'group_list':
+            return bool(self.targets['groups'])
+        if scenario == 'profile':
+            return bool(self.targets['usernames'])
+        if scenario == 'post_detail':
+            return bool(self.targets['post_ids'])
+        return True
+
+    def choice(self, values):
+        with self.random_lock:
+            return self.random.choice(values)
+
+    def pick_scenario(self):
+        with self.random_lock:
+            return self.random.choices(
+                list(self.mix), weights=list(self.mix.values())
+            )[0]
+
+    @property
+    def opener(self):
+        if not hasattr(self.local, 'opener'):
+            self.local.cookies = CookieJar()
+            self.local.opener = build_opener(
+                HTTPCookieProcessor(self.local.cookies)
+            )
+        return self.local.opener
+
+    def request(self, path, data=None):
+        body = urlencode(data).encode() if data is not None else None
+        with self.opener.open(
+            self.base_url + path, body, timeout=self.timeout
+        ) as response:
+            response.read()
+            return response.status
+
+    def csrf_token(self):
+        for cookie in self.local.cookies:
+            if cookie.name == settings.CSRF_COOKIE_NAME:
+                return cookie.value
+        return ''
+
+    def submit(self, path, data):
+        """GET формы за CSRF-токеном и POST в ту же сессию."""
+        self.request(path)
+        return self.request(
+            path, {**data, 'csrfmiddlewaretoken': self.csrf_token()}
+        )
+
+    @property
+    def username(self):
+        if not hasattr(self.local, 'username'):
+            position = next(self.next_user) % len(self.usernames)
+            self.local.username = self.usernames[position]
+        return self.local.username
+
+    def login(self):
+        status = self.submit(
+            reverse('users:login'),
+            {'username': self.username, 'password': self.password},
+        )
+        self.local.logged_in = True
+        return status
+
+    def run_scenario(self, scenario):
+        if scenario == 'index':
+            return self.request(reverse('posts:index'))
+        if scenario == 'group_list':
+            slug = self.choice(self.targets['groups'])
+            return self.request(reverse('posts:group_list', args=(slug,)))
+        if scenario == 'profile':
+            username = self.choice(self.targets['usernames'])
+            return self.request(reverse('posts:profile', args=(username,)))
+        if scenario == 'post_detail':
+            post_id = self.choice(self.targets['post_ids'])
+            return self.request(
+                reverse('posts:post_detail', args=(post_id,))
+            )
+        if scenario == 'login':
+            return self.login()
+        if not getattr(self.local, 'logged_in', False):
+            self.login()
+        return self.submit(
+            reverse('posts:post_create'),
+            {'text': f'Пост нагрузочного теста {time.time()}'},
+        )
+
+    def one_request(self):
+        scenario = self.pick_scenario()
+        started = time.perf_counter()
+        try:
+            outcome = self.run_scenario(scenario)
+        except HTTPError as error:
+            outcome = error.code
+        except (URLError, OSError) as error:
+            outcome = type(error).__name__
+        latency = (time.perf_counter() - started) * 1000
+        with self.results_lock:
+            self.results.append((scenario, outcome, latency))
+
+    def run(self, requests=None, duration=None, concurrency=10):
+        """
+        Выполняет requests запросов или крутит нагрузку duration секунд.
+        Возвращает время прогона в секундах.
+        """
+        deadline = time.perf_counter() + duration if duration else None
+        remaining = [requests or 0]
+        counter_lock = threading.Lock()
+
+        def worker():
+            while True:
+                if deadline is not None:
+                    if time.perf_counter() >= deadline:
+                        return
+                else:
+                    with counter_lock:
+                        if remaining[0] <= 0:
+                            return
+                        remaining[0] -= 1
+                self.one_request()
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for future in [pool.submit(worker) for _ in range(concurrency)]:
+                future.result()
+        return time.perf_counter() - started
+
+    def summary(self):
+        """
+        Сводка по сценариям: число, ошибки, отказы ограничителя,
+        задержки, коды ответа. Ответы 429 не считаются ошибками сервера.
+        """
+        by_scenario = defaultdict(list)
+        for scenario, outcome, latency in self.results:
+            by_scenario[scenario].append((outcome, latency))
+        rows = {}
+        for scenario, results in sorted(by_scenario.items()):
+            latencies = sorted(latency for _, latency in results)
+            rows[scenario] = {
+                'requests': len(results),
+                'errors': sum(
+                    1 for outcome, _ in results if is_error(outcome)
+                ),
+                'throttled': sum(
+                    1 for outcome, _ in results if outcome == THROTTLED
+                ),
+                'p50': percentile(latencies, 0.5),
+                'p95': percentile(latencies, 0.95),
+                'p99': percentile(latencies, 0.99),
+                'max': latencies[-1],
+                'outcomes': Counter(outcome for outcome, _ in results),
+            }
+        return rows
+
+
+def is_success(outcome):
+    return isinstance(outcome, int) and outcome < 400
+
+
+def is_error(outcome):
+    return not is_success(outcome) and outcome != THROTTLED
@@ -0,0 +1,113 @@
+import functools
+import multiprocessing
+import time
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connections
+
+from posts.models import Post
+from ...db import run_write
+
+User = get_user_model()
+
+STRESS_USERNAME = 'db-stress-writer'
+
+
+def write_posts(marker, writer, writes, retry, results):
+    """
+    Тело процесса-писателя: создаёт writes постов с меткой marker.
+    Возвращает в очередь число сохранённых и несохранённых записей.
+    """
+    saved = 0
+    try:
+        author = User.objects.get(username=STRESS_USERNAME)
+        for number in range(writes):
+            create = functools.partial(
+                Post.objects.create,
+                author=author,
+                text=f'{marker} {writer}-{number}',
+            )
+            try:
+                run_write(create) if retry else create()
+            except OperationalError:
+                continue
+            saved += 1
+    except OperationalError:
+        pass
+    finally:
+        connections.close_all()
+        results.put((saved, writes - saved))
+
+
+class Command(BaseCommand):
+    help = (
+        'Стресс-тест записи: несколько процессов одновременно создают '
+        'посты, затем команда сверяет число записей в БД. Выводит '
+        'пропускную способность, ошибки блокировки и потерянные записи. '
+        'Созданные посты удаляются, если не указан --keep.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--writers',
+            type=int,
+            default=8,
+            help='Число параллельных процессов-писателей.',
+        )
+        parser.add_argument(
+            '--writes',
+            type=int,
+            default=50,
+            help='Сколько постов создаёт каждый писатель.',
+        )
+        parser.add_argument(
+            '--no-retry',
+            action='store_true',
+            help='Писать без повторов core.db.run_write.',
+        )
+        parser.add_argument(
+            '--keep',
+            action='store_true',
+            help='Не удалять созданные посты.',
+        )
+
+    def handle(self, *args, **options):
+        User.objects.get_or_create(username=STRESS_USERNAME)
+        marker = f'db-stress-{uuid.uuid4().hex[:8]}'
+        # Соединения SQLite нельзя переносить через fork.
+        connections.close_all()
+        context = multiprocessing.get_context('fork')
+        results = context.Queue()
+        processes = [
+            context.Process(
+                target=write_posts,
+                args=(
+                    marker, writer, options['writes'],
+                    not options['no_retry'], results,
+                ),
+            )
+            for writer in range(options['writers'])
+        ]
+        started = time.perf_counter()
+        for process in processes:
+            process.start()
+        outcomes = [results.get() for _ in processes]
+        for process in processes:
+            process.join()
+        elapsed = time.perf_counter() - started
+
+        saved = sum(saved for saved, _ in outcomes)
+        failed = sum(failed for _, failed in outcomes)
+        stored = Post.objects.filter(text__startswith=marker).count()
+        self.stdout.write(
+            f'Писателей: {options["writers"]}, '
+            f'записей: {options["writers"] * options["writes"]}, '
+            f'повторы: {"нет" if options["no_retry"] else "да"}\n'
+            f'Сохранено: {saved}, ошибок блокировки: {failed}, '
+            f'в БД: {stored}, потеряно: {saved - stored}\n'
+            f'Время: {elapsed:.2f} с, {saved / elapsed:.1f} записей/с'
+        )
+        if not options['keep']:
+            Post.objects.filter(text__startswith=marker).delete()
@@ -0,0 +1,164 @@
+from collections import Counter
+
+from django.core.management.base import BaseCommand, CommandError
+
+from posts.models import Group, Post, User
+from ...loadtest import (
+    DEFAULT_MIX, HISTOGRAM_BUCKETS, THROTTLED, LoadTest, histogram,
+    is_error, parse_mix,
+)
+
+TARGETS_LIMIT = 100
+HISTOGRAM_WIDTH = 40
+
+
+class Command(BaseCommand):
+    help = (
+        'Нагружает запущенный сервер (runserver, gunicorn) смесью запросов '
+        'к index, group_list, profile, post_detail, входу и созданию поста. '
+        'Выводит пропускную способность, долю ошибок и гистограмму задержек. '
+        'Адреса групп, авторов и постов берутся из БД проекта. '
+        'post_create создаёт настоящие посты от имени --username. '
+        'Вход ограничен THROTTLE_RATES["login"] по IP и по пользователю: '
+        'все потоки идут с одного IP, поэтому для нагрузки на login '
+        'и post_create поднимите этот лимит на тестируемом сервере. '
+        'Отказы 429 выводятся отдельно от ошибок.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--url',
+            default='http://127.0.0.1:8000',
+            help='Адрес сервера.',
+        )
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=200,
+            help='Сколько запросов выполнить.',
+        )
+        parser.add_argument(
+            '--duration',
+            type=float,
+            help='Длительность нагрузки в секундах вместо --requests.',
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=10,
+            help='Число параллельных клиентов (потоков).',
+        )
+        parser.add_argument(
+            '--mix',
+            default=','.join(f'{k}={v}' for k, v in DEFAULT_MIX.items()),
+            help='Веса сценариев: index=40,post_detail=20,...',
+        )
+        parser.add_argument(
+            '--username',
+            help=(
+                'Пользователи для сценариев login и post_create через '
+                'запятую, потоки получают их по кругу.'
+            ),
+        )
+        parser.add_argument(
+            '--password', help='Общий пароль пользователей.'
+        )
+        parser.add_argument(
+            '--timeout',
+            type=float,
+            default=10,
+            help='Таймаут одного запроса в секундах.',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            help='Зерно случайного выбора сценариев и адресов.',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            mix = parse_mix(options['mix'])
+        except ValueError as error:
+            raise CommandError(error)
+        targets = {
+            'groups': list(
+                Group.objects.values_list('slug', flat=True)[:TARGETS_LIMIT]
+            ),
+            'usernames': list(
+                User.objects.filter(posts__isnull=False).distinct()
+                .values_list('username', flat=True)[:TARGETS_LIMIT]
+            ),
+            'post_ids': list(
+                Post.objects.values_list('id', flat=True)[:TARGETS_LIMIT]
+            ),
+        }
+        loadtest = LoadTest(
+            options['url'],
+            mix,
+            targets,
+            usernames=[
+                username.strip()
+                for username in (options['username'] or '').split(',')
+                if username.strip()
+            ],
+            password=options['password'],
+            timeout=options['timeout'],
+            seed=options['seed'],
+        )
+        skipped = set(mix) - set(loadtest.mix)
+        if skipped:
+            self.stdout.write(
+                f'Пропущены сценарии без данных или пароля: '
+                f'{", ".join(sorted(skipped))}'
+            )
+        if not loadtest.mix:
+            raise CommandError('Нет ни одного выполнимого сценария.')
+        elapsed = loadtest.run(
+            requests=options['requests'],
+            duration=options['duration'],
+            concurrency=options['concurrency'],
+        )
+        self.report(loadtest, elapsed)
+
+    def report(self, loadtest, elapsed):
+        results = loadtest.results
+        self.stdout.write(
+            f'{"scenario":<14}{"requests":>9}{"errors":>8}{"429":>6}'
+            f'{"p50 ms":>9}{"p95 ms":>9}{"p99 ms":>9}{"max ms":>9}'
+        )
+        for scenario, row in loadtest.summary().items():
+            self.stdout.write(
+                f'{scenario:<14}{row["requests"]:>9}{row["errors"]:>8}'
+                f'{row["throttled"]:>6}{row["p50"]:>9.1f}{row["p95"]:>9.1f}'
+                f'{row["p99"]:>9.1f}{row["max"]:>9.1f}'
+            )
+        errors = sum(1 for _, outcome, _ in results if is_error(outcome))
+        error_rate = errors / len(results) * 100 if results else 0
+        throttled = sum(
+            1 for _, outcome, _ in results if outcome == THROTTLED
+        )
+        self.stdout.write(
+            f'\nВсего: {len(results)} запросов за {elapsed:.2f} с, '
+            f'{len(results) / elapsed:.1f} запр/с, '
+            f'ошибок {errors} ({error_rate:.1f}%), '
+            f'отказов ограничителя {throttled}'
+        )
+        if throttled:
+            self.stdout.write(
+                'Вход упёрся в THROTTLE_RATES["login"] сервера: задержки '
+                'login и post_create занижены. Поднимите лимит на время '
+                'нагрузки или передайте больше пользователей в --username.'
+            )
+        outcomes = Counter(str(outcome) for _, outcome, _ in results)
+        self.stdout.write('Ответы: ' + ', '.join(
+            f'{outcome}: {count}'
+            for outcome, count in sorted(outcomes.items())
+        ))
+        counts = histogram([latency for _, _, latency in results])
+        labels = [f'<= {bound} ms' for bound in HISTOGRAM_BUCKETS]
+        labels.append(f'> {HISTOGRAM_BUCKETS[-1]} ms')
+        widest = max(counts) or 1
+        self.stdout.write('\nЗадержки:')
+        for label, count in zip(labels, counts):
+            bar = '#' * round(count / widest * HISTOGRAM_WIDTH)
+            self.stdout.write(f'{label:>12}{count:>7} {bar}')
@@ -0,0 +1,63 @@
+import time
+
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+
+DB_BACKED_ENGINES = (
+    'django.contrib.sessions.backends.db',
+    'django.contrib.sessions.backends.cached_db',
+    'core.session_store',
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Удаляет просроченные сессии из django_session пачками. '
+        'Предназначена для запуска по расписанию (cron).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.SESSION_PURGE_BATCH_SIZE,
+            help='Сколько сессий удалять за один запрос.',
+        )
+        parser.add_argument(
+            '--pause',
+            type=float,
+            default=0,
+            help='Пауза между пачками в секундах.',
+        )
+
+    def handle(self, *args, **options):
+        if settings.SESSION_ENGINE not in DB_BACKED_ENGINES:
+            self.stdout.write(
+                f'{settings.SESSION_ENGINE} не хранит сессии в БД, '
+                f'удалять нечего.'
+            )
+            return
+        deleted = purge_expired_sessions(
+            options['batch_size'], options['pause']
+        )
+        self.stdout.write(f'Удалено просроченных сессий: {deleted}')
+
+
+def purge_expired_sessions(batch_size, pause=0):
+    """Удаляет просроченные сессии пачками, не блокируя таблицу надолго."""
+    now = timezone.now()
+    deleted = 0
+    while True:
+        keys = list(
+            Session.objects.filter(expire_date__lt=now)
+            .values_list('session_key', flat=True)[:batch_size]
+        )
+        if not keys:
+            return deleted
+        Session.objects.filter(session_key__in=keys).delete()
+        deleted += len(keys)
+        if pause:
+            time.sleep(pause)
@@ -0,0 +1,73 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+
+User = get_user_model()
+
+BENCHMARK_USERNAME = 'session-benchmark-user'
+
+
+class Command(BaseCommand):
+    help = (
+        'Считает запросы к БД на один запрос залогиненного пользователя '
+        'к index и profile для каждого движка сессий.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=20,
+            help='Сколько запросов делать к каждой странице.',
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f'{"engine":<16}{"page":<10}{"queries/req":>12}'
+            f'{"session/req":>12}'
+        )
+        for name, engine in settings.SESSION_ENGINES.items():
+            for page, queries, session_queries in measure_engine(
+                engine, options['requests']
+            ):
+                self.stdout.write(
+                    f'{name:<16}{page:<10}{queries:>12.2f}'
+                    f'{session_queries:>12.2f}'
+                )
+
+
+def measure_engine(engine, requests_count):
+    """
+    Возвращает среднее число запросов к БД и к django_session
+    на один запрос для страниц index и profile.
+    Все созданные данные откатываются.
+    """
+    results = []
+    with override_settings(SESSION_ENGINE=engine), transaction.atomic():
+        user = User.objects.create_user(username=BENCHMARK_USERNAME)
+        client = Client()
+        client.force_login(user)
+        pages = {
+            'index': reverse('posts:index'),
+            'profile': reverse('posts:profile', args=(user.username,)),
+        }
+        for page, url in pages.items():
+            with CaptureQueriesContext(connection) as context:
+                for _ in range(requests_count):
+                    client.get(url)
+            session_queries = [
+                query for query in context.captured_queries
+                if 'django_session' in query['sql']
+            ]
+            results.append((
+                page,
+                len(context.captured_queries) / requests_count,
+                len(session_queries) / requests_count,
+            ))
+        transaction.set_rollback(True)
+    return results
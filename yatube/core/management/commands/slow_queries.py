@@ -0,0 +1,59 @@
+from django.core.management.base import BaseCommand
+
+from ...models import SlowQuery
+
+ORDERINGS = {
+    'max': '-max_duration',
+    'count': '-count',
+    'total': '-total_duration',
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Отчёт по медленным запросам: сколько раз встречался запрос, '
+        'худшее и среднее время, адрес и место вызова.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sort',
+            choices=ORDERINGS,
+            default='max',
+            help='Сортировка: худшее время, число или суммарное время.',
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=20,
+            help='Сколько запросов показать.',
+        )
+        parser.add_argument(
+            '--plans',
+            action='store_true',
+            help='Показать SQL и план выполнения каждого запроса.',
+        )
+        parser.add_argument(
+            '--reset',
+            action='store_true',
+            help='Очистить журнал после вывода отчёта.',
+        )
+
+    def handle(self, *args, **options):
+        queries = SlowQuery.objects.order_by(ORDERINGS[options['sort']])
+        self.stdout.write(
+            f'{"count":>7}{"max, ms":>10}{"avg, ms":>10}  '
+            f'{"url":<32}call site'
+        )
+        for query in queries[:options['limit']]:
+            average = query.total_duration / query.count
+            self.stdout.write(
+                f'{query.count:>7}{query.max_duration:>10.1f}'
+                f'{average:>10.1f}  {query.url_name:<32}{query.call_site}'
+            )
+            if options['plans']:
+                self.stdout.write(f'    {query.sql}')
+                for line in query.plan.splitlines():
+                    self.stdout.write(f'      {line}')
+        if options['reset']:
+            SlowQuery.objects.all().delete()
@@ -0,0 +1,85 @@
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+def parse_importtime(output):
+    """Строки -X importtime: модуль, собственное и накопленное время в мс."""
+    modules = []
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|')
+        if not own.strip().isdigit():
+            continue
+        modules.append({
+            'module': name.strip(),
+            'depth': (len(name) - len(name.lstrip()) - 1) // 2,
+            'self': int(own) / 1000,
+            'cumulative': int(cumulative) / 1000,
+        })
+    return modules
+
+
+class Command(BaseCommand):
+    help = (
+        'Запускает проект в отдельном процессе с -X importtime и показывает '
+        'время этапов загрузки и самые дорогие импорты.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=20,
+            help='Сколько модулей и пакетов показать.',
+        )
+
+    def handle(self, *args, **options):
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=settings.SETTINGS_MODULE)
+        # В текущем процессе всё уже импортировано, поэтому меряем
+        # холодный старт в новом интерпретаторе.
+        result = subprocess.run(
+            [
+                sys.executable, '-X', 'importtime', '-c',
+                'import core.startup; core.startup.main()',
+            ],
+            cwd=settings.BASE_DIR,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode:
+            raise CommandError(result.stderr)
+        phases = json.loads(result.stdout.splitlines()[-1])
+        modules = parse_importtime(result.stderr)
+
+        self.stdout.write(f'{"phase":<28}{"ms":>10}')
+        for name, duration in phases:
+            self.stdout.write(f'{name:<28}{duration:>10.1f}')
+        self.stdout.write(
+            f'{"total":<28}{sum(ms for _, ms in phases):>10.1f}\n'
+        )
+
+        packages = defaultdict(float)
+        for module in modules:
+            packages[module['module'].split('.')[0]] += module['self']
+        self.stdout.write(f'{"package":<48}{"self ms":>10}')
+        for package, duration in sorted(
+            packages.items(), key=lambda item: -item[1]
+        )[:options['limit']]:
+            self.stdout.write(f'{package:<48}{duration:>10.1f}')
+
+        self.stdout.write(f'\n{"module":<48}{"self ms":>10}{"cumul. ms":>10}')
+        for module in sorted(
+            modules, key=lambda module: -module['self']
+        )[:options['limit']]:
+            self.stdout.write(
+                f'{module["module"]:<48}{module["self"]:>10.1f}'
+                f'{module["cumulative"]:>10.1f}'
+            )
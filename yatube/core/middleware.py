@@ -0,0 +1,248 @@
+import gzip
+import logging
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from django.urls import Resolver404, resolve
+from django.utils.cache import patch_vary_headers
+
+from posts.cache import get_posts_version, get_views_version
+from posts.counters import view_counter
+from .cache import get_or_compute
+from .profiling import can_profile, is_profiling_requested, profile_request
+from .slow_queries import SlowQueryCollector, record_slow_query
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+logger = logging.getLogger('core.compression')
+
+
+class PostViewCountMiddleware:
+    """
+    Считает просмотры post_detail в буфере posts.counters.
+    Стоит перед полностраничным кэшем, поэтому учитывает и ответы из кэша.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if request.method == 'GET' and response.status_code == 200:
+            try:
+                match = resolve(request.path_info)
+            except Resolver404:
+                return response
+            if match.view_name == 'posts:post_detail':
+                view_counter.add(match.kwargs['post_id'])
+        return response
+
+
+class AnonymousPageCacheMiddleware:
+    """
+    Полностраничный кэш для анонимных GET-запросов к posts и about.
+    Стоит до сессий, CSRF и аутентификации, поэтому попадание в кэш
+    отдаёт готовый ответ без их работы. Запросы с cookie сессии
+    идут мимо кэша. Запись хранит версию постов, так что любая запись
+    поста делает все страницы устаревшими, а страницы с просмотрами -
+    ещё и сброс счётчиков просмотров. Пересчёт и отдачу устаревшей
+    страницы на это время берёт на себя get_or_compute.
+    Стоит перед CompressionMiddleware: в кэше лежит уже сжатый ответ,
+    а ключ учитывает сжатие, выбранное по Accept-Encoding.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    # Страницы с числом просмотров: их записи устаревают и при сбросе
+    # счётчиков просмотров, а не только при записи постов.
+    view_count_pages = ('posts:post_detail', 'posts:profile')
+
+    def __call__(self, request):
+        match = self.cacheable_match(request)
+        if match is None:
+            return self.get_response(request)
+        version = get_posts_version()
+        if match.view_name in self.view_count_pages:
+            version = f'{version}:{get_views_version()}'
+        return get_or_compute(
+            self.cache_key(request),
+            lambda: self.get_response(request),
+            settings.PAGE_CACHE_TIMEOUT,
+            version=version,
+            should_cache=self.is_cacheable_response,
+        )
+
+    def cacheable_match(self, request):
+        """resolve() запроса, если его ответ можно брать из кэша."""
+        if not settings.PAGE_CACHE_TIMEOUT or request.method != 'GET':
+            return None
+        if settings.SESSION_COOKIE_NAME in request.COOKIES:
+            return None
+        try:
+            match = resolve(request.path_info)
+        except Resolver404:
+            return None
+        if match.namespace not in settings.PAGE_CACHE_NAMESPACES:
+            return None
+        return match
+
+    def is_cacheable_response(self, response):
+        return (
+            response.status_code == 200
+            and not response.cookies
+            and not response.streaming
+        )
+
+    def cache_key(self, request):
+        encoding = choose_encoding(
+            request.META.get('HTTP_ACCEPT_ENCODING', '')
+        )
+        return (
+            f'page:{request.get_host()}:{encoding or "identity"}:'
+            f'{request.get_full_path()}'
+        )
+
+
+COMPRESSIBLE_TYPES = (
+    'text/',
+    'application/json',
+    'application/xml',
+    'application/javascript',
+    'application/rss+xml',
+    'application/atom+xml',
+)
+
+
+def gzip_compress(content):
+    return gzip.compress(content, settings.COMPRESSION_GZIP_LEVEL)
+
+
+def brotli_compress(content):
+    return brotli.compress(content, quality=settings.COMPRESSION_BROTLI_LEVEL)
+
+
+COMPRESSORS = {'gzip': gzip_compress}
+if brotli is not None:
+    COMPRESSORS['br'] = brotli_compress
+
+
+def choose_encoding(accept_encoding):
+    """Лучшее из поддерживаемых клиентом сжатий или None."""
+    accepted = {
+        value.split(';')[0].strip().lower()
+        for value in accept_encoding.split(',')
+    }
+    for encoding in ('br', 'gzip'):
+        if encoding in accepted and encoding in COMPRESSORS:
+            return encoding
+    return None
+
+
+class CompressionMiddleware:
+    """
+    Сжимает ответы brotli (если установлен пакет brotli) или gzip
+    в зависимости от Accept-Encoding. Ответы меньше COMPRESSION_MIN_SIZE
+    не сжимаются. Затраты процессора отдаются в заголовке Server-Timing
+    и пишутся в лог core.compression вместе с размерами до и после.
+    Стоит после полностраничного кэша, так что ответы из кэша повторно
+    не сжимаются.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if not self.is_compressible(response):
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = choose_encoding(
+            request.META.get('HTTP_ACCEPT_ENCODING', '')
+        )
+        if encoding is None:
+            return response
+        original_size = len(response.content)
+        started = time.process_time()
+        content = COMPRESSORS[encoding](response.content)
+        cpu_ms = (time.process_time() - started) * 1000
+        logger.debug(
+            '%s %s: %d -> %d bytes, %.2f ms CPU',
+            encoding, request.path, original_size, len(content), cpu_ms,
+        )
+        if len(content) >= original_size:
+            return response
+        response.content = content
+        response['Content-Length'] = str(len(content))
+        response['Content-Encoding'] = encoding
+        response['Server-Timing'] = f'compress;dur={cpu_ms:.2f}'
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        return response
+
+    def is_compressible(self, response):
+        if response.streaming or response.has_header('Content-Encoding'):
+            return False
+        if len(response.content) < settings.COMPRESSION_MIN_SIZE:
+            return False
+        content_type = response.get('Content-Type', '')
+        return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+class ProfilingMiddleware:
+    """
+    Профилирует запрос сотрудника под cProfile, если передан параметр
+    PROFILING_PARAM или заголовок X-Profile. Результат сохраняется
+    в RequestProfile и виден в админке, id профиля - в X-Profile-Id.
+    Для остальных пользователей параметр игнорируется.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if is_profiling_requested(request) and can_profile(request):
+            return profile_request(self.get_response, request)
+        return self.get_response(request)
+
+
+class SlowQueryLogMiddleware:
+    """
+    Пишет в SlowQuery запросы к БД дольше SLOW_QUERY_THRESHOLD мс,
+    выполненные при обработке адресов из SLOW_QUERY_NAMESPACES.
+    Одинаковые по форме запросы сводятся в одну запись со счётчиком.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        url_name = self.logged_url_name(request)
+        if url_name is None:
+            return self.get_response(request)
+        collector = SlowQueryCollector(settings.SLOW_QUERY_THRESHOLD)
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(collector))
+            response = self.get_response(request)
+        for query in collector.slow:
+            record_slow_query(query, url_name)
+        return response
+
+    def logged_url_name(self, request):
+        if not settings.SLOW_QUERY_THRESHOLD:
+            return None
+        try:
+            match = resolve(request.path_info)
+        except Resolver404:
+            return None
+        if match.namespace not in settings.SLOW_QUERY_NAMESPACES:
+            return None
+        return match.view_name
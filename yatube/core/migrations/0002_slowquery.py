@@ -0,0 +1,34 @@
+# Generated by Django 2.2.16 on 2026-10-19 07:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SlowQuery',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fingerprint', models.CharField(help_text='md5 нормализованного SQL без литералов', max_length=32, unique=True, verbose_name='Отпечаток')),
+                ('sql', models.TextField(verbose_name='Самый медленный запрос')),
+                ('plan', models.TextField(blank=True, verbose_name='План выполнения')),
+                ('call_site', models.CharField(blank=True, max_length=255, verbose_name='Место вызова')),
+                ('url_name', models.CharField(blank=True, max_length=255, verbose_name='Имя URL')),
+                ('count', models.PositiveIntegerField(default=1, verbose_name='Раз')),
+                ('total_duration', models.FloatField(verbose_name='Суммарно, мс')),
+                ('max_duration', models.FloatField(verbose_name='Худшее время, мс')),
+                ('first_seen', models.DateTimeField(auto_now_add=True, verbose_name='Впервые')),
+                ('last_seen', models.DateTimeField(verbose_name='Последний раз')),
+            ],
+            options={
+                'verbose_name': 'Медленный запрос',
+                'verbose_name_plural': 'Медленные запросы',
+                'ordering': ['-max_duration'],
+            },
+        ),
+    ]
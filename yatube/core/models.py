@@ -0,0 +1,78 @@
+from django.conf import settings
+from django.db import models
+
+
+class RequestProfile(models.Model):
+    path = models.CharField(max_length=2000, verbose_name='Адрес')
+    method = models.CharField(max_length=10, verbose_name='Метод')
+    status_code = models.PositiveSmallIntegerField(verbose_name='Код ответа')
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        blank=True,
+        null=True,
+        related_name='request_profiles',
+        verbose_name='Пользователь',
+    )
+    created = models.DateTimeField(
+        auto_now_add=True,
+        db_index=True,
+        verbose_name='Дата',
+    )
+    duration = models.FloatField(verbose_name='Время, мс')
+    query_count = models.PositiveIntegerField(verbose_name='SQL-запросов')
+    query_duration = models.FloatField(verbose_name='Время SQL, мс')
+    queries = models.TextField(
+        blank=True,
+        verbose_name='SQL-запросы',
+        help_text='JSON-список запросов с временем выполнения',
+    )
+    stats_file = models.CharField(
+        max_length=255,
+        verbose_name='Файл pstats',
+    )
+
+    def __str__(self):
+        return f'{self.method} {self.path}'
+
+    class Meta:
+        ordering = ['-created']
+        verbose_name = 'Профиль запроса'
+        verbose_name_plural = 'Профили запросов'
+
+
+class SlowQuery(models.Model):
+    fingerprint = models.CharField(
+        max_length=32,
+        unique=True,
+        verbose_name='Отпечаток',
+        help_text='md5 нормализованного SQL без литералов',
+    )
+    sql = models.TextField(verbose_name='Самый медленный запрос')
+    plan = models.TextField(blank=True, verbose_name='План выполнения')
+    call_site = models.CharField(
+        max_length=255,
+        blank=True,
+        verbose_name='Место вызова',
+    )
+    url_name = models.CharField(
+        max_length=255,
+        blank=True,
+        verbose_name='Имя URL',
+    )
+    count = models.PositiveIntegerField(default=1, verbose_name='Раз')
+    total_duration = models.FloatField(verbose_name='Суммарно, мс')
+    max_duration = models.FloatField(verbose_name='Худшее время, мс')
+    first_seen = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Впервые',
+    )
+    last_seen = models.DateTimeField(verbose_name='Последний раз')
+
+    def __str__(self):
+        return self.sql[:100]
+
+    class Meta:
+        ordering = ['-max_duration']
+        verbose_name = 'Медленный запрос'
+        verbose_name_plural = 'Медленные запросы'
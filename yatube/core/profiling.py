@@ -0,0 +1,94 @@
+import json
+import os
+import time
+import uuid
+
+from django.conf import settings
+from django.db import connection
+
+from .models import RequestProfile
+
+
+def is_profiling_requested(request):
+    return (
+        settings.PROFILING_PARAM in request.GET
+        or settings.PROFILING_HEADER in request.META
+    )
+
+
+def can_profile(request):
+    user = getattr(request, 'user', None)
+    return user is not None and user.is_active and user.is_staff
+
+
+def profile_request(get_response, request):
+    """
+    Выполняет запрос под cProfile, сохраняет pstats-файл и SQL-запросы
+    с временем выполнения в RequestProfile.
+    """
+    # cProfile и django.test нужны только при профилировании,
+    # не грузим их при старте воркера.
+    import cProfile
+
+    from django.test.utils import CaptureQueriesContext
+
+    profiler = cProfile.Profile()
+    with CaptureQueriesContext(connection) as context:
+        started = time.perf_counter()
+        response = profiler.runcall(get_response, request)
+        duration = (time.perf_counter() - started) * 1000
+    queries = [
+        {'sql': query['sql'], 'time': float(query['time']) * 1000}
+        for query in context.captured_queries
+    ]
+    os.makedirs(settings.PROFILE_DIR, exist_ok=True)
+    stats_file = os.path.join(settings.PROFILE_DIR, f'{uuid.uuid4().hex}.prof')
+    profiler.dump_stats(stats_file)
+    profile = RequestProfile.objects.create(
+        path=request.get_full_path(),
+        method=request.method,
+        status_code=response.status_code,
+        user=request.user,
+        duration=duration,
+        query_count=len(queries),
+        query_duration=sum(query['time'] for query in queries),
+        queries=json.dumps(queries, ensure_ascii=False),
+        stats_file=stats_file,
+    )
+    prune_profiles()
+    response['X-Profile-Id'] = str(profile.pk)
+    return response
+
+
+def prune_profiles(keep=None):
+    """Оставляет только keep последних профилей вместе с их файлами."""
+    keep = settings.PROFILE_KEEP if keep is None else keep
+    stale = list(
+        RequestProfile.objects.order_by('-created', '-id')
+        .values_list('pk', 'stats_file')[keep:]
+    )
+    for _, stats_file in stale:
+        if os.path.exists(stats_file):
+            os.remove(stats_file)
+    RequestProfile.objects.filter(pk__in=[pk for pk, _ in stale]).delete()
+    return len(stale)
+
+
+def top_functions(stats_file, limit=None):
+    """Функции профиля по убыванию накопленного времени, время в мс."""
+    import pstats
+
+    if not os.path.exists(stats_file):
+        return []
+    stats = pstats.Stats(stats_file)
+    stats.sort_stats('cumulative')
+    rows = []
+    for function in stats.fcn_list[:limit or settings.PROFILE_TOP_FUNCTIONS]:
+        _, calls, total, cumulative, _ = stats.stats[function]
+        rows.append({
+            'function': pstats.func_std_string(function),
+            'calls': calls,
+            'total': total * 1000,
+            'cumulative': cumulative * 1000,
+        })
+    return rows
@@ -0,0 +1,10 @@
+from django.contrib.sessions.backends import cached_db
+
+from .db import run_write
+
+
+class SessionStore(cached_db.SessionStore):
+    """cached_db, сохранение которого повторяется при занятой БД."""
+
+    def save(self, must_create=False):
+        run_write(super().save, must_create)
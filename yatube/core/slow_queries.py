@@ -0,0 +1,131 @@
+import hashlib
+import os
+import re
+import time
+import traceback
+
+from django.conf import settings
+from django.db import DatabaseError, IntegrityError, connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import SlowQuery
+
+LITERALS = re.compile(r"'(?:[^']|'')*'|%s|\?|\b\d+(?:\.\d+)?\b")
+PLACEHOLDER_LISTS = re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)')
+SKIPPED_FILES = (
+    __file__,
+    os.path.join(os.path.dirname(__file__), 'middleware.py'),
+)
+
+
+def normalize_sql(sql):
+    """SQL без литералов и параметров: запросы одной формы совпадают."""
+    sql = LITERALS.sub('?', sql)
+    sql = PLACEHOLDER_LISTS.sub('(...)', sql)
+    return ' '.join(sql.split()).lower()
+
+
+def fingerprint(sql):
+    return hashlib.md5(normalize_sql(sql).encode()).hexdigest()
+
+
+def find_call_site():
+    """Ближайший к запросу кадр стека из кода проекта."""
+    for frame in reversed(traceback.extract_stack()):
+        path = frame.filename
+        if (
+            path.startswith(settings.BASE_DIR)
+            and 'site-packages' not in path
+            and path not in SKIPPED_FILES
+        ):
+            relative = os.path.relpath(path, settings.BASE_DIR)
+            return f'{relative}:{frame.lineno} in {frame.name}'
+    return ''
+
+
+class SlowQueryCollector:
+    """
+    Обёртка execute_wrapper: запоминает запросы дольше порога в мс.
+    Стек снимается только для медленных запросов, а EXPLAIN и запись
+    в БД делаются после ответа, вне обёртки.
+    """
+
+    def __init__(self, threshold):
+        self.threshold = threshold
+        self.slow = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = (time.perf_counter() - started) * 1000
+            if duration >= self.threshold:
+                self.slow.append({
+                    'alias': context['connection'].alias,
+                    'sql': sql,
+                    'params': params,
+                    'many': many,
+                    'duration': duration,
+                    'call_site': find_call_site(),
+                })
+
+
+def explain(alias, sql, params, many=False):
+    if many or not sql.lstrip().upper().startswith('SELECT'):
+        return ''
+    connection = connections[alias]
+    if connection.vendor == 'sqlite':
+        prefix = 'EXPLAIN QUERY PLAN '
+    else:
+        prefix = 'EXPLAIN '
+    try:
+        with transaction.atomic(using=alias), connection.cursor() as cursor:
+            cursor.execute(prefix + sql, params)
+            return '\n'.join(
+                ' '.join(str(column) for column in row)
+                for row in cursor.fetchall()
+            )
+    except DatabaseError as error:
+        return f'EXPLAIN не выполнен: {error}'
+
+
+def record_slow_query(query, url_name):
+    """
+    Учитывает запрос в SlowQuery его отпечатка. План, текст и место
+    вызова хранятся для худшего случая, EXPLAIN выполняется только
+    для нового отпечатка или нового худшего времени.
+    """
+    duration = query['duration']
+    queries = SlowQuery.objects.filter(fingerprint=fingerprint(query['sql']))
+    worst = queries.values_list('max_duration', flat=True).first()
+    sample = {}
+    if worst is None or duration > worst:
+        sample = {
+            'sql': query['sql'],
+            'plan': explain(
+                query['alias'], query['sql'], query['params'], query['many']
+            ),
+            'call_site': query['call_site'],
+            'url_name': url_name,
+            'max_duration': duration,
+        }
+    counters = {
+        'count': F('count') + 1,
+        'total_duration': F('total_duration') + duration,
+        'last_seen': timezone.now(),
+    }
+    if worst is not None:
+        queries.update(**counters, **sample)
+        return
+    try:
+        with transaction.atomic():
+            SlowQuery.objects.create(
+                fingerprint=fingerprint(query['sql']),
+                total_duration=duration,
+                last_seen=counters['last_seen'],
+                **sample,
+            )
+    except IntegrityError:
+        queries.update(**counters)
@@ -0,0 +1,112 @@
+import importlib
+import json
+import os
+import time
+
+# Django импортируется внутри функций: команда startup_profile меряет
+# холодный старт, и импорт самого Django должен попасть в замер.
+
+
+def warm_urlconf(resolver=None):
+    """Строит обратные словари URLconf, включая вложенные пространства."""
+    from django.urls import get_resolver
+
+    resolver = resolver or get_resolver()
+    resolver.reverse_dict
+    for _, namespace_resolver in resolver.namespace_dict.values():
+        warm_urlconf(namespace_resolver)
+
+
+def keeps_compiled(engine):
+    """Хранит ли движок скомпилированные шаблоны между запросами."""
+    from django.template.backends.django import DjangoTemplates
+    from django.template.loaders.cached import Loader as CachedLoader
+
+    if isinstance(engine, DjangoTemplates):
+        return any(
+            isinstance(loader, CachedLoader)
+            for loader in engine.engine.template_loaders
+        )
+    # Jinja2 держит скомпилированные шаблоны в env.cache, если он не 0.
+    return getattr(getattr(engine, 'env', None), 'cache', None) is not None
+
+
+def warm_templates():
+    """
+    Компилирует шаблоны проекта (templates/ и jinja2/) во всех движках,
+    которые хранят скомпилированные шаблоны: без cached.Loader результат
+    компиляции выбрасывается, и такой движок пропускается.
+    Шаблоны приложений, например админки, грузятся при первом обращении.
+    Возвращает число скомпилированных шаблонов.
+    """
+    from django.template import TemplateDoesNotExist, TemplateSyntaxError
+    from django.template import engines
+
+    compiled = 0
+    for engine in engines.all():
+        if not keeps_compiled(engine):
+            continue
+        for directory in engine.dirs:
+            for root, _, files in os.walk(directory):
+                for filename in files:
+                    name = os.path.relpath(
+                        os.path.join(root, filename), directory
+                    )
+                    try:
+                        engine.get_template(name)
+                    except (TemplateDoesNotExist, TemplateSyntaxError):
+                        continue
+                    compiled += 1
+    return compiled
+
+
+def preload():
+    """
+    Заканчивает тяжёлую инициализацию до fork (gunicorn --preload):
+    URLconf и скомпилированные шаблоны достаются воркерам готовыми,
+    при WSGI_WARM_CACHE - и прогретый кэш в памяти процесса.
+    Соединения с БД закрываются, чтобы воркеры не делили сокеты.
+    """
+    from django.conf import settings
+    from django.db import connections
+
+    warm_urlconf()
+    warm_templates()
+    if settings.WSGI_WARM_CACHE:
+        from posts.warmup import warm_on_start
+
+        warm_on_start()
+    connections.close_all()
+
+
+def measure_startup():
+    """Время этапов загрузки проекта в мс, от настроек до шаблонов."""
+    phases = []
+
+    def timed(name, func):
+        started = time.perf_counter()
+        result = func()
+        phases.append((name, (time.perf_counter() - started) * 1000))
+        return result
+
+    conf = timed(
+        'import django', lambda: importlib.import_module('django.conf')
+    )
+    timed('settings', lambda: conf.settings.INSTALLED_APPS)
+    timed('apps (imports + ready)', importlib.import_module('django').setup)
+    wsgi = timed(
+        'import handler',
+        lambda: importlib.import_module('django.core.handlers.wsgi'),
+    )
+    timed('middleware', wsgi.WSGIHandler)
+    timed('urlconf', warm_urlconf)
+    if not timed('templates', warm_templates):
+        # Кэша шаблонов нет: прогревать нечего, этап в замере пустой.
+        phases[-1] = ('templates (без кэша)', phases[-1][1])
+    return phases
+
+
+def main():
+    """Точка входа дочернего процесса команды startup_profile."""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yatube.settings')
+    print(json.dumps(measure_startup()))
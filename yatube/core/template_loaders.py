@@ -0,0 +1,30 @@
+from django.template.loaders import filesystem
+
+
+PRESERVE_WHITESPACE_TAGS = ('<pre', '<textarea')
+
+
+def minify(source):
+    """
+    Убирает отступы и пустые строки из исходника шаблона.
+    Переводы строк сохраняются, поэтому теги шаблонов и встроенные
+    скрипты, разбитые на строки, продолжают работать.
+    """
+    lines = (line.strip() for line in source.splitlines())
+    return '\n'.join(line for line in lines if line)
+
+
+class MinifyingFilesystemLoader(filesystem.Loader):
+    """
+    Загрузчик шаблонов проекта, сжимающий HTML при компиляции шаблона.
+    Вместе с cached.Loader это происходит один раз на процесс,
+    а не на каждый ответ.
+    """
+
+    def get_contents(self, origin):
+        source = super().get_contents(origin)
+        if not origin.name.endswith('.html'):
+            return source
+        if any(tag in source for tag in PRESERVE_WHITESPACE_TAGS):
+            return source
+        return minify(source)
@@ -0,0 +1,218 @@
+import glob
+import hashlib
+import os
+import shutil
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.runner import DiscoverRunner
+from django.test.utils import (
+    override_settings, setup_databases, teardown_databases,
+)
+from django.utils import timezone
+
+# Одна итерация PBKDF2: create_user и логин в тестах почти бесплатны,
+# а формат хэша тот же, что и в бою. Фоновый сброс просмотров
+# не пишет в тестовую БД посреди транзакций тестов. Кэш поиска авторов
+# и групп выключен: откат транзакции теста его не сбрасывает, а id
+# после отката достаются новым объектам.
+TEST_SETTINGS = override_settings(
+    PASSWORD_HASH_ITERATIONS=1,
+    VIEW_COUNT_FLUSH_THREAD=False,
+    LOOKUP_CACHE_MAX_AGE=0,
+)
+
+# Сид-данные получают id с этого значения, чтобы не пересекаться
+# с объектами, которые тесты создают с явными id.
+SEED_ID_START = 10 ** 6
+
+
+@contextmanager
+def run_on_commit(using=DEFAULT_DB_ALIAS):
+    """
+    Выполняет колбэки transaction.on_commit, добавленные внутри блока.
+    Транзакция TestCase не фиксируется, и без этого побочные эффекты
+    записи в тестах не наступают. Замена captureOnCommitCallbacks
+    из Django 3.2.
+    """
+    connection = connections[using]
+    start = len(connection.run_on_commit)
+    try:
+        yield
+    finally:
+        while len(connection.run_on_commit) > start:
+            callbacks = connection.run_on_commit[start:]
+            del connection.run_on_commit[start:]
+            for savepoint_ids, callback in callbacks:
+                callback()
+
+
+def snapshot_key():
+    """Хэш миграций всех приложений и параметров наполнения снимка."""
+    digest = hashlib.md5()
+    for app_config in apps.get_app_configs():
+        paths = glob.glob(os.path.join(app_config.path, 'migrations', '*.py'))
+        for path in sorted(paths):
+            digest.update(os.path.basename(path).encode())
+            with open(path, 'rb') as migration:
+                digest.update(migration.read())
+    with open(__file__, 'rb') as source:
+        digest.update(source.read())
+    digest.update(str(settings.TEST_SEED_SCALE).encode())
+    return digest.hexdigest()
+
+
+def seed_database(scale):
+    """
+    Наполняет БД scale авторами, scale // 10 + 1 группами
+    и 10 постами на автора. Посты датированы 2000 годом,
+    чтобы не попадать в свежие ленты тестов.
+    """
+    from posts.markup import render_post_text
+    from posts.models import Group, Post
+    from posts.rollups import rebuild_month_counts
+
+    if not scale:
+        return
+    User = get_user_model()
+    users = User.objects.bulk_create(
+        User(id=SEED_ID_START + i, username=f'seed-user-{i}')
+        for i in range(scale)
+    )
+    groups = Group.objects.bulk_create(
+        Group(
+            id=SEED_ID_START + i,
+            title=f'Сид-группа {i}',
+            slug=f'seed-group-{i}',
+            description='Группа для нагрузочных тестов',
+        )
+        for i in range(scale // 10 + 1)
+    )
+    posts = []
+    for i in range(scale * 10):
+        text = f'Сид-пост {i}'
+        posts.append(Post(
+            id=SEED_ID_START + i,
+            text=text,
+            text_html=render_post_text(text),
+            author=users[i % len(users)],
+            group=groups[i % len(groups)] if i % 2 else None,
+        ))
+    Post.objects.bulk_create(posts, batch_size=500)
+    # auto_now_add перезаписывает дату и в bulk_create.
+    Post.objects.filter(id__gte=SEED_ID_START).update(
+        pub_date=timezone.make_aware(datetime(2000, 1, 1))
+    )
+    rebuild_month_counts()
+
+
+def remove_stale_snapshots(path):
+    """
+    Удаляет снимки с другим ключом, кроме path. Рабочие копии test-<pid>
+    и сборки .tmp принадлежат прогонам, которые ещё идут, и не трогаются.
+    """
+    pattern = os.path.join(os.path.dirname(path), 'snapshot-*.sqlite3')
+    for stale in glob.glob(pattern):
+        if stale != path:
+            os.remove(stale)
+
+
+def build_snapshot(connection, path, verbosity=1):
+    """Создаёт, мигрирует и наполняет БД, сохраняя её в файл path."""
+    original_name = connection.settings_dict['NAME']
+    building = f'{path}.{os.getpid()}.tmp'
+    connection.settings_dict['TEST']['NAME'] = building
+    try:
+        connection.creation.create_test_db(
+            verbosity=verbosity, autoclobber=True, serialize=False,
+        )
+        seed_database(settings.TEST_SEED_SCALE)
+    finally:
+        connection.close()
+        connection.settings_dict['NAME'] = original_name
+        settings.DATABASES[connection.alias]['NAME'] = original_name
+    remove_stale_snapshots(path)
+    # os.replace атомарен: параллельные сборки не видят половину файла.
+    os.replace(building, path)
+
+
+def setup_snapshot_databases(verbosity=1, interactive=False, **kwargs):
+    """
+    Поднимает тестовую БД копированием файла-снимка вместо миграций.
+    Снимок собирается один раз и переиспользуется, пока не изменятся
+    миграции. Копии для --parallel Django делает тем же копированием
+    файла, изоляцию тестов дают транзакции TestCase.
+    """
+    connection = connections['default']
+    if connection.vendor != 'sqlite':
+        return setup_databases(verbosity, interactive, **kwargs)
+    os.makedirs(settings.TEST_SNAPSHOT_DIR, exist_ok=True)
+    snapshot = os.path.join(
+        settings.TEST_SNAPSHOT_DIR, f'snapshot-{snapshot_key()}.sqlite3'
+    )
+    if not os.path.exists(snapshot):
+        build_snapshot(connection, snapshot, verbosity)
+    test_name = os.path.join(
+        settings.TEST_SNAPSHOT_DIR, f'test-{os.getpid()}.sqlite3'
+    )
+    shutil.copyfile(snapshot, test_name)
+    connection.settings_dict['TEST']['NAME'] = test_name
+    # Сериализация содержимого нужна только serialized_rollback.
+    connection.settings_dict['TEST']['SERIALIZE'] = False
+    kwargs['keepdb'] = True
+    return setup_databases(verbosity, interactive, **kwargs)
+
+
+def teardown_snapshot_databases(old_config, verbosity=1, **kwargs):
+    """
+    Сбрасывает буфер просмотров постов, пока тестовая БД ещё на месте:
+    иначе это сделал бы atexit уже в боевой БД. Копия снимка
+    одноразовая, --keepdb к ней не относится.
+    """
+    from posts.counters import view_counter
+
+    view_counter.flush_quietly()
+    teardown_databases(old_config, verbosity=verbosity, keepdb=False, **kwargs)
+
+
+class SnapshotTestRunner(DiscoverRunner):
+    """
+    Раннер manage.py test: БД из снимка, дешёвое хэширование паролей,
+    без фонового сброса просмотров и со временем прогона в конце вывода.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        TEST_SETTINGS.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        TEST_SETTINGS.disable()
+        super().teardown_test_environment(**kwargs)
+
+    def setup_databases(self, **kwargs):
+        return setup_snapshot_databases(
+            self.verbosity,
+            self.interactive,
+            debug_sql=self.debug_sql,
+            parallel=self.parallel,
+            **kwargs,
+        )
+
+    def teardown_databases(self, old_config, **kwargs):
+        teardown_snapshot_databases(
+            old_config, verbosity=self.verbosity, parallel=self.parallel,
+        )
+
+    def run_tests(self, *args, **kwargs):
+        started = time.perf_counter()
+        result = super().run_tests(*args, **kwargs)
+        sys.stderr.write(
+            f'Время прогона: {time.perf_counter() - started:.2f} с\n'
+        )
+        return result
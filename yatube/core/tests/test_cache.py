@@ -0,0 +1,112 @@
+import threading
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from ..cache import get_or_compute, needs_early_refresh
+
+
+class SlowCounter:
+    """compute для get_or_compute: считает вызовы и работает delay секунд."""
+
+    def __init__(self, delay=0.2):
+        self.delay = delay
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def __call__(self):
+        with self.lock:
+            self.calls += 1
+            calls = self.calls
+        time.sleep(self.delay)
+        return f'значение {calls}'
+
+
+@override_settings(CACHE_LOCK_POLL=0.01, CACHE_XFETCH_BETA=0)
+class GetOrComputeTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def concurrent(self, compute, version, threads=10):
+        """Одновременные get_or_compute из threads потоков."""
+        results = []
+        barrier = threading.Barrier(threads)
+
+        def worker():
+            barrier.wait()
+            results.append(
+                get_or_compute('feed', compute, 60, version=version)
+            )
+
+        workers = [threading.Thread(target=worker) for _ in range(threads)]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        return results
+
+    def test_cold_cache_computed_once(self):
+        """Без записи в кэше считает один поток, остальные ждут его."""
+        compute = SlowCounter()
+        results = self.concurrent(compute, version='v1')
+        self.assertEqual(compute.calls, 1)
+        self.assertEqual(set(results), {'значение 1'})
+
+    def test_new_version_recomputed_once_serving_stale(self):
+        """
+        После смены версии пересчитывает один поток, остальные сразу
+        получают прежнее значение.
+        """
+        compute = SlowCounter()
+        get_or_compute('feed', compute, 60, version='v1')
+        results = self.concurrent(compute, version='v2')
+        self.assertEqual(compute.calls, 2)
+        self.assertEqual(results.count('значение 2'), 1)
+        self.assertEqual(results.count('значение 1'), 9)
+        self.assertEqual(
+            get_or_compute('feed', compute, 60, version='v2'), 'значение 2'
+        )
+
+    def test_soft_expiry_recomputed_once(self):
+        """Истёкший мягкий срок - один пересчёт, жёсткий ещё не прошёл."""
+        compute = SlowCounter(delay=0.1)
+        get_or_compute('feed', compute, 0.05)
+        time.sleep(0.1)
+        results = self.concurrent(compute, version=None)
+        self.assertEqual(compute.calls, 2)
+        self.assertEqual(results.count('значение 1'), 9)
+
+    def test_not_cacheable_value_not_stored(self):
+        """should_cache=False - значение не сохраняется и считается снова."""
+        compute = SlowCounter(delay=0)
+        for _ in range(2):
+            get_or_compute(
+                'feed', compute, 60, should_cache=lambda value: False,
+            )
+        self.assertEqual(compute.calls, 2)
+        self.assertIsNone(cache.get('feed'))
+        self.assertIsNone(cache.get('feed:lock'))
+
+    def test_lock_released_after_error(self):
+        """Ошибка пересчёта снимает блокировку."""
+        def fail():
+            raise ValueError
+        with self.assertRaises(ValueError):
+            get_or_compute('feed', fail, 60)
+        self.assertIsNone(cache.get('feed:lock'))
+
+    def test_early_refresh_probability(self):
+        """XFetch: далеко от срока - нет, у самого срока - почти всегда."""
+        now = 1000
+        with mock.patch('core.cache.random.random', return_value=0.5):
+            self.assertFalse(
+                needs_early_refresh(now + 60, 0.1, now=now, beta=1)
+            )
+            self.assertTrue(
+                needs_early_refresh(now + 0.01, 0.1, now=now, beta=1)
+            )
+            self.assertFalse(
+                needs_early_refresh(now + 0.01, 0.1, now=now, beta=0)
+            )
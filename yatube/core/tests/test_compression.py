@@ -0,0 +1,60 @@
+import gzip
+
+from django.contrib.auth import get_user_model
+from django.template.loader import get_template
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Post
+from ..template_loaders import minify
+
+
+User = get_user_model()
+
+
+class CompressionTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.guest_client = Client()
+        cls.user = User.objects.create_user(username='auth')
+        for i in range(10):
+            Post.objects.create(author=cls.user, text=f'Пост {i} ' * 20)
+
+    def test_gzip_when_accepted(self):
+        """Большой ответ сжимается gzip, если клиент его принимает."""
+        response = self.guest_client.get(
+            reverse('posts:index'), HTTP_ACCEPT_ENCODING='gzip'
+        )
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Server-Timing', response)
+        self.assertIn('Пост 9', gzip.decompress(response.content).decode())
+
+    def test_no_compression_without_accept_encoding(self):
+        """Без Accept-Encoding ответ не сжимается."""
+        response = self.guest_client.get(reverse('posts:index'))
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    @override_settings(COMPRESSION_MIN_SIZE=10 ** 6)
+    def test_small_responses_not_compressed(self):
+        """Ответы меньше порога не сжимаются."""
+        response = self.guest_client.get(
+            reverse('posts:index'), HTTP_ACCEPT_ENCODING='gzip'
+        )
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+
+class MinifyTests(TestCase):
+    def test_minify_strips_indentation(self):
+        """Отступы и пустые строки удаляются, переводы строк остаются."""
+        self.assertEqual(
+            minify('<ul>\n    <li>\n\n      {{ x }}\n    </li>\n</ul>\n'),
+            '<ul>\n<li>\n{{ x }}\n</li>\n</ul>',
+        )
+
+    def test_project_templates_are_minified(self):
+        """Шаблоны проекта загружаются уже без отступов."""
+        source = get_template('posts/index.html').template.source
+        self.assertFalse(any(
+            line.startswith(' ') for line in source.splitlines()
+        ))
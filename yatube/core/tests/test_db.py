@@ -0,0 +1,79 @@
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import OperationalError, connection
+from django.test import TransactionTestCase, override_settings
+
+from posts.models import Post
+from ..db import run_write
+
+
+User = get_user_model()
+
+
+@override_settings(DB_LOCK_BACKOFF=0)
+class SqliteWriteTests(TransactionTestCase):
+    def test_busy_timeout_configured(self):
+        """Соединение открывается с busy_timeout из настроек."""
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA busy_timeout')
+            self.assertEqual(cursor.fetchone()[0], 5000)
+
+    def test_run_write_retries_lock_errors(self):
+        """Ошибка блокировки повторяется, пока запись не пройдёт."""
+        func = mock.Mock(side_effect=[
+            OperationalError('database is locked'),
+            OperationalError('database is locked'),
+            'saved',
+        ])
+        with self.assertLogs('core.db', 'WARNING') as logs:
+            self.assertEqual(run_write(func), 'saved')
+        self.assertEqual(func.call_count, 3)
+        self.assertEqual(len(logs.output), 2)
+
+    @override_settings(DB_LOCK_RETRIES=1)
+    def test_run_write_gives_up(self):
+        """После DB_LOCK_RETRIES повторов ошибка пробрасывается."""
+        func = mock.Mock(side_effect=OperationalError('database is locked'))
+        with self.assertRaises(OperationalError), \
+                self.assertLogs('core.db', 'WARNING'):
+            run_write(func)
+        self.assertEqual(func.call_count, 2)
+
+    def test_other_errors_not_retried(self):
+        """Прочие ошибки БД не повторяются."""
+        func = mock.Mock(side_effect=OperationalError('no such table: x'))
+        with self.assertRaises(OperationalError):
+            run_write(func)
+        func.assert_called_once()
+
+    def test_retry_applies_side_effects_once(self):
+        """Эффекты обработчиков отменённой попытки не применяются."""
+        user = User.objects.create_user(username='auth')
+        attempts = []
+
+        def create():
+            Post.objects.create(author=user, text='Пост')
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise OperationalError('database is locked')
+
+        with mock.patch('posts.signals.bump_posts_version') as bump, \
+                self.assertLogs('core.db', 'WARNING'):
+            run_write(create)
+        bump.assert_called_once()
+        self.assertEqual(Post.objects.count(), 1)
+
+    def test_stress_command_loses_no_writes(self):
+        """Параллельные писатели сохраняют все записи."""
+        if connection.creation.is_in_memory_db(
+            connection.settings_dict['NAME']
+        ):
+            self.skipTest('Процессам нужна файловая БД.')
+        out = StringIO()
+        call_command('db_stress', writers=3, writes=5, stdout=out)
+        self.assertIn('Сохранено: 15, ошибок блокировки: 0', out.getvalue())
+        self.assertIn('потеряно: 0', out.getvalue())
+        self.assertFalse(Post.objects.exists())
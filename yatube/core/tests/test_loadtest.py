@@ -0,0 +1,101 @@
+import threading
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import LiveServerTestCase, SimpleTestCase
+
+from posts.models import Group, Post
+from ..loadtest import LoadTest, histogram, parse_mix
+
+
+User = get_user_model()
+
+
+class LoadTestHelpersTests(SimpleTestCase):
+    def test_parse_mix(self):
+        """Веса сценариев читаются из строки, неизвестные отклоняются."""
+        self.assertEqual(
+            parse_mix('index=3, post_detail'),
+            {'index': 3, 'post_detail': 1},
+        )
+        with self.assertRaises(ValueError):
+            parse_mix('unknown=1')
+
+    def test_histogram(self):
+        """Задержки раскладываются по корзинам, хвост - в последнюю."""
+        self.assertEqual(
+            histogram([1, 5, 7, 60000], buckets=(5, 10)),
+            [2, 1, 1],
+        )
+
+    def test_throttled_reported_separately(self):
+        """Ответы 429 считаются отдельно и не попадают в ошибки."""
+        loadtest = LoadTest('http://testserver', {'index': 1}, {})
+        loadtest.results = [
+            ('login', 200, 1.0),
+            ('login', 429, 1.0),
+            ('login', 500, 1.0),
+        ]
+        row = loadtest.summary()['login']
+        self.assertEqual(row['errors'], 1)
+        self.assertEqual(row['throttled'], 1)
+
+    def test_users_assigned_round_robin(self):
+        """Потоки получают пользователей из пула по кругу."""
+        loadtest = LoadTest(
+            'http://testserver', {'login': 1}, {},
+            usernames=['first', 'second'], password='secret',
+        )
+        names = []
+
+        def worker():
+            names.append(loadtest.username)
+            names.append(loadtest.username)
+
+        threads = [threading.Thread(target=worker) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+            thread.join()
+        self.assertEqual(
+            names, ['first', 'first', 'second', 'second', 'first', 'first']
+        )
+
+
+class LoadTestCommandTests(LiveServerTestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='auth', password='Sup3r-secret-pass'
+        )
+        self.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        Post.objects.create(
+            author=self.user, text='Тестовый пост', group=self.group
+        )
+
+    def test_loadtest_against_live_server(self):
+        """Все сценарии смеси проходят без ошибок на живом сервере."""
+        out = StringIO()
+        call_command(
+            'loadtest',
+            url=self.live_server_url,
+            requests=30,
+            concurrency=3,
+            username='auth',
+            password='Sup3r-secret-pass',
+            mix='index=1,group_list=1,profile=1,post_detail=1,'
+                'login=1,post_create=1',
+            seed=1,
+            stdout=out,
+        )
+        output = out.getvalue()
+        self.assertIn('30 запросов', output)
+        self.assertIn('ошибок 0 (0.0%)', output)
+        for scenario in ('index', 'post_detail', 'login', 'post_create'):
+            self.assertIn(scenario, output)
+        self.assertTrue(
+            Post.objects.filter(text__startswith='Пост нагрузочного').exists()
+        )
@@ -0,0 +1,75 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from core import middleware
+from core.testing import run_on_commit
+from posts.models import Post
+
+
+User = get_user_model()
+
+
+@override_settings(PAGE_CACHE_TIMEOUT=60)
+class AnonymousPageCacheTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        Post.objects.create(author=cls.user, text='Первый пост')
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def test_anonymous_page_served_from_cache(self):
+        """Повторная анонимная страница отдаётся без запросов к БД."""
+        url = reverse('posts:index')
+        self.guest_client.get(url)
+        with self.assertNumQueries(0):
+            response = self.guest_client.get(url)
+        self.assertContains(response, 'Первый пост')
+
+    def test_post_write_invalidates_cache(self):
+        """Новый пост сразу виден анонимам."""
+        url = reverse('posts:index')
+        self.guest_client.get(url)
+        with run_on_commit():
+            Post.objects.create(author=self.user, text='Второй пост')
+        self.assertContains(self.guest_client.get(url), 'Второй пост')
+
+    def test_logged_in_user_bypasses_cache(self):
+        """Залогиненный пользователь не получает анонимную страницу."""
+        url = reverse('posts:index')
+        self.guest_client.get(url)
+        response = self.authorized_client.get(url)
+        self.assertContains(response, 'Выйти')
+        self.assertTemplateUsed(response, 'posts/index.html')
+
+    def test_other_namespaces_not_cached(self):
+        """Страницы users не кэшируются."""
+        url = reverse('users:login')
+        self.guest_client.get(url)
+        response = self.guest_client.get(url)
+        self.assertTemplateUsed(response, 'users/login.html')
+
+    def test_compressed_page_cached_per_encoding(self):
+        """Из кэша отдаётся уже сжатый ответ, без повторного сжатия."""
+        for i in range(10):
+            Post.objects.create(author=self.user, text=f'Пост {i} ' * 20)
+        url = reverse('posts:index')
+        gzip_compress = mock.Mock(wraps=middleware.gzip_compress)
+        with mock.patch.dict(middleware.COMPRESSORS, {'gzip': gzip_compress}):
+            for _ in range(2):
+                response = self.guest_client.get(
+                    url, HTTP_ACCEPT_ENCODING='gzip'
+                )
+                self.assertEqual(response['Content-Encoding'], 'gzip')
+        gzip_compress.assert_called_once()
+        response = self.guest_client.get(url)
+        self.assertFalse(response.has_header('Content-Encoding'))
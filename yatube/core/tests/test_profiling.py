@@ -0,0 +1,80 @@
+import os
+import shutil
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Post
+from ..models import RequestProfile
+from ..profiling import prune_profiles, top_functions
+
+
+User = get_user_model()
+PROFILE_DIR = tempfile.mkdtemp()
+
+
+@override_settings(PROFILE_DIR=PROFILE_DIR)
+class ProfilingTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.staff = User.objects.create_user(
+            username='staff', is_staff=True, is_superuser=True
+        )
+        cls.user = User.objects.create_user(username='auth')
+        cls.post = Post.objects.create(author=cls.user, text='Тестовый пост')
+        cls.url = reverse('posts:post_detail', args=(cls.post.id,))
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(PROFILE_DIR, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.staff_client = Client()
+        self.staff_client.force_login(self.staff)
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def test_staff_request_is_profiled(self):
+        """Запрос сотрудника с ?_profile сохраняет pstats и SQL."""
+        response = self.staff_client.get(self.url, {'_profile': ''})
+        profile = RequestProfile.objects.get()
+        self.assertEqual(response['X-Profile-Id'], str(profile.pk))
+        self.assertEqual(profile.status_code, 200)
+        self.assertGreater(profile.query_count, 0)
+        self.assertIn('posts_post', profile.queries)
+        self.assertTrue(os.path.exists(profile.stats_file))
+        self.assertTrue(top_functions(profile.stats_file, limit=5))
+
+    def test_header_switch(self):
+        """Профилирование включается и заголовком X-Profile."""
+        self.staff_client.get(self.url, HTTP_X_PROFILE='1')
+        self.assertEqual(RequestProfile.objects.count(), 1)
+
+    def test_non_staff_is_ignored(self):
+        """Обычный пользователь и гость не могут включить профилирование."""
+        self.authorized_client.get(self.url, {'_profile': ''})
+        Client().get(self.url, {'_profile': ''})
+        self.assertFalse(RequestProfile.objects.exists())
+
+    def test_admin_page_lists_top_functions(self):
+        """Страница профиля в админке показывает топ функций."""
+        self.staff_client.get(self.url, {'_profile': ''})
+        profile = RequestProfile.objects.get()
+        response = self.staff_client.get(
+            reverse('admin:core_requestprofile_change', args=(profile.pk,))
+        )
+        self.assertContains(response, 'Топ функций')
+        self.assertContains(response, 'post_detail')
+
+    def test_prune_removes_files(self):
+        """Старые профили удаляются вместе с файлами."""
+        for _ in range(3):
+            self.staff_client.get(self.url, {'_profile': ''})
+        stale = RequestProfile.objects.order_by('created', 'id').first()
+        self.assertEqual(prune_profiles(keep=1), 2)
+        self.assertEqual(RequestProfile.objects.count(), 1)
+        self.assertFalse(os.path.exists(stale.stats_file))
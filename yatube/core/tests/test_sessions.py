@@ -0,0 +1,59 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.sessions.models import Session
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from ..management.commands.purge_sessions import purge_expired_sessions
+
+
+class PurgeSessionsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        now = timezone.now()
+        for i in range(5):
+            Session.objects.create(
+                session_key=f'expired{i}',
+                session_data='',
+                expire_date=now - timedelta(days=1),
+            )
+        Session.objects.create(
+            session_key='alive',
+            session_data='',
+            expire_date=now + timedelta(days=1),
+        )
+
+    def test_purge_deletes_only_expired_in_batches(self):
+        """Удаляются только просроченные сессии, пачками любого размера."""
+        deleted = purge_expired_sessions(batch_size=2)
+        self.assertEqual(deleted, 5)
+        self.assertEqual(
+            list(Session.objects.values_list('session_key', flat=True)),
+            ['alive'],
+        )
+
+    @override_settings(
+        SESSION_ENGINE='django.contrib.sessions.backends.signed_cookies'
+    )
+    def test_purge_skips_cookie_engine(self):
+        """С signed_cookies команда ничего не удаляет."""
+        call_command('purge_sessions', stdout=StringIO())
+        self.assertEqual(Session.objects.count(), 6)
+
+
+class SessionBenchmarkTests(TestCase):
+    def test_cached_engines_skip_session_table(self):
+        """cached_db и signed_cookies не ходят в django_session."""
+        out = StringIO()
+        call_command('session_benchmark', requests=3, stdout=out)
+        rows = [line.split() for line in out.getvalue().splitlines()[1:]]
+        session_queries = {
+            (engine, page): float(per_request)
+            for engine, page, _, per_request in rows
+        }
+        self.assertEqual(session_queries[('db', 'index')], 1)
+        self.assertEqual(session_queries[('cached_db', 'index')], 0)
+        self.assertEqual(session_queries[('signed_cookies', 'profile')], 0)
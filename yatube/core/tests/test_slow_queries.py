@@ -0,0 +1,65 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Post
+from ..models import SlowQuery
+from ..slow_queries import fingerprint, normalize_sql
+
+
+User = get_user_model()
+
+
+@override_settings(SLOW_QUERY_THRESHOLD=1e-6)
+class SlowQueryLogTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.guest_client = Client()
+        cls.user = User.objects.create_user(username='auth')
+        cls.post = Post.objects.create(author=cls.user, text='Тестовый пост')
+
+    def test_normalize_sql(self):
+        """Литералы и списки параметров не влияют на отпечаток."""
+        self.assertEqual(
+            normalize_sql("SELECT * FROM t WHERE id IN (%s, %s) AND x = 'a'"),
+            'select * from t where id in (...) and x = ?',
+        )
+        self.assertEqual(
+            fingerprint('SELECT 1 FROM t WHERE id = 10'),
+            fingerprint('select 1 from t where id = 20'),
+        )
+
+    def test_post_view_queries_logged_with_plan(self):
+        """Запросы страницы поста пишутся с планом, адресом и местом."""
+        url = reverse('posts:post_detail', args=(self.post.id,))
+        self.guest_client.get(url)
+        self.guest_client.get(url)
+        query = SlowQuery.objects.get(sql__contains='"posts_post"."text"')
+        self.assertEqual(query.count, 2)
+        self.assertEqual(query.url_name, 'posts:post_detail')
+        self.assertIn('posts/views.py', query.call_site)
+        self.assertIn('posts_post', query.plan)
+
+    def test_other_namespaces_ignored(self):
+        """Запросы API в журнал не попадают."""
+        self.guest_client.get(reverse('api:post_list'))
+        self.assertFalse(SlowQuery.objects.exists())
+
+    @override_settings(SLOW_QUERY_THRESHOLD=0)
+    def test_zero_threshold_disables_log(self):
+        """Нулевой порог выключает журнал."""
+        self.guest_client.get(reverse('posts:index'))
+        self.assertFalse(SlowQuery.objects.exists())
+
+    def test_report_command(self):
+        """Команда выводит отчёт и очищает журнал с --reset."""
+        self.guest_client.get(reverse('posts:index'))
+        out = StringIO()
+        call_command('slow_queries', plans=True, reset=True, stdout=out)
+        self.assertIn('posts:index', out.getvalue())
+        self.assertIn('SELECT', out.getvalue())
+        self.assertFalse(SlowQuery.objects.exists())
@@ -0,0 +1,48 @@
+from django.conf import settings
+from django.test import SimpleTestCase, override_settings
+from django.urls import get_resolver
+
+from ..management.commands.startup_profile import parse_importtime
+from ..startup import warm_templates, warm_urlconf
+
+
+IMPORTTIME_OUTPUT = '''\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   django.utils
+import time:      2500 |       2620 | django
+'''
+
+
+class StartupTests(SimpleTestCase):
+    def test_parse_importtime(self):
+        """Вывод -X importtime разбирается в миллисекунды и глубину."""
+        modules = parse_importtime(IMPORTTIME_OUTPUT)
+        self.assertEqual(modules, [
+            {
+                'module': 'django.utils',
+                'depth': 1,
+                'self': 0.12,
+                'cumulative': 0.12,
+            },
+            {
+                'module': 'django',
+                'depth': 0,
+                'self': 2.5,
+                'cumulative': 2.62,
+            },
+        ])
+
+    def test_warm_up(self):
+        """Прогрев строит словари URL и компилирует шаблоны проекта."""
+        warm_urlconf()
+        self.assertTrue(get_resolver()._populated)
+        self.assertGreater(warm_templates(), 10)
+
+    def test_templates_skipped_without_cached_loader(self):
+        """Без cached.Loader шаблоны не прогреваются впустую."""
+        templates = [dict(settings.TEMPLATES[0], OPTIONS=dict(
+            settings.TEMPLATES[0]['OPTIONS'],
+            loaders=['django.template.loaders.filesystem.Loader'],
+        ))]
+        with override_settings(TEMPLATES=templates):
+            self.assertEqual(warm_templates(), 0)
@@ -0,0 +1,50 @@
+import os
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.test import TestCase, override_settings
+
+from posts.models import Group, Post
+from ..testing import (
+    SEED_ID_START, remove_stale_snapshots, seed_database, snapshot_key,
+)
+
+
+User = get_user_model()
+
+
+class SnapshotTests(TestCase):
+    def test_seed_database(self):
+        """Сид создаёт авторов, группы и посты с id вне диапазона тестов."""
+        seed_database(scale=3)
+        self.assertEqual(User.objects.count(), 3)
+        self.assertEqual(Group.objects.count(), 1)
+        self.assertEqual(Post.objects.count(), 30)
+        self.assertFalse(Post.objects.filter(id__lt=SEED_ID_START).exists())
+
+    def test_snapshot_key_depends_on_seed_scale(self):
+        """Другой масштаб сида требует другого снимка."""
+        with override_settings(TEST_SEED_SCALE=100):
+            seeded = snapshot_key()
+        self.assertNotEqual(snapshot_key(), seeded)
+
+    def test_stale_snapshots_removed_copies_kept(self):
+        """Удаляются только старые снимки, копии других прогонов - нет."""
+        with tempfile.TemporaryDirectory() as directory:
+            names = (
+                'snapshot-old.sqlite3', 'snapshot-new.sqlite3',
+                'test-123.sqlite3', 'snapshot-new.sqlite3.456.tmp',
+            )
+            for name in names:
+                open(os.path.join(directory, name), 'w').close()
+            remove_stale_snapshots(
+                os.path.join(directory, 'snapshot-new.sqlite3')
+            )
+            self.assertEqual(sorted(os.listdir(directory)), sorted(names[1:]))
+
+    def test_fast_password_hashing(self):
+        """Во время тестов пароль хэшируется одной итерацией."""
+        self.assertTrue(
+            make_password('secret').startswith('pbkdf2_sha256$1$')
+        )
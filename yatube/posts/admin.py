@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Post, Group
+from .models import ArchivedPost, Post, Group
 
 
 class PostAdmin(admin.ModelAdmin):
@@ -9,6 +9,7 @@ class PostAdmin(admin.ModelAdmin):
         'pub_date',
         'author',
         'group',
+        'views',
     )
     search_fields = ('text',)
     list_filter = ('pub_date',)
@@ -16,5 +17,20 @@ class PostAdmin(admin.ModelAdmin):
     list_editable = ('group',)
 
 
+class ArchivedPostAdmin(admin.ModelAdmin):
+    list_display = (
+        'pk',
+        'text',
+        'pub_date',
+        'author',
+        'group',
+        'archived_at',
+    )
+    search_fields = ('text',)
+    list_filter = ('pub_date',)
+    empty_value_display = '-пусто-'
+
+
 admin.site.register(Post, PostAdmin)
+admin.site.register(ArchivedPost, ArchivedPostAdmin)
 admin.site.register(Group)
@@ -0,0 +1,113 @@
+import threading
+
+from django.utils.functional import cached_property
+
+from core.db import run_write
+from .models import ArchivedPost, Post
+
+ARCHIVED_FIELDS = (
+    'id', 'text', 'text_html', 'pub_date', 'author_id', 'group_id', 'views',
+)
+
+# Поднят, пока move_batch удаляет перенесённые посты.
+archiving = threading.local()
+
+
+def is_archiving():
+    return getattr(archiving, 'active', False)
+
+
+def move_batch(before, batch_size):
+    """
+    Переносит до batch_size самых старых постов раньше before.
+    Выборка идёт в той же транзакции, что и перенос: правки
+    и сброс просмотров, успевшие между ними, не теряются.
+    """
+    rows = list(
+        Post.objects.select_for_update()
+        .filter(pub_date__lt=before)
+        .order_by('pub_date', 'id')
+        .values(*ARCHIVED_FIELDS)[:batch_size]
+    )
+    if not rows:
+        return 0
+    ArchivedPost.objects.bulk_create(ArchivedPost(**row) for row in rows)
+    # delete(), а не _raw_delete: сигналы обновляют кэши и карту сайта
+    # так же, как при удалении поста. Счётчики месяцев остаются как есть
+    # (см. is_archiving в posts.signals): архивные посты по-прежнему
+    # видны в архиве по месяцам.
+    archiving.active = True
+    try:
+        Post.objects.filter(id__in=[row['id'] for row in rows]).delete()
+    finally:
+        archiving.active = False
+    return len(rows)
+
+
+def archive_old_posts(before, batch_size):
+    """
+    Переносит посты с pub_date раньше before в ArchivedPost пачками
+    по batch_size, каждая пачка - отдельная короткая транзакция.
+    Возвращает число перенесённых постов.
+    """
+    moved = 0
+    while True:
+        count = run_write(move_batch, before, batch_size)
+        if not count:
+            return moved
+        moved += count
+
+
+class ChainedPosts:
+    """
+    Лента для Paginator и paginate_by_cursor: сначала основные посты,
+    за ними архивные.
+    В архив уходят самые старые посты, поэтому порядок ленты
+    (-pub_date, -id) при склейке сохраняется, а архив читается только
+    на страницах, до которых не хватило основной таблицы.
+    """
+
+    def __init__(self, hot, cold):
+        self.hot = hot
+        self.cold = cold
+
+    def filter(self, *args, **kwargs):
+        return ChainedPosts(
+            self.hot.filter(*args, **kwargs),
+            self.cold.filter(*args, **kwargs),
+        )
+
+    def order_by(self, *fields):
+        """Порядок склейки верен только для порядка ленты от новых."""
+        return ChainedPosts(
+            self.hot.order_by(*fields), self.cold.order_by(*fields)
+        )
+
+    @cached_property
+    def hot_count(self):
+        return self.hot.count()
+
+    def count(self):
+        return self.hot_count + self.cold.count()
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index:index + 1][0]
+        start, stop = index.start or 0, index.stop
+        if not start:
+            # Первая порция (курсорная пагинация) обходится без COUNT.
+            posts = list(self.hot[:stop])
+            if len(posts) < stop:
+                posts += self.cold[:stop - len(posts)]
+            return posts
+        posts = []
+        if start < self.hot_count:
+            posts += self.hot[start:min(stop, self.hot_count)]
+        if stop > self.hot_count:
+            posts += self.cold[
+                max(start - self.hot_count, 0):stop - self.hot_count
+            ]
+        return posts
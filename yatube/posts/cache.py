@@ -0,0 +1,46 @@
+import uuid
+
+from django.core.cache import cache
+
+
+POSTS_VERSION_KEY = 'posts:version'
+VIEWS_VERSION_KEY = 'posts:views:version'
+
+
+def get_version(key):
+    """Версия, общая для всех процессов через кэш; создаётся при чтении."""
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid.uuid4().hex, None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(key):
+    cache.set(key, uuid.uuid4().hex, None)
+
+
+def get_posts_version():
+    """
+    Текущая версия данных постов. Входит в ключи всех кэшей,
+    зависящих от постов, поэтому смена версии разом делает их
+    неактуальными.
+    """
+    return get_version(POSTS_VERSION_KEY)
+
+
+def bump_posts_version():
+    bump_version(POSTS_VERSION_KEY)
+
+
+def get_views_version():
+    """
+    Версия числа просмотров. Меняется при каждом сбросе счётчиков
+    (posts/counters.py) и входит только в ключи страниц, которые
+    показывают просмотры.
+    """
+    return get_version(VIEWS_VERSION_KEY)
+
+
+def bump_views_version():
+    bump_version(VIEWS_VERSION_KEY)
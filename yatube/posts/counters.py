@@ -0,0 +1,147 @@
+import atexit
+import logging
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import DatabaseError, connections, transaction
+from django.db.models import F
+
+from core.db import run_write
+from .cache import bump_views_version
+from .models import ArchivedPost, Post
+
+logger = logging.getLogger('posts.counters')
+
+# Предел числа параметров в одном запросе SQLite - 999.
+UPDATE_BATCH_SIZE = 500
+
+
+def write_view_counts(counts):
+    """
+    Прибавляет counts {id поста: просмотры} к views одной транзакцией.
+    Посты с одинаковым приращением обновляются одним UPDATE, так что
+    запросов столько, сколько разных приращений, а не постов.
+    Перенесённые в архив посты досчитываются в ArchivedPost.
+    """
+    by_increment = defaultdict(list)
+    for post_id, count in counts.items():
+        by_increment[count].append(post_id)
+    with transaction.atomic():
+        for count, post_ids in by_increment.items():
+            for start in range(0, len(post_ids), UPDATE_BATCH_SIZE):
+                batch = post_ids[start:start + UPDATE_BATCH_SIZE]
+                for model in (Post, ArchivedPost):
+                    model.objects.filter(id__in=batch).update(
+                        views=F('views') + count
+                    )
+
+
+class ViewCounter:
+    """
+    Буфер просмотров постов в памяти процесса. Просмотры копятся
+    по id поста и пишутся в БД пачкой, когда набралось
+    VIEW_COUNT_FLUSH_THRESHOLD просмотров, раз в VIEW_COUNT_FLUSH_INTERVAL
+    секунд фоновым потоком (в том числе у простаивающего процесса)
+    и при нормальном выходе процесса. Убитый SIGKILL процесс теряет
+    просмотры, накопленные с последнего сброса. Пока запись идёт, снятые
+    просмотры по-прежнему видны в pending. Если запись не удалась,
+    они возвращаются в буфер и уйдут со следующим сбросом.
+    После сброса меняется версия просмотров, и закэшированные страницы
+    с их числом (post_detail, profile) пересчитываются.
+    """
+
+    def __init__(self):
+        self.counts = Counter()
+        # Снятые для записи, но ещё не зафиксированные в БД просмотры.
+        self.in_flight = Counter()
+        self.pending_total = 0
+        self.last_flush = time.monotonic()
+        self.lock = threading.Lock()
+        self.flusher_pid = None
+
+    def start_flusher(self):
+        """
+        Фоновый поток сброса, по одному на процесс: после fork потоки
+        родителя не продолжаются, поэтому поток запускается заново.
+        Вызывается под self.lock.
+        """
+        if self.flusher_pid == os.getpid():
+            return
+        self.flusher_pid = os.getpid()
+        threading.Thread(
+            target=self.flush_periodically, name='view-counter', daemon=True,
+        ).start()
+
+    def flush_periodically(self):
+        while True:
+            time.sleep(settings.VIEW_COUNT_FLUSH_INTERVAL)
+            try:
+                self.flush_quietly()
+            except Exception:
+                # Поток один на процесс: его смерть остановила бы сброс
+                # до перезапуска процесса.
+                logger.exception('Сбой фонового сброса просмотров')
+            finally:
+                # Соединение потока не держится открытым между сбросами.
+                connections.close_all()
+
+    def add(self, post_id, count=1):
+        with self.lock:
+            if settings.VIEW_COUNT_FLUSH_THREAD:
+                self.start_flusher()
+            self.counts[post_id] += count
+            self.pending_total += count
+            due = (
+                self.pending_total >= settings.VIEW_COUNT_FLUSH_THRESHOLD
+                or time.monotonic() - self.last_flush
+                >= settings.VIEW_COUNT_FLUSH_INTERVAL
+            )
+        if due:
+            self.flush_quietly()
+
+    def pending(self, post_id):
+        """
+        Просмотры поста, ещё не записанные в БД этим процессом,
+        включая те, что пишутся прямо сейчас.
+        """
+        with self.lock:
+            return (
+                self.counts.get(post_id, 0) + self.in_flight.get(post_id, 0)
+            )
+
+    def flush(self):
+        """Пишет накопленные просмотры в БД, возвращает их число."""
+        with self.lock:
+            counts, self.counts = self.counts, Counter()
+            self.in_flight.update(counts)
+            self.pending_total = 0
+            self.last_flush = time.monotonic()
+        if not counts:
+            return 0
+        try:
+            run_write(write_view_counts, counts)
+        except BaseException:
+            with self.lock:
+                self.in_flight -= counts
+                self.counts.update(counts)
+                self.pending_total += sum(counts.values())
+            raise
+        with self.lock:
+            self.in_flight -= counts
+        bump_views_version()
+        return sum(counts.values())
+
+    def flush_quietly(self):
+        """flush для пути запроса: ошибка БД не должна ронять страницу."""
+        try:
+            return self.flush()
+        except DatabaseError:
+            logger.exception('Не удалось записать просмотры постов')
+            return 0
+
+
+view_counter = ViewCounter()
+atexit.register(view_counter.flush_quietly)
@@ -0,0 +1,127 @@
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+from django.contrib.syndication.views import Feed
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils.feedgenerator import Atom1Feed
+from django.views.decorators.http import condition
+
+from .cache import get_posts_version
+from .lookups import get_group_or_404, get_user_or_404
+from .models import Post
+
+
+class LatestPostsFeed(Feed):
+    title = 'Yatube: последние записи'
+    description = 'Последние обновления на сайте'
+
+    def link(self):
+        return reverse('posts:index')
+
+    def items(self):
+        return Post.objects.with_related()[:settings.FEED_SIZE]
+
+    def item_title(self, item):
+        return item.text[:50]
+
+    def item_description(self, item):
+        return item.text_html or item.text
+
+    def item_link(self, item):
+        return reverse('posts:post_detail', args=(item.id,))
+
+    def item_author_name(self, item):
+        return item.author.get_full_name() or item.author.username
+
+    def item_pubdate(self, item):
+        return item.pub_date
+
+
+class GroupPostsFeed(LatestPostsFeed):
+    def get_object(self, request, slug):
+        return get_group_or_404(slug)
+
+    def title(self, group):
+        return f'Yatube: {group.title}'
+
+    def description(self, group):
+        return group.description
+
+    def link(self, group):
+        return reverse('posts:group_list', args=(group.slug,))
+
+    def items(self, group):
+        return group.posts.with_related()[:settings.FEED_SIZE]
+
+
+class AuthorPostsFeed(LatestPostsFeed):
+    def get_object(self, request, username):
+        return get_user_or_404(username)
+
+    def title(self, author):
+        return f'Yatube: записи пользователя {author.username}'
+
+    def description(self, author):
+        return f'Все записи пользователя {author.username}'
+
+    def link(self, author):
+        return reverse('posts:profile', args=(author.username,))
+
+    def items(self, author):
+        return author.posts.with_related()[:settings.FEED_SIZE]
+
+
+class LatestPostsAtomFeed(LatestPostsFeed):
+    feed_type = Atom1Feed
+    subtitle = LatestPostsFeed.description
+
+
+class GroupPostsAtomFeed(GroupPostsFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self, group):
+        return group.description
+
+
+class AuthorPostsAtomFeed(AuthorPostsFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self, author):
+        return f'Все записи пользователя {author.username}'
+
+
+def feed_cache_key(request):
+    return f'posts:feed:{get_posts_version()}:{request.get_full_path()}'
+
+
+def feed_etag(request, *args, **kwargs):
+    return hashlib.md5(feed_cache_key(request).encode()).hexdigest()
+
+
+def cached_feed(feed):
+    """
+    Отдаёт ленту из кэша, пока не изменились посты.
+    ETag считается по версии постов, поэтому на повторный запрос
+    читалка получает 304 без обращения к БД и рендеринга.
+    """
+    @condition(etag_func=feed_etag)
+    @wraps(feed)
+    def view(request, *args, **kwargs):
+        key = feed_cache_key(request)
+        response = cache.get(key)
+        if response is None:
+            response = feed(request, *args, **kwargs)
+            if response.status_code == 200:
+                cache.set(key, response, settings.FEED_CACHE_TIMEOUT)
+        return response
+    return view
+
+
+latest_rss = cached_feed(LatestPostsFeed())
+latest_atom = cached_feed(LatestPostsAtomFeed())
+group_rss = cached_feed(GroupPostsFeed())
+group_atom = cached_feed(GroupPostsAtomFeed())
+author_rss = cached_feed(AuthorPostsFeed())
+author_atom = cached_feed(AuthorPostsAtomFeed())
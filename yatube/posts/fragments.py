@@ -0,0 +1,74 @@
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from django.template.loader import render_to_string
+from django.views.decorators.http import require_safe
+
+from core.cache import get_or_compute
+from .archival import ChainedPosts
+from .cache import get_posts_version, get_version
+from .lookups import get_group_or_404, get_user_or_404, users
+from .models import Post
+from .pagination import decode_cursor, paginate_by_cursor
+from .views import DISPLAYED_POSTS
+
+
+def render_fragment(request, scope, queryset):
+    """
+    Только элементы ленты после курсора ?cursor= без base.html.
+    Курсор следующей порции отдаётся в заголовке X-Next-Cursor и в ссылке
+    "Показать ещё" в конце фрагмента. Фрагмент кэшируется по курсору
+    до смены версии постов или авторов.
+    """
+    cursor = request.GET.get('cursor', '')
+    if cursor and decode_cursor(cursor) is None:
+        raise Http404
+    version = f'{get_posts_version()}:{get_version(users.version_key)}'
+
+    def compute():
+        posts, next_cursor = paginate_by_cursor(
+            queryset, cursor, DISPLAYED_POSTS
+        )
+        next_url = None
+        if next_cursor:
+            next_url = f'{request.path}?{urlencode({"cursor": next_cursor})}'
+        html = render_to_string('posts/includes/post_items.html', {
+            'posts': posts,
+            'next_url': next_url,
+            'next_cursor': next_cursor,
+        })
+        return html, next_cursor
+
+    fragment = get_or_compute(
+        f'posts:fragment:{scope}:{cursor}',
+        compute,
+        settings.FRAGMENT_CACHE_TIMEOUT,
+        version=version,
+    )
+    html, next_cursor = fragment
+    response = HttpResponse(html)
+    if next_cursor:
+        response['X-Next-Cursor'] = next_cursor
+    return response
+
+
+@require_safe
+def index_more(request):
+    return render_fragment(request, 'index', Post.objects.with_related())
+
+
+@require_safe
+def group_posts_more(request, slug):
+    group = get_group_or_404(slug)
+    return render_fragment(
+        request, f'group:{group.id}', group.posts.with_related()
+    )
+
+
+@require_safe
+def profile_more(request, username):
+    author = get_user_or_404(username)
+    return render_fragment(request, f'author:{author.id}', ChainedPosts(
+        author.posts.with_related(), author.archived_posts.with_related()
+    ))
@@ -0,0 +1,91 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.http import Http404
+
+from .cache import bump_version, get_version
+from .models import Group, User
+
+
+class LRUCache:
+    """Ограниченный по размеру словарь, вытесняющий давно не читанное."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.data = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            if key not in self.data:
+                return None
+            self.data.move_to_end(key)
+            return self.data[key]
+
+    def set(self, key, value):
+        with self.lock:
+            self.data[key] = value
+            self.data.move_to_end(key)
+            while len(self.data) > self.maxsize:
+                self.data.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.data.clear()
+
+
+class Lookup:
+    """
+    Поиск объекта по уникальному полю с LRU-кэшем в памяти процесса.
+    Кэшируются только поля fields, объект собирается через from_db,
+    остальные поля догружаются при обращении. Запись хранит версию
+    из кэша Django, её смена при изменении моделей (posts.signals)
+    делает записи неактуальными - во всех процессах, только если
+    кэш общий. Кроме того, запись живёт не дольше LOOKUP_CACHE_MAX_AGE
+    секунд, так что с кэшем в памяти процесса другие процессы увидят
+    переименование не позже этого срока.
+    """
+
+    def __init__(self, model, field, fields):
+        self.model = model
+        self.field = field
+        self.fields = fields
+        self.lru = LRUCache(settings.LOOKUP_CACHE_SIZE)
+
+    @property
+    def version_key(self):
+        return f'lookups:{self.model._meta.label_lower}:version'
+
+    def get_or_404(self, value):
+        version = get_version(self.version_key)
+        entry = self.lru.get(value)
+        if (
+            entry is None
+            or entry[0] != version
+            or time.monotonic() - entry[1] >= settings.LOOKUP_CACHE_MAX_AGE
+        ):
+            values = self.model.objects.filter(
+                **{self.field: value}
+            ).values_list(*self.fields).first()
+            if values is None:
+                raise Http404
+            entry = (version, time.monotonic(), values)
+            self.lru.set(value, entry)
+        return self.model.from_db('default', self.fields, entry[2])
+
+    def invalidate(self):
+        bump_version(self.version_key)
+
+
+users = Lookup(User, 'username', ('id', 'username', 'first_name', 'last_name'))
+groups = Lookup(Group, 'slug', ('id', 'title', 'slug', 'description'))
+
+
+def get_user_or_404(username):
+    return users.get_or_404(username)
+
+
+def get_group_or_404(slug):
+    return groups.get_or_404(slug)
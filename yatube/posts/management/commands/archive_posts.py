@@ -0,0 +1,43 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from ...archival import archive_old_posts
+from ...models import Post
+
+
+class Command(BaseCommand):
+    help = (
+        'Переносит посты старше --days дней из posts_post в архивную '
+        'таблицу пачками. Страницы поста и профиля читают их из архива.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=settings.POST_ARCHIVE_AFTER_DAYS,
+            help='Возраст поста в днях, после которого он уходит в архив.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.POST_ARCHIVE_BATCH_SIZE,
+            help='Сколько постов переносить за одну транзакцию.',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Только посчитать посты, которые будут перенесены.',
+        )
+
+    def handle(self, *args, **options):
+        before = timezone.now() - timedelta(days=options['days'])
+        if options['dry_run']:
+            count = Post.objects.filter(pub_date__lt=before).count()
+            self.stdout.write(f'К переносу в архив: {count}')
+            return
+        moved = archive_old_posts(before, options['batch_size'])
+        self.stdout.write(f'Перенесено в архив: {moved}')
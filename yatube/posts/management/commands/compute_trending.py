@@ -0,0 +1,19 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from ...trending import compute_trending
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает популярные посты и активные группы для всех окон. '
+        'Предназначена для запуска по расписанию (cron).'
+    )
+
+    def handle(self, *args, **options):
+        for window in settings.TRENDING_WINDOWS:
+            data = compute_trending(window)
+            self.stdout.write(
+                f'{window}: групп {len(data["group_counts"])}, '
+                f'кандидатов {len(data["posts"])}'
+            )
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from ...rollups import rebuild_month_counts
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает таблицу числа постов по месяцам с нуля '
+        '(после импорта данных или правок в обход сигналов).'
+    )
+
+    def handle(self, *args, **options):
+        rows = rebuild_month_counts()
+        self.stdout.write(f'Записано счётчиков: {rows}')
@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+
+from ...markup import render_post_text
+from ...models import Post
+
+
+class Command(BaseCommand):
+    help = (
+        'Заполняет text_html у постов, сохранённых в обход Post.save() '
+        '(миграции, bulk_create), пачками по id.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Сколько постов обновлять за один запрос.',
+        )
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Перерисовать все посты, а не только пустые.',
+        )
+
+    def handle(self, *args, **options):
+        queryset = Post.objects.order_by('id').only('id', 'text')
+        if not options['all']:
+            queryset = queryset.filter(text_html='')
+        rendered = 0
+        last_id = 0
+        while True:
+            batch = list(
+                queryset.filter(id__gt=last_id)[:options['batch_size']]
+            )
+            if not batch:
+                break
+            for post in batch:
+                post.text_html = render_post_text(post.text)
+            Post.objects.bulk_update(batch, ['text_html'])
+            rendered += len(batch)
+            last_id = batch[-1].id
+        self.stdout.write(f'Обработано постов: {rendered}')
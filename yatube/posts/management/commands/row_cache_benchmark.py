@@ -0,0 +1,75 @@
+import pickle
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ...models import Group, Post, User
+from ...rows import PostRow, to_row
+from ...views import DISPLAYED_POSTS
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает страницу ленты в кэше как pickle моделей Post '
+        'и как кортежи строк (posts/rows.py): байты на страницу '
+        'и время разбора.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=1000,
+            help='Сколько раз разбирать каждую запись.',
+        )
+
+    def handle(self, *args, **options):
+        pages = build_pages()
+        if not pages:
+            raise CommandError('В базе нет постов для замера.')
+        self.stdout.write(
+            f'{"page":<12}{"format":<8}{"bytes":>10}{"us/load":>10}'
+        )
+        for page, posts in pages.items():
+            formats = {
+                'models': (pickle.dumps(posts), None),
+                'rows': (
+                    pickle.dumps([to_row(post) for post in posts]), PostRow,
+                ),
+            }
+            for name, (data, row_class) in formats.items():
+                elapsed = measure_load(data, row_class, options['iterations'])
+                self.stdout.write(
+                    f'{page:<12}{name:<8}{len(data):>10}{elapsed:>10.1f}'
+                )
+
+
+def build_pages():
+    """Первые страницы index, group_list и profile моделями Post."""
+    post = Post.objects.first()
+    if post is None:
+        return {}
+    pages = {'index': Post.objects.with_related()}
+    group = Group.objects.filter(posts__isnull=False).first()
+    if group is not None:
+        pages['group_list'] = group.posts.with_related()
+    pages['profile'] = User.objects.get(
+        pk=post.author_id
+    ).posts.with_related()
+    return {
+        name: list(queryset[:DISPLAYED_POSTS])
+        for name, queryset in pages.items()
+    }
+
+
+def measure_load(data, row_class, iterations):
+    """
+    Среднее время разбора записи в микросекундах. Для строк в замер
+    входит и сборка PostRow, которую делает CachedFeed.
+    """
+    started = time.perf_counter()
+    for _ in range(iterations):
+        loaded = pickle.loads(data)
+        if row_class is not None:
+            loaded = [row_class(*row) for row in loaded]
+    return (time.perf_counter() - started) * 1e6 / iterations
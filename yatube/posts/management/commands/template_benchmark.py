@@ -0,0 +1,92 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand, CommandError
+from django.template.loader import render_to_string
+from django.test import RequestFactory
+from django.urls import resolve, reverse
+
+from ...models import Group, Post, User
+from ...views import get_page
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает время рендеринга index, group_list и profile '
+        'шаблонами Django и Jinja2 на данных из БД.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=200,
+            help='Сколько раз рендерить каждую страницу.',
+        )
+
+    def handle(self, *args, **options):
+        engines = ['django']
+        if settings.JINJA2_AVAILABLE:
+            engines.append('jinja2')
+        else:
+            self.stderr.write('jinja2 не установлен, меряем только Django.')
+        pages = build_pages()
+        if not pages:
+            raise CommandError('В базе нет постов для замера.')
+        self.stdout.write(f'{"page":<14}{"engine":<10}{"ms/render":>10}')
+        for page, (template, request, context) in pages.items():
+            for engine in engines:
+                elapsed = measure_render(
+                    template, request, context, engine,
+                    options['iterations'],
+                )
+                self.stdout.write(f'{page:<14}{engine:<10}{elapsed:>10.3f}')
+
+
+def build_pages():
+    """
+    Контексты страниц, собранные теми же запросами, что и во views.
+    Страницы вычисляются заранее, чтобы в замер попал только рендеринг.
+    """
+    post = Post.objects.with_related().first()
+    if post is None:
+        return {}
+    factory = RequestFactory()
+    pages = {}
+
+    def add(name, template, url, context):
+        request = factory.get(url)
+        request.user = AnonymousUser()
+        request.resolver_match = resolve(url)
+        page_obj = context['page_obj']
+        page_obj.object_list = list(page_obj.object_list)
+        pages[name] = (template, request, context)
+
+    url = reverse('posts:index')
+    add('index', 'posts/index.html', url, {
+        'page_obj': get_page(factory.get(url), Post.objects.with_related()),
+    })
+    group = Group.objects.filter(posts__isnull=False).first()
+    if group is not None:
+        url = reverse('posts:group_list', args=(group.slug,))
+        add('group_list', 'posts/group_list.html', url, {
+            'group': group,
+            'page_obj': get_page(factory.get(url), group.posts.with_related()),
+        })
+    author = User.objects.get(pk=post.author_id)
+    url = reverse('posts:profile', args=(author.username,))
+    add('profile', 'posts/profile.html', url, {
+        'author': author,
+        'page_obj': get_page(factory.get(url), author.posts.with_related()),
+    })
+    return pages
+
+
+def measure_render(template, request, context, engine, iterations):
+    """Среднее время рендеринга в миллисекундах (после прогрева)."""
+    render_to_string(template, dict(context), request, using=engine)
+    started = time.perf_counter()
+    for _ in range(iterations):
+        render_to_string(template, dict(context), request, using=engine)
+    return (time.perf_counter() - started) * 1000 / iterations
@@ -0,0 +1,97 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+
+from ...warmup import pick_urls, warm
+
+
+class Command(BaseCommand):
+    help = (
+        'Прогревает кэши после деплоя: первые страницы index, '
+        'самые активные группы и авторы запрашиваются через тот же стек '
+        'middleware, что и обычный трафик.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--index-pages',
+            type=int,
+            default=settings.WARM_CACHE_INDEX_PAGES,
+            help='Сколько первых страниц index прогреть.',
+        )
+        parser.add_argument(
+            '--groups',
+            type=int,
+            default=settings.WARM_CACHE_GROUPS,
+            help='Сколько самых активных групп прогреть.',
+        )
+        parser.add_argument(
+            '--authors',
+            type=int,
+            default=settings.WARM_CACHE_AUTHORS,
+            help='Сколько самых активных авторов прогреть.',
+        )
+        parser.add_argument(
+            '--months',
+            type=int,
+            default=settings.WARM_CACHE_MONTHS,
+            help='За сколько последних месяцев считать активность.',
+        )
+        parser.add_argument(
+            '--host',
+            help=(
+                'Host запросов: входит в ключи полностраничного кэша. '
+                'По умолчанию WARM_CACHE_HOST.'
+            ),
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=settings.WARM_CACHE_CONCURRENCY,
+            help='Сколько страниц рендерить одновременно.',
+        )
+        parser.add_argument(
+            '--pause',
+            type=float,
+            default=0,
+            help='Пауза потока после запроса, с: ограничивает нагрузку на БД.',
+        )
+
+    def handle(self, *args, **options):
+        if options['concurrency'] < 1:
+            raise CommandError('--concurrency должен быть не меньше 1.')
+        host = options['host'] or settings.WARM_CACHE_HOST
+        if not host:
+            raise CommandError(
+                'Не задан host: передайте --host или YATUBE_WARM_CACHE_HOST.'
+            )
+        if not (
+            settings.PAGE_CACHE_TIMEOUT or settings.FEED_ROW_CACHE_TIMEOUT
+        ):
+            self.stderr.write(
+                'PAGE_CACHE_TIMEOUT и FEED_ROW_CACHE_TIMEOUT выключены: '
+                'прогревать нечего.'
+            )
+        if caches['default'].__class__.__name__ == 'LocMemCache':
+            self.stderr.write(
+                'Кэш в памяти процесса: серверу прогрев командой не виден, '
+                'используйте YATUBE_WSGI_WARM_CACHE=1 с gunicorn --preload.'
+            )
+        urls = pick_urls(
+            options['index_pages'],
+            options['groups'],
+            options['authors'],
+            options['months'],
+        )
+        results = warm(
+            urls, host, options['concurrency'], options['pause'],
+        )
+        failed = 0
+        for url, outcome, elapsed in results:
+            if outcome != 200:
+                failed += 1
+            if options['verbosity'] > 1 or outcome != 200:
+                self.stdout.write(f'{outcome!s:<6}{elapsed:>8.1f} мс  {url}')
+        self.stdout.write(
+            f'Прогрето страниц: {len(results) - failed}, ошибок: {failed}'
+        )
@@ -0,0 +1,30 @@
+import re
+
+from django.utils.html import linebreaks, urlize
+
+
+BOLD_RE = re.compile(r'\*\*(\S(?:.*?\S)?)\*\*')
+ITALIC_RE = re.compile(r'(?<![\w*])\*(\S(?:.*?\S)?)\*(?![\w*])')
+LINK_RE = re.compile(r'<a [^>]*>.*?</a>', re.S)
+PLACEHOLDER_RE = re.compile(r'\x00(\d+)\x00')
+
+
+def render_post_text(text):
+    """
+    Превращает текст поста в HTML: экранирование, ссылки,
+    **жирный**, *курсив*, абзацы и переносы строк. На время разметки
+    ссылки заменяются метками, чтобы звёздочки в адресах не превращались
+    в теги внутри href.
+    """
+    html = urlize(text.replace('\x00', ''), nofollow=True, autoescape=True)
+    links = []
+
+    def hide_link(match):
+        links.append(match.group())
+        return f'\x00{len(links) - 1}\x00'
+
+    html = LINK_RE.sub(hide_link, html)
+    html = BOLD_RE.sub(r'<strong>\1</strong>', html)
+    html = ITALIC_RE.sub(r'<em>\1</em>', html)
+    html = PLACEHOLDER_RE.sub(lambda match: links[int(match.group(1))], html)
+    return linebreaks(html)
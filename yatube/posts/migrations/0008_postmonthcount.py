@@ -0,0 +1,30 @@
+# Generated by Django 2.2.16 on 2026-10-19 07:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0007_post_text_html'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostMonthCount',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(choices=[('global', 'Весь сайт'), ('author', 'Автор'), ('group', 'Группа')], max_length=10, verbose_name='Область')),
+                ('scope_id', models.PositiveIntegerField(default=0, verbose_name='id автора или группы')),
+                ('month', models.DateField(verbose_name='Месяц')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='Число постов')),
+            ],
+            options={
+                'ordering': ['-month'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='postmonthcount',
+            constraint=models.UniqueConstraint(fields=('scope', 'scope_id', 'month'), name='unique_post_month_count'),
+        ),
+    ]
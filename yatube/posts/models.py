@@ -1,6 +1,8 @@
 from django.db import models
 from django.contrib.auth import get_user_model
 
+from .markup import render_post_text
+
 
 User = get_user_model()
 
@@ -19,11 +21,21 @@ class Group(models.Model):
         return self.title
 
 
+class PostQuerySet(models.QuerySet):
+    def with_related(self):
+        return self.select_related('author', 'group')
+
+
 class Post(models.Model):
     text = models.TextField(
         verbose_name='Текст поста',
         help_text='Введите текст поста',
     )
+    text_html = models.TextField(
+        blank=True,
+        editable=False,
+        verbose_name='Текст поста в HTML',
+    )
     pub_date = models.DateTimeField(
         auto_now_add=True,
         verbose_name='Дата публикации',
@@ -43,9 +55,114 @@ class Post(models.Model):
         verbose_name='Название группы',
         help_text='Выберите группу',
     )
+    views = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Просмотры',
+    )
+
+    objects = PostQuerySet.as_manager()
+
+    def __str__(self):
+        return self.text[:15]
+
+    def save(self, *args, **kwargs):
+        self.text_html = render_post_text(self.text)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'text' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'text_html'}
+        super().save(*args, **kwargs)
+
+    class Meta:
+        ordering = ['-pub_date', '-id']
+        indexes = [
+            models.Index(fields=['-pub_date', '-id'], name='post_feed_idx'),
+        ]
+
+
+class ArchivedPost(models.Model):
+    """
+    Холодная копия старого поста. id совпадает с id исходного поста,
+    поэтому старые ссылки на post_detail продолжают работать.
+    """
+    id = models.IntegerField(primary_key=True, verbose_name='ID')
+    text = models.TextField(verbose_name='Текст поста')
+    text_html = models.TextField(
+        blank=True,
+        verbose_name='Текст поста в HTML',
+    )
+    pub_date = models.DateTimeField(verbose_name='Дата публикации')
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='archived_posts',
+        verbose_name='Автор',
+    )
+    group = models.ForeignKey(
+        Group,
+        blank=True,
+        null=True,
+        on_delete=models.SET_NULL,
+        related_name='archived_posts',
+        verbose_name='Название группы',
+    )
+    views = models.PositiveIntegerField(default=0, verbose_name='Просмотры')
+    archived_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Дата переноса в архив',
+    )
+
+    objects = PostQuerySet.as_manager()
 
     def __str__(self):
         return self.text[:15]
 
     class Meta:
         ordering = ['-pub_date', '-id']
+        indexes = [
+            models.Index(
+                fields=['author', '-pub_date', '-id'],
+                name='archived_post_author_idx',
+            ),
+        ]
+        verbose_name = 'Пост в архиве'
+        verbose_name_plural = 'Посты в архиве'
+
+
+class PostMonthCount(models.Model):
+    """Сколько постов вышло за месяц на сайте, у автора или в группе."""
+    GLOBAL = 'global'
+    AUTHOR = 'author'
+    GROUP = 'group'
+    SCOPES = (
+        (GLOBAL, 'Весь сайт'),
+        (AUTHOR, 'Автор'),
+        (GROUP, 'Группа'),
+    )
+
+    scope = models.CharField(
+        max_length=10,
+        choices=SCOPES,
+        verbose_name='Область',
+    )
+    scope_id = models.PositiveIntegerField(
+        default=0,
+        verbose_name='id автора или группы',
+    )
+    month = models.DateField(verbose_name='Месяц')
+    count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Число постов',
+    )
+
+    def __str__(self):
+        return f'{self.scope}:{self.scope_id} {self.month:%Y-%m} {self.count}'
+
+    class Meta:
+        ordering = ['-month']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['scope', 'scope_id', 'month'],
+                name='unique_post_month_count',
+            ),
+        ]
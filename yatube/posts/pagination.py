@@ -0,0 +1,48 @@
+import base64
+import binascii
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+
+def encode_cursor(pub_date, post_id):
+    raw = f'{pub_date.isoformat()}|{post_id}'
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """Возвращает (pub_date, id) или None для битого курсора."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        pub_date, post_id = raw.split('|')
+        pub_date = parse_datetime(pub_date)
+        post_id = int(post_id)
+    except (binascii.Error, UnicodeError, ValueError):
+        return None
+    if pub_date is None:
+        return None
+    return pub_date, post_id
+
+
+def paginate_by_cursor(queryset, cursor, limit):
+    """
+    Страница ленты по курсору (pub_date, id) в порядке от новых к старым.
+    В отличие от Paginator не считает COUNT и не делает OFFSET,
+    поэтому стоимость не зависит от глубины страницы.
+    Возвращает (список записей, курсор следующей страницы или None).
+    Записи могут быть как моделями, так и словарями из values().
+    """
+    position = decode_cursor(cursor) if cursor else None
+    if position is not None:
+        pub_date, post_id = position
+        queryset = queryset.filter(
+            Q(pub_date__lt=pub_date) | Q(pub_date=pub_date, id__lt=post_id)
+        )
+    rows = list(queryset.order_by('-pub_date', '-id')[:limit + 1])
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    if isinstance(last, dict):
+        return rows, encode_cursor(last['pub_date'], last['id'])
+    return rows, encode_cursor(last.pub_date, last.id)
@@ -0,0 +1,107 @@
+from collections import Counter
+from datetime import date, datetime, time
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from .models import ArchivedPost, Post, PostMonthCount
+
+
+def month_of(moment):
+    return timezone.localtime(moment).date().replace(day=1)
+
+
+def month_range(year, month):
+    """
+    Границы месяца [start, end) в текущей временной зоне.
+    ValueError, если месяц вне 1..12 или границы выходят за 1..9999 год.
+    """
+    start = date(year, month, 1)
+    end = date(year + month // 12, month % 12 + 1, 1)
+    return tuple(
+        timezone.make_aware(datetime.combine(day, time.min))
+        for day in (start, end)
+    )
+
+
+def post_scopes(author_id, group_id):
+    scopes = [(PostMonthCount.GLOBAL, 0), (PostMonthCount.AUTHOR, author_id)]
+    if group_id is not None:
+        scopes.append((PostMonthCount.GROUP, group_id))
+    return scopes
+
+
+def change_month_count(scope, scope_id, month, delta):
+    counts = PostMonthCount.objects.filter(
+        scope=scope, scope_id=scope_id, month=month
+    )
+    if counts.update(count=F('count') + delta) or delta < 0:
+        return
+    try:
+        with transaction.atomic():
+            PostMonthCount.objects.create(
+                scope=scope, scope_id=scope_id, month=month, count=delta
+            )
+    except IntegrityError:
+        counts.update(count=F('count') + delta)
+
+
+def count_post(post, delta):
+    """Прибавляет delta к счётчикам месяца поста во всех его областях."""
+    month = month_of(post.pub_date)
+    for scope, scope_id in post_scopes(post.author_id, post.group_id):
+        change_month_count(scope, scope_id, month, delta)
+
+
+def move_post_group(post, old_group_id):
+    month = month_of(post.pub_date)
+    if old_group_id is not None:
+        change_month_count(PostMonthCount.GROUP, old_group_id, month, -1)
+    if post.group_id is not None:
+        change_month_count(PostMonthCount.GROUP, post.group_id, month, 1)
+
+
+def archive_months(scope, scope_id=0):
+    """
+    Месяцы с постами и их число, от новых к старым. Перенесённые
+    в ArchivedPost посты остаются в счётчиках своих месяцев.
+    """
+    return PostMonthCount.objects.filter(
+        scope=scope, scope_id=scope_id, count__gt=0
+    ).values_list('month', 'count')
+
+
+def rebuild_month_counts():
+    """Полностью пересчитывает таблицу счётчиков по постам и архиву."""
+    groupings = (
+        (PostMonthCount.GLOBAL, None),
+        (PostMonthCount.AUTHOR, 'author_id'),
+        (PostMonthCount.GROUP, 'group_id'),
+    )
+    counts = Counter()
+    for model in (Post, ArchivedPost):
+        for scope, field in groupings:
+            queryset = model.objects.order_by().annotate(
+                month=TruncMonth('pub_date')
+            )
+            if field == 'group_id':
+                queryset = queryset.filter(group__isnull=False)
+            fields = ['month'] + ([field] if field else [])
+            for row in queryset.values(*fields).annotate(count=Count('id')):
+                month = row['month']
+                if isinstance(month, datetime):
+                    month = timezone.localtime(month).date()
+                scope_id = row[field] if field else 0
+                counts[scope, scope_id, month] += row['count']
+    rows = [
+        PostMonthCount(
+            scope=scope, scope_id=scope_id, month=month, count=count
+        )
+        for (scope, scope_id, month), count in counts.items()
+    ]
+    with transaction.atomic():
+        PostMonthCount.objects.all().delete()
+        PostMonthCount.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
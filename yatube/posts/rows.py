@@ -0,0 +1,121 @@
+from django.conf import settings
+
+from core.cache import get_or_compute
+from .cache import get_posts_version, get_version, get_views_version
+from .lookups import groups, users
+
+
+class AuthorRow:
+    """Автор в строке ленты: только то, что выводят шаблоны."""
+    __slots__ = ('username', 'full_name')
+
+    def __init__(self, username, full_name):
+        self.username = username
+        self.full_name = full_name
+
+    def get_full_name(self):
+        return self.full_name
+
+    def __str__(self):
+        return self.username
+
+
+class GroupRow:
+    __slots__ = ('slug',)
+
+    def __init__(self, slug):
+        self.slug = slug
+
+
+class PostRow:
+    """
+    Пост ленты, собранный из кортежа кэша. Повторяет атрибуты Post,
+    которые читают шаблоны index, group_list и profile, поэтому
+    шаблоны рендерят строки и модели одинаково.
+    """
+    __slots__ = (
+        'id', 'text', 'text_html', 'pub_date', 'views', 'author', 'group',
+    )
+
+    def __init__(self, id, text, text_html, pub_date, views, username,
+                 full_name, group_slug):
+        self.id = id
+        self.text = text
+        self.text_html = text_html
+        self.pub_date = pub_date
+        self.views = views
+        self.author = AuthorRow(username, full_name)
+        self.group = GroupRow(group_slug) if group_slug else None
+
+    @property
+    def pk(self):
+        return self.id
+
+
+def to_row(post):
+    """Post -> кортеж из встроенных типов, который кладётся в кэш."""
+    return (
+        post.id,
+        post.text,
+        post.text_html,
+        post.pub_date,
+        post.views,
+        post.author.username,
+        post.author.get_full_name(),
+        post.group.slug if post.group_id else None,
+    )
+
+
+class CachedFeed:
+    """
+    Лента для Paginator, страницы которой хранятся в кэше кортежами
+    to_row вместо pickle моделей: без _state, связанных User и Group
+    и служебных полей запись в несколько раз меньше и быстрее
+    разбирается. Записи хранят версии постов, авторов и групп
+    (и просмотров для views=True),
+    поэтому правки любой из моделей делают страницы устаревшими;
+    пересчитывает их один запрос (core.cache.get_or_compute).
+    """
+
+    def __init__(self, scope, source, views=False):
+        self.source = source
+        self.prefix = f'posts:rows:{scope}'
+        self.version = (
+            f'{get_posts_version()}:{get_version(users.version_key)}:'
+            f'{get_version(groups.version_key)}'
+        )
+        if views:
+            self.version = f'{self.version}:{get_views_version()}'
+
+    def cached(self, key, compute):
+        return get_or_compute(
+            f'{self.prefix}:{key}',
+            compute,
+            settings.FEED_ROW_CACHE_TIMEOUT,
+            version=self.version,
+        )
+
+    def count(self):
+        return self.cached('count', self.source.count)
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index:index + 1][0]
+        rows = self.cached(
+            f'{index.start or 0}:{index.stop}',
+            lambda: [to_row(post) for post in self.source[index]],
+        )
+        return [PostRow(*row) for row in rows]
+
+
+def cached_feed(scope, source, views=False):
+    """
+    source в CachedFeed, если кэш строк ленты включён. views=True -
+    лента показывает просмотры и устаревает при их сбросе.
+    """
+    if not settings.FEED_ROW_CACHE_TIMEOUT:
+        return source
+    return CachedFeed(scope, source, views)
@@ -0,0 +1,141 @@
+from copy import copy
+
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from core.db import after_commit
+
+from . import lookups
+from .archival import is_archiving
+from .cache import bump_posts_version
+from .models import ArchivedPost, Group, Post, PostMonthCount, User
+from .rollups import count_post, move_post_group
+from .sitemaps import SECTIONS
+from .trending import add_to_trending, remove_from_trending
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def invalidate_posts_cache(using, **kwargs):
+    after_commit(bump_posts_version, using=using)
+
+
+def sitemap_delta(signal, created=False):
+    """Изменение числа записей раздела карты сайта от сигнала."""
+    if signal is post_delete:
+        return -1
+    return 1 if created else 0
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=ArchivedPost)
+@receiver(post_delete, sender=ArchivedPost)
+def invalidate_post_sitemap(instance, using, signal, created=False,
+                            **kwargs):
+    # Перенос в архив не меняет ни адрес, ни ключ поста в карте сайта.
+    if is_archiving():
+        return
+    after_commit(
+        SECTIONS['posts'].invalidate, (instance.pub_date, instance.id),
+        sitemap_delta(signal, created), using=using,
+    )
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def invalidate_group_sitemap(instance, using, signal, created=False,
+                             **kwargs):
+    after_commit(
+        SECTIONS['groups'].invalidate, (instance.id,),
+        sitemap_delta(signal, created), using=using,
+    )
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_profile_sitemap(instance, using, signal, created=False,
+                               update_fields=None, **kwargs):
+    if update_fields and set(update_fields) == {'last_login'}:
+        return
+    after_commit(
+        SECTIONS['profiles'].invalidate, (instance.id,),
+        sitemap_delta(signal, created), using=using,
+    )
+
+
+@receiver(post_save, sender=Post)
+def update_trending(instance, created, using, **kwargs):
+    if created:
+        after_commit(add_to_trending, instance, using=using)
+
+
+@receiver(post_delete, sender=Post)
+def discount_trending(instance, using, **kwargs):
+    # После удаления Django обнуляет pk у instance, а колбэк
+    # выполнится позже: передаём копию.
+    after_commit(remove_from_trending, copy(instance), using=using)
+
+
+@receiver(pre_save, sender=Post)
+def remember_post_group(instance, update_fields=None, **kwargs):
+    if instance.pk is None:
+        return
+    if update_fields is not None and not {'group', 'group_id'} & set(
+        update_fields
+    ):
+        # Группа не сохраняется: перечитывать её не нужно.
+        instance._previous_group_id = instance.group_id
+        return
+    instance._previous_group_id = Post.objects.filter(
+        pk=instance.pk
+    ).values_list('group_id', flat=True).first()
+
+
+@receiver(post_save, sender=Post)
+def update_month_counts(instance, created, **kwargs):
+    if created:
+        count_post(instance, 1)
+        return
+    previous_group_id = getattr(instance, '_previous_group_id', None)
+    if previous_group_id != instance.group_id:
+        move_post_group(instance, previous_group_id)
+
+
+@receiver(post_delete, sender=Post)
+def discount_deleted_post(instance, **kwargs):
+    if is_archiving():
+        return
+    count_post(instance, -1)
+
+
+@receiver(post_delete, sender=ArchivedPost)
+def discount_deleted_archived_post(instance, **kwargs):
+    count_post(instance, -1)
+
+
+@receiver(post_delete, sender=Group)
+def delete_group_month_counts(instance, **kwargs):
+    PostMonthCount.objects.filter(
+        scope=PostMonthCount.GROUP, scope_id=instance.id
+    ).delete()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_lookups(using, created=False, update_fields=None,
+                            **kwargs):
+    # Промахи не кэшируются, так что новый объект ничего не сбрасывает.
+    if created or update_fields and set(update_fields) == {'last_login'}:
+        return
+    after_commit(lookups.users.invalidate, using=using)
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def invalidate_group_lookups(using, created=False, **kwargs):
+    if created:
+        return
+    after_commit(lookups.groups.invalidate, using=using)
@@ -0,0 +1,274 @@
+import bisect
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+from django.http import Http404, HttpResponse
+from django.template.loader import render_to_string
+from django.urls import reverse
+from django.views.decorators.http import require_safe
+
+from .models import ArchivedPost, Group, Post, User
+
+
+class SitemapSection:
+    """
+    Раздел карты сайта, нарезанный на куски по SITEMAP_CHUNK_SIZE адресов.
+    Границы кусков - ключи сортировки первых записей каждого куска.
+    Они вычисляются одним потоковым проходом и хранятся в кэше вместе
+    с числом записей последнего куска, поэтому кусок выбирается
+    диапазонным запросом по индексу без OFFSET. Новые записи попадают
+    в последний кусок; когда он переполняется, граница следующего куска
+    ищется одним запросом по последнему куску, остальные куски
+    не пересчитываются. Изменение записи сбрасывает кэш только её куска.
+    Раздел может собираться из нескольких таблиц (UNION ALL).
+    """
+    name = None
+    key_fields = ('id',)
+    fields = ('id',)
+
+    def get_querysets(self):
+        raise NotImplementedError
+
+    def location(self, row):
+        raise NotImplementedError
+
+    def lastmod(self, row):
+        return None
+
+    def combine(self, querysets):
+        """Один запрос по всем таблицам раздела в порядке ключа."""
+        querysets = [queryset.order_by() for queryset in querysets]
+        combined = querysets[0]
+        if len(querysets) > 1:
+            combined = combined.union(*querysets[1:], all=True)
+        return combined.order_by(*self.key_fields)
+
+    def boundaries_key(self):
+        return f'sitemap:{self.name}:boundaries'
+
+    def chunk_version_key(self, chunk):
+        return f'sitemap:{self.name}:{chunk}:version'
+
+    def get_state(self):
+        """
+        Границы кусков, число записей последнего куска и поколение,
+        входящее в ключи кэша кусков. Пересчёт границ начинает новое
+        поколение.
+        """
+        state = cache.get(self.boundaries_key())
+        if state is None:
+            boundaries, last_count = self.compute_boundaries()
+            state = {
+                'generation': uuid.uuid4().hex,
+                'boundaries': boundaries,
+                'last_count': last_count,
+            }
+            cache.set(self.boundaries_key(), state, None)
+        return state
+
+    def get_boundaries(self):
+        return self.get_state()['boundaries']
+
+    def compute_boundaries(self):
+        boundaries = []
+        total = 0
+        keys = self.combine([
+            queryset.values_list(*self.key_fields)
+            for queryset in self.get_querysets()
+        ]).iterator()
+        for total, key in enumerate(keys, 1):
+            if (total - 1) % settings.SITEMAP_CHUNK_SIZE == 0:
+                boundaries.append(key)
+        last_count = total - settings.SITEMAP_CHUNK_SIZE * max(
+            len(boundaries) - 1, 0
+        )
+        return boundaries, last_count
+
+    def key_filter(self, key, lookup):
+        """Q для записей с ключом сортировки gte/lt заданного."""
+        *equal_fields, last_field = self.key_fields
+        strict = 'lt' if lookup == 'lt' else 'gt'
+        condition = Q(**{f'{last_field}__{lookup}': key[-1]})
+        for depth in range(len(equal_fields) - 1, -1, -1):
+            condition = (
+                Q(**{f'{equal_fields[depth]}__{strict}': key[depth]})
+                | Q(**{equal_fields[depth]: key[depth]}) & condition
+            )
+        return condition
+
+    def chunk_queryset(self, chunk, boundaries, fields):
+        querysets = []
+        for queryset in self.get_querysets():
+            queryset = queryset.filter(
+                self.key_filter(boundaries[chunk], 'gte')
+            )
+            if chunk < len(boundaries) - 1:
+                queryset = queryset.filter(
+                    self.key_filter(boundaries[chunk + 1], 'lt')
+                )
+            querysets.append(queryset.values_list(*fields))
+        return self.combine(querysets)
+
+    def count_added(self, state, key):
+        """
+        Учитывает новую запись последнего куска. При переполнении
+        следующая граница ищется запросом только по последнему куску,
+        он же выправляет счётчик, если его сбили гонки процессов.
+        Возвращает True, если появился новый кусок.
+        """
+        state['last_count'] += 1
+        if state['last_count'] <= settings.SITEMAP_CHUNK_SIZE:
+            return False
+        boundaries = state['boundaries']
+        keys = list(self.chunk_queryset(
+            len(boundaries) - 1, boundaries, self.key_fields
+        ))
+        state['last_count'] = len(keys)
+        if len(keys) <= settings.SITEMAP_CHUNK_SIZE:
+            return False
+        boundaries.append(keys[settings.SITEMAP_CHUNK_SIZE])
+        state['last_count'] = len(keys) - settings.SITEMAP_CHUNK_SIZE
+        return True
+
+    def rows(self, chunk):
+        boundaries = self.get_boundaries()
+        if chunk >= len(boundaries):
+            raise Http404
+        return [
+            dict(zip(self.fields, row))
+            for row in self.chunk_queryset(chunk, boundaries, self.fields)
+        ]
+
+    def invalidate(self, key, delta=0):
+        """
+        Сбрасывает только кусок, содержащий запись с этим ключом.
+        delta - изменение числа записей: 1 для новой, -1 для удалённой.
+        """
+        state = cache.get(self.boundaries_key())
+        if state is None:
+            invalidate_sitemap_index()
+            return
+        boundaries = state['boundaries']
+        if not boundaries or key < boundaries[0]:
+            # Запись раньше первой границы: куски сдвигаются целиком.
+            cache.delete(self.boundaries_key())
+            invalidate_sitemap_index()
+            return
+        chunk = max(bisect.bisect_right(boundaries, key) - 1, 0)
+        self.bump_chunk(chunk)
+        if not delta or chunk != len(boundaries) - 1:
+            return
+        if delta > 0:
+            added_chunk = self.count_added(state, key)
+        else:
+            state['last_count'] -= 1
+            added_chunk = False
+        cache.set(self.boundaries_key(), state, None)
+        if added_chunk:
+            invalidate_sitemap_index()
+
+    def bump_chunk(self, chunk):
+        cache.set(self.chunk_version_key(chunk), uuid.uuid4().hex, None)
+
+    def render_chunk(self, request, chunk):
+        generation = self.get_state()['generation']
+        version = cache.get(self.chunk_version_key(chunk), '')
+        key = (
+            f'sitemap:{self.name}:{generation}:{chunk}:{version}:'
+            f'{request.get_host()}'
+        )
+        content = cache.get(key)
+        if content is None:
+            urlset = [
+                {
+                    'location': request.build_absolute_uri(
+                        self.location(row)
+                    ),
+                    'lastmod': self.lastmod(row),
+                }
+                for row in self.rows(chunk)
+            ]
+            content = render_to_string('sitemap.xml', {'urlset': urlset})
+            cache.set(key, content, settings.SITEMAP_CACHE_TIMEOUT)
+        return content
+
+
+class PostSitemap(SitemapSection):
+    """Посты вместе с архивными: post_detail отдаёт и те, и другие."""
+    name = 'posts'
+    key_fields = ('pub_date', 'id')
+    fields = ('pub_date', 'id')
+
+    def get_querysets(self):
+        return [ArchivedPost.objects.all(), Post.objects.all()]
+
+    def location(self, post):
+        return reverse('posts:post_detail', args=(post['id'],))
+
+    def lastmod(self, post):
+        return post['pub_date']
+
+
+class ProfileSitemap(SitemapSection):
+    name = 'profiles'
+    fields = ('id', 'username')
+
+    def get_querysets(self):
+        return [User.objects.all()]
+
+    def location(self, user):
+        return reverse('posts:profile', args=(user['username'],))
+
+
+class GroupSitemap(SitemapSection):
+    name = 'groups'
+    fields = ('id', 'slug')
+
+    def get_querysets(self):
+        return [Group.objects.exclude(Q(slug__isnull=True) | Q(slug=''))]
+
+    def location(self, group):
+        return reverse('posts:group_list', args=(group['slug'],))
+
+
+SECTIONS = {
+    section.name: section
+    for section in (PostSitemap(), ProfileSitemap(), GroupSitemap())
+}
+
+SITEMAP_INDEX_KEY = 'sitemap:index:version'
+
+
+def invalidate_sitemap_index():
+    cache.set(SITEMAP_INDEX_KEY, uuid.uuid4().hex, None)
+
+
+@require_safe
+def sitemap_index(request):
+    version = cache.get(SITEMAP_INDEX_KEY, '')
+    key = f'sitemap:index:{version}:{request.get_host()}'
+    content = cache.get(key)
+    if content is None:
+        locations = [
+            request.build_absolute_uri(reverse(
+                'posts:sitemap_chunk',
+                kwargs={'section': name, 'chunk': chunk},
+            ))
+            for name, section in SECTIONS.items()
+            for chunk in range(len(section.get_boundaries()))
+        ]
+        content = render_to_string(
+            'sitemap_index.xml', {'sitemaps': locations}
+        )
+        cache.set(key, content, settings.SITEMAP_CACHE_TIMEOUT)
+    return HttpResponse(content, content_type='application/xml')
+
+
+@require_safe
+def sitemap_chunk(request, section, chunk):
+    if section not in SECTIONS:
+        raise Http404
+    content = SECTIONS[section].render_chunk(request, chunk)
+    return HttpResponse(content, content_type='application/xml')
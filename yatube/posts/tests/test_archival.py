@@ -0,0 +1,148 @@
+from datetime import timedelta
+from http import HTTPStatus
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from ..models import ArchivedPost, Group, Post, PostMonthCount
+
+
+User = get_user_model()
+
+
+class ArchivalTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.guest_client = Client()
+        cls.user = User.objects.create_user(username='auth')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        cls.posts = [
+            Post.objects.create(
+                author=cls.user,
+                text=f'Пост номер {i:02}',
+                group=cls.group,
+            )
+            for i in range(1, 16)
+        ]
+        # Первые пять постов - двухлетней давности.
+        for days, post in enumerate(cls.posts[:5]):
+            Post.objects.filter(id=post.id).update(
+                pub_date=timezone.now() - timedelta(days=800 - days)
+            )
+        cls.old_ids = [post.id for post in cls.posts[:5]]
+        call_command('rebuild_month_counts', stdout=StringIO())
+
+    def setUp(self):
+        cache.clear()
+
+    def archive(self, *args):
+        out = StringIO()
+        call_command('archive_posts', *args, stdout=out)
+        return out.getvalue()
+
+    def test_command_moves_old_posts_in_batches(self):
+        """Старые посты переносятся пачками с теми же id и полями."""
+        self.assertIn('5', self.archive('--batch-size', '2'))
+        self.assertFalse(Post.objects.filter(id__in=self.old_ids).exists())
+        archived = ArchivedPost.objects.get(id=self.old_ids[0])
+        self.assertEqual(archived.text, 'Пост номер 01')
+        self.assertEqual(archived.author, self.user)
+        self.assertEqual(archived.group, self.group)
+        self.assertEqual(ArchivedPost.objects.count(), 5)
+        self.assertEqual(Post.objects.count(), 10)
+
+    def test_dry_run_moves_nothing(self):
+        """--dry-run только считает кандидатов."""
+        self.assertIn('5', self.archive('--dry-run'))
+        self.assertFalse(ArchivedPost.objects.exists())
+
+    def test_post_detail_serves_archived_post(self):
+        """Страница архивного поста открывается по прежнему адресу."""
+        self.archive()
+        response = self.guest_client.get(
+            reverse('posts:post_detail', args=(self.old_ids[0],))
+        )
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertContains(response, 'Пост номер 01')
+        self.assertEqual(response.context['author_posts_count'], 15)
+
+    def test_post_detail_missing_post(self):
+        """Поста нет ни в основной таблице, ни в архиве - 404."""
+        response = self.guest_client.get(
+            reverse('posts:post_detail', args=(10 ** 5,))
+        )
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+
+    def test_profile_continues_into_archive(self):
+        """Профиль листается в архив, счётчик включает архивные посты."""
+        self.archive()
+        url = reverse('posts:profile', args=(self.user.username,))
+        first = self.guest_client.get(url)
+        self.assertEqual(first.context['page_obj'].paginator.count, 15)
+        self.assertContains(first, 'Всего постов: 15')
+        second = self.guest_client.get(url, {'page': 2})
+        self.assertEqual(
+            [post.id for post in second.context['page_obj']],
+            list(reversed(self.old_ids)),
+        )
+
+    def test_profile_fragment_crosses_into_archive(self):
+        """Подгрузка профиля продолжает ленту архивными постами."""
+        self.archive()
+        Post.objects.filter(
+            id__in=[post.id for post in self.posts[-2:]]
+        ).delete()
+        first = self.guest_client.get(
+            reverse('posts:profile', args=(self.user.username,))
+        )
+        self.assertEqual(
+            [post.id for post in first.context['page_obj']][-2:],
+            list(reversed(self.old_ids))[:2],
+        )
+        response = self.guest_client.get(first.context['load_more_url'])
+        self.assertEqual(
+            [post.id for post in response.context['posts']],
+            list(reversed(self.old_ids))[2:],
+        )
+        self.assertNotIn('X-Next-Cursor', response)
+
+    def month_counts(self):
+        return dict(PostMonthCount.objects.filter(
+            scope=PostMonthCount.AUTHOR, scope_id=self.user.id
+        ).values_list('month', 'count'))
+
+    def test_archived_posts_stay_in_month_archive(self):
+        """Перенос не меняет счётчики месяцев, страница месяца их видит."""
+        before = self.month_counts()
+        self.archive()
+        self.assertEqual(self.month_counts(), before)
+        call_command('rebuild_month_counts', stdout=StringIO())
+        self.assertEqual(self.month_counts(), before)
+        old = ArchivedPost.objects.get(id=self.old_ids[0])
+        for name, args in (
+            ('posts:archive_month', ()),
+            ('posts:group_archive_month', (self.group.slug,)),
+            ('posts:profile_archive_month', (self.user.username,)),
+        ):
+            url = reverse(
+                name, args=(*args, old.pub_date.year, old.pub_date.month)
+            )
+            with self.subTest(url=url):
+                self.assertContains(self.guest_client.get(url), old.text)
+
+    def test_deleting_archived_post_discounts_month(self):
+        """Удаление архивного поста вычитается из счётчиков."""
+        self.archive()
+        before = sum(self.month_counts().values())
+        ArchivedPost.objects.filter(id=self.old_ids[0]).delete()
+        self.assertEqual(sum(self.month_counts().values()), before - 1)
@@ -0,0 +1,120 @@
+from datetime import date, datetime
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from ..models import Group, Post, PostMonthCount
+
+
+User = get_user_model()
+
+
+class MonthArchiveTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.guest_client = Client()
+        cls.user = User.objects.create_user(username='auth')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        cls.other_group = Group.objects.create(
+            title='Другая группа',
+            slug='other-slug',
+            description='Тестовое описание',
+        )
+        cls.post = Post.objects.create(
+            author=cls.user, text='Мартовский пост', group=cls.group
+        )
+        Post.objects.filter(pk=cls.post.pk).update(
+            pub_date=timezone.make_aware(datetime(2022, 3, 15))
+        )
+        cls.post.refresh_from_db()
+        call_command('rebuild_month_counts', stdout=StringIO())
+        cls.month = timezone.localtime().date().replace(day=1)
+        cls.fresh_post = Post.objects.create(
+            author=cls.user, text='Свежий пост', group=cls.group
+        )
+
+    def counts(self, scope, scope_id=0):
+        return dict(PostMonthCount.objects.filter(
+            scope=scope, scope_id=scope_id
+        ).values_list('month', 'count'))
+
+    def test_counts_maintained_on_write(self):
+        """Создание, смена группы и удаление поста меняют счётчики."""
+        self.assertEqual(self.counts('global')[self.month], 1)
+        self.fresh_post.group = self.other_group
+        self.fresh_post.save()
+        self.assertEqual(self.counts('group', self.group.id)[self.month], 0)
+        self.assertEqual(
+            self.counts('group', self.other_group.id)[self.month], 1
+        )
+        self.fresh_post.delete()
+        self.assertEqual(self.counts('author', self.user.id)[self.month], 0)
+
+    def test_save_without_group_skips_lookup(self):
+        """Сохранение без поля group не перечитывает прежнюю группу."""
+        post = Post.objects.get(text='Свежий пост')
+        post.text = 'Исправленный пост'
+        with CaptureQueriesContext(connection) as queries:
+            post.save(update_fields=['text'])
+        self.assertFalse([
+            query for query in queries.captured_queries
+            if query['sql'].startswith('SELECT')
+        ])
+        self.assertEqual(self.counts('group', self.group.id)[self.month], 1)
+
+    def test_rebuild_month_counts(self):
+        """Пересчёт учитывает посты, даты которых меняли в обход save()."""
+        self.assertEqual(
+            self.counts('group', self.group.id),
+            {date(2022, 3, 1): 1, self.month: 1},
+        )
+
+    def test_month_pages(self):
+        """Страница месяца показывает только посты этого месяца."""
+        urls = (
+            reverse('posts:archive_month', args=(2022, 3)),
+            reverse('posts:group_archive_month', args=('test-slug', 2022, 3)),
+            reverse('posts:profile_archive_month', args=('auth', 2022, 3)),
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                response = self.guest_client.get(url)
+                self.assertContains(response, 'Мартовский пост')
+                self.assertNotContains(response, 'Свежий пост')
+                self.assertContains(response, 'Март 2022')
+        response = self.guest_client.get(
+            reverse('posts:archive_month', args=(2022, 13))
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_out_of_range_month_not_found(self):
+        """Месяц или год вне диапазона дат - 404, а не ошибка сервера."""
+        for year, month in ((0, 12), (9999, 12), (10000, 1), (2022, 0)):
+            for name, args in (
+                ('posts:archive_month', ()),
+                ('posts:group_archive_month', ('test-slug',)),
+                ('posts:profile_archive_month', ('auth',)),
+            ):
+                url = reverse(name, args=(*args, year, month))
+                with self.subTest(url=url):
+                    response = self.guest_client.get(url)
+                    self.assertEqual(response.status_code, 404)
+
+    def test_archive_index_lists_months(self):
+        """Индекс архива перечисляет месяцы из таблицы счётчиков."""
+        response = self.guest_client.get(reverse('posts:archive'))
+        self.assertEqual(
+            list(response.context['months']),
+            [(self.month, 1), (date(2022, 3, 1), 1)],
+        )
@@ -0,0 +1,235 @@
+import threading
+import time
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DatabaseError, connections
+from django.test import (
+    Client, TestCase, TransactionTestCase, override_settings,
+)
+from django.urls import reverse
+
+from ..counters import ViewCounter
+from ..models import ArchivedPost, Post
+
+
+User = get_user_model()
+
+
+@override_settings(
+    VIEW_COUNT_FLUSH_THRESHOLD=1000, VIEW_COUNT_FLUSH_INTERVAL=3600,
+)
+class ViewCounterTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.guest_client = Client()
+        cls.user = User.objects.create_user(username='auth')
+        cls.post = Post.objects.create(author=cls.user, text='Тестовый пост')
+
+    def setUp(self):
+        cache.clear()
+        # Свежий буфер: просмотры других тестов не попадают в этот.
+        self.counter = ViewCounter()
+        for target in ('core.middleware.view_counter',
+                       'posts.views.view_counter'):
+            patcher = mock.patch(target, self.counter)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_post_detail_views_buffered_and_flushed(self):
+        """Просмотры копятся в буфере и пишутся в БД одним сбросом."""
+        url = reverse('posts:post_detail', args=(self.post.id,))
+        for _ in range(3):
+            self.guest_client.get(url)
+        self.assertEqual(self.counter.pending(self.post.id), 3)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.views, 0)
+        with self.assertNumQueries(4):
+            self.assertEqual(self.counter.flush(), 3)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.views, 3)
+        self.assertContains(self.guest_client.get(url), 'Просмотров: 3')
+
+    def test_other_pages_not_counted(self):
+        """Ошибочный адрес и другие страницы просмотров не добавляют."""
+        self.guest_client.get(reverse('posts:post_detail', args=(10 ** 5,)))
+        self.guest_client.get(reverse('posts:index'))
+        self.assertEqual(self.counter.flush(), 0)
+
+    @override_settings(VIEW_COUNT_FLUSH_THRESHOLD=2)
+    def test_threshold_triggers_flush(self):
+        """Набрав порог, буфер сбрасывается сам."""
+        counter = ViewCounter()
+        counter.add(self.post.id)
+        counter.add(self.post.id)
+        self.assertEqual(counter.pending(self.post.id), 0)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.views, 2)
+
+    def test_failed_flush_keeps_views(self):
+        """Неудачная запись возвращает просмотры в буфер."""
+        counter = ViewCounter()
+        counter.add(self.post.id, 5)
+        with mock.patch(
+            'posts.counters.write_view_counts', side_effect=DatabaseError
+        ), self.assertLogs('posts.counters', 'ERROR'):
+            self.assertEqual(counter.flush_quietly(), 0)
+        self.assertEqual(counter.pending(self.post.id), 5)
+        counter.flush()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.views, 5)
+
+    def test_views_in_flight_still_pending(self):
+        """Пока запись идёт, снятые просмотры видны в pending."""
+        counter = ViewCounter()
+        counter.add(self.post.id, 5)
+        seen = []
+        with mock.patch(
+            'posts.counters.write_view_counts',
+            side_effect=lambda counts: seen.append(
+                counter.pending(self.post.id)
+            ),
+        ):
+            counter.flush()
+        self.assertEqual(seen, [5])
+        self.assertEqual(counter.pending(self.post.id), 0)
+
+    def test_flusher_survives_errors(self):
+        """Любой сбой сброса логируется, фоновый поток продолжает работу."""
+        class Stop(BaseException):
+            pass
+
+        counter = ViewCounter()
+        with mock.patch.object(
+            counter, 'flush_quietly', side_effect=[RuntimeError, 0]
+        ) as flush, mock.patch(
+            'posts.counters.time.sleep', side_effect=[None, None, Stop]
+        ), mock.patch(
+            # Цикл идёт в потоке теста: его соединение не закрываем.
+            'posts.counters.connections'
+        ), self.assertLogs('posts.counters', 'ERROR'):
+            with self.assertRaises(Stop):
+                counter.flush_periodically()
+        self.assertEqual(flush.call_count, 2)
+
+    def test_post_edit_keeps_flushed_views(self):
+        """Правка поста пишет только поля формы и не затирает просмотры."""
+        client = Client()
+        client.force_login(self.user)
+        stale_views = Post.objects.get(id=self.post.id).views
+
+        def save_with_flush(post, **kwargs):
+            # Просмотры сбрасываются между загрузкой и сохранением поста.
+            counter = ViewCounter()
+            counter.add(post.id, 7)
+            counter.flush()
+            self.assertEqual(post.views, stale_views)
+            return original_save(post, **kwargs)
+
+        original_save = Post.save
+        with mock.patch.object(Post, 'save', save_with_flush):
+            client.post(
+                reverse('posts:post_edit', args=(self.post.id,)),
+                {'text': 'Исправленный пост'},
+            )
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.views, 7)
+        self.assertEqual(self.post.text, 'Исправленный пост')
+
+    def test_post_copy_idiom_inserts(self):
+        """post.pk = None; post.save() создаёт копию поста."""
+        post = Post.objects.get(id=self.post.id)
+        post.pk = None
+        post.save()
+        self.assertEqual(Post.objects.count(), 2)
+
+    def test_archived_post_views_counted(self):
+        """Просмотры архивного поста пишутся в архивную таблицу."""
+        archived = ArchivedPost.objects.create(
+            id=10 ** 5, text='Старый пост', pub_date=self.post.pub_date,
+            author=self.user,
+        )
+        counter = ViewCounter()
+        counter.add(archived.id, 4)
+        counter.flush()
+        archived.refresh_from_db()
+        self.assertEqual(archived.views, 4)
+
+    @override_settings(PAGE_CACHE_TIMEOUT=60, FEED_ROW_CACHE_TIMEOUT=60)
+    def test_flush_refreshes_cached_pages(self):
+        """После сброса закэшированные страницы показывают новые просмотры."""
+        urls = (
+            reverse('posts:post_detail', args=(self.post.id,)),
+            reverse('posts:profile', args=(self.user.username,)),
+        )
+        for url in urls:
+            self.guest_client.get(url)
+        self.counter.flush()
+        for url in urls:
+            with self.subTest(url=url):
+                self.assertContains(
+                    self.guest_client.get(url), 'Просмотров: 1'
+                )
+
+    def test_profile_shows_views(self):
+        """На странице профиля видны просмотры постов."""
+        Post.objects.filter(id=self.post.id).update(views=12)
+        response = self.guest_client.get(
+            reverse('posts:profile', args=(self.user.username,))
+        )
+        self.assertContains(response, 'Просмотров: 12')
+
+
+@override_settings(VIEW_COUNT_FLUSH_THRESHOLD=7, DB_LOCK_BACKOFF=0.01)
+class ConcurrentViewCounterTests(TransactionTestCase):
+    @override_settings(
+        VIEW_COUNT_FLUSH_THREAD=True, VIEW_COUNT_FLUSH_INTERVAL=0.05,
+    )
+    def test_idle_process_flushed_by_thread(self):
+        """Просмотры простаивающего процесса сбрасывает фоновый поток."""
+        user = User.objects.create_user(username='auth')
+        post = Post.objects.create(author=user, text='Пост')
+        counter = ViewCounter()
+        counter.add(post.id, 3)
+        for _ in range(100):
+            time.sleep(0.02)
+            post.refresh_from_db()
+            if post.views:
+                break
+        self.assertEqual(post.views, 3)
+
+    def test_no_lost_increments_across_flushes(self):
+        """
+        Просмотры из многих потоков со сбросами посреди счёта
+        доходят до БД все до одного.
+        """
+        user = User.objects.create_user(username='auth')
+        posts = [
+            Post.objects.create(author=user, text=f'Пост {i}')
+            for i in range(3)
+        ]
+        counter = ViewCounter()
+        threads, views_per_thread = 8, 50
+
+        def worker(number):
+            try:
+                for i in range(views_per_thread):
+                    counter.add(posts[(number + i) % len(posts)].id)
+            finally:
+                connections.close_all()
+
+        workers = [
+            threading.Thread(target=worker, args=(number,))
+            for number in range(threads)
+        ]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        counter.flush()
+        self.assertEqual(
+            sum(Post.objects.values_list('views', flat=True)),
+            threads * views_per_thread,
+        )
@@ -0,0 +1,75 @@
+from http import HTTPStatus
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from core.testing import run_on_commit
+
+from ..models import Group, Post
+
+
+User = get_user_model()
+
+
+class FeedsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.guest_client = Client()
+        cls.user = User.objects.create_user(username='auth')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        cls.post = Post.objects.create(
+            author=cls.user,
+            text='Тестовый пост в группе',
+            group=cls.group,
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_feeds_contain_posts(self):
+        """RSS и Atom ленты отдают посты."""
+        urls = (
+            reverse('posts:feed_rss'),
+            reverse('posts:feed_atom'),
+            reverse('posts:group_rss', args=(self.group.slug,)),
+            reverse('posts:group_atom', args=(self.group.slug,)),
+            reverse('posts:profile_rss', args=(self.user.username,)),
+            reverse('posts:profile_atom', args=(self.user.username,)),
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                response = self.guest_client.get(url)
+                self.assertEqual(response.status_code, HTTPStatus.OK)
+                self.assertContains(response, self.post.text)
+
+    def test_unknown_group_not_found(self):
+        """Лента несуществующей группы отдаёт 404."""
+        response = self.guest_client.get(
+            reverse('posts:group_rss', args=('unknown',))
+        )
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+
+    def test_feed_is_cached_until_post_changes(self):
+        """Повторный запрос не ходит в БД, новый пост сбрасывает кэш."""
+        url = reverse('posts:feed_rss')
+        self.guest_client.get(url)
+        with self.assertNumQueries(0):
+            self.guest_client.get(url)
+        with run_on_commit():
+            Post.objects.create(author=self.user, text='Свежий пост')
+        self.assertContains(self.guest_client.get(url), 'Свежий пост')
+
+    def test_conditional_get(self):
+        """Читалка с актуальным ETag получает 304."""
+        url = reverse('posts:profile_atom', args=(self.user.username,))
+        etag = self.guest_client.get(url)['ETag']
+        with self.assertNumQueries(0):
+            response = self.guest_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
@@ -0,0 +1,123 @@
+import re
+from http import HTTPStatus
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from core.testing import run_on_commit
+
+from ..models import Group, Post
+
+
+User = get_user_model()
+
+
+class FragmentTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.guest_client = Client()
+        cls.user = User.objects.create_user(username='auth')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        for i in range(1, 16):
+            Post.objects.create(
+                author=cls.user,
+                text=f'Пост номер {i:02}',
+                group=cls.group if i % 2 else None,
+            )
+
+    def setUp(self):
+        cache.clear()
+
+    def collect(self, url):
+        """Проходит ленту по курсорам, возвращает номера постов."""
+        numbers = []
+        while url:
+            response = self.guest_client.get(url)
+            self.assertEqual(response.status_code, HTTPStatus.OK)
+            numbers += [
+                int(number) for number in
+                re.findall(r'Пост номер (\d+)', response.content.decode())
+            ]
+            cursor = response.get('X-Next-Cursor')
+            url = f'{url.split("?")[0]}?cursor={cursor}' if cursor else None
+        return numbers
+
+    def test_cursor_walks_feeds_without_gaps(self):
+        """Фрагменты проходят ленты целиком, без пропусков и повторов."""
+        self.assertEqual(
+            self.collect(reverse('posts:index_more')),
+            list(range(15, 0, -1)),
+        )
+        self.assertEqual(
+            self.collect(
+                reverse('posts:group_list_more', args=(self.group.slug,))
+            ),
+            list(range(15, 0, -2)),
+        )
+        self.assertEqual(
+            len(self.collect(
+                reverse('posts:profile_more', args=(self.user.username,))
+            )),
+            15,
+        )
+
+    def test_first_page_links_to_fragment(self):
+        """Первая страница ленты ведёт на фрагмент со следующей порцией."""
+        pages = (
+            (reverse('posts:index'), list(range(5, 0, -1))),
+            (
+                reverse('posts:profile', args=(self.user.username,)),
+                list(range(5, 0, -1)),
+            ),
+        )
+        for url, rest in pages:
+            with self.subTest(url=url):
+                response = self.guest_client.get(url)
+                more_url = response.context.get('load_more_url')
+                self.assertIsNotNone(more_url)
+                self.assertContains(response, 'class="load-more"')
+                self.assertEqual(self.collect(more_url), rest)
+                response = self.guest_client.get(url, {'page': 2})
+                self.assertNotContains(response, 'class="load-more"')
+        # Все посты группы уместились на первой странице.
+        response = self.guest_client.get(
+            reverse('posts:group_list', args=(self.group.slug,))
+        )
+        self.assertNotContains(response, 'class="load-more"')
+
+    def test_fragment_has_no_layout(self):
+        """Фрагмент не содержит base.html и ведёт на следующую порцию."""
+        response = self.guest_client.get(reverse('posts:index_more'))
+        self.assertNotContains(response, '<html')
+        self.assertNotContains(response, '<header')
+        self.assertContains(response, 'class="load-more"')
+        self.assertEqual(response.content.decode().count('<article>'), 10)
+
+    def test_fragment_cached_until_new_post(self):
+        """Повторный запрос отдаётся из кэша, новый пост его сбрасывает."""
+        url = reverse('posts:index_more')
+        self.guest_client.get(url)
+        with self.assertNumQueries(0):
+            self.guest_client.get(url)
+        with run_on_commit():
+            Post.objects.create(author=self.user, text='Пост номер 16')
+        self.assertContains(self.guest_client.get(url), 'Пост номер 16')
+
+    def test_bad_cursor_and_unknown_objects(self):
+        """Битый курсор и несуществующие автор или группа дают 404."""
+        urls = (
+            reverse('posts:index_more') + '?cursor=broken',
+            reverse('posts:group_list_more', args=('unknown',)),
+            reverse('posts:profile_more', args=('unknown',)),
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                response = self.guest_client.get(url)
+                self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
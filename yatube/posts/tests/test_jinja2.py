@@ -0,0 +1,65 @@
+from io import StringIO
+from unittest import skipUnless
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from ..models import Group, Post
+
+
+User = get_user_model()
+
+
+@skipUnless(settings.JINJA2_AVAILABLE, 'jinja2 не установлен')
+class Jinja2TemplatesTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.guest_client = Client()
+        cls.user = User.objects.create_user(
+            username='auth', first_name='Иван', last_name='Иванов'
+        )
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        for i in range(12):
+            Post.objects.create(
+                author=cls.user, text=f'Пост **{i}**', group=cls.group
+            )
+
+    def test_pages_match_django_templates(self):
+        """Страницы на Jinja2 содержат то же, что и на шаблонах Django."""
+        urls = {
+            'index': reverse('posts:index'),
+            'group_posts': reverse('posts:group_list', args=('test-slug',)),
+            'profile': reverse('posts:profile', args=('auth',)),
+        }
+        for view, url in urls.items():
+            with self.subTest(view=view):
+                django_response = self.guest_client.get(url)
+                with override_settings(
+                    POSTS_TEMPLATE_ENGINES={view: 'jinja2'}
+                ):
+                    jinja2_response = self.guest_client.get(url)
+                self.assertEqual(jinja2_response.templates, [])
+                for text in (
+                    '<strong>11</strong>',
+                    'Иван Иванов',
+                    '?page=2',
+                    'Регистрация',
+                ):
+                    self.assertContains(django_response, text)
+                    self.assertContains(jinja2_response, text)
+
+    def test_benchmark_command(self):
+        """Команда сравнения выводит время для обоих движков."""
+        out = StringIO()
+        call_command('template_benchmark', iterations=2, stdout=out)
+        output = out.getvalue()
+        self.assertIn('jinja2', output)
+        self.assertIn('profile', output)
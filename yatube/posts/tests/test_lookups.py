@@ -0,0 +1,119 @@
+from http import HTTPStatus
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.testing import run_on_commit
+
+from ..lookups import LRUCache, groups, users
+from ..models import Group, Post
+
+
+User = get_user_model()
+
+
+@override_settings(LOOKUP_CACHE_MAX_AGE=60)
+class LookupCacheTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.guest_client = Client()
+        cls.user = User.objects.create_user(username='auth')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        Post.objects.create(author=cls.user, text='Тестовый пост')
+
+    def setUp(self):
+        cache.clear()
+        users.lru.clear()
+        groups.lru.clear()
+
+    def lookup_queries(self, url, table, column):
+        with CaptureQueriesContext(connection) as context:
+            response = self.guest_client.get(url)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        return [
+            query for query in context.captured_queries
+            if f'FROM "{table}" WHERE "{table}"."{column}"' in query['sql']
+        ]
+
+    def test_hot_pages_skip_lookup_query(self):
+        """Повторный запрос профиля и группы не ищет их в БД."""
+        pages = (
+            (
+                reverse('posts:profile', args=(self.user.username,)),
+                'auth_user',
+                'username',
+            ),
+            (
+                reverse('posts:group_list', args=(self.group.slug,)),
+                'posts_group',
+                'slug',
+            ),
+        )
+        for url, table, column in pages:
+            with self.subTest(url=url):
+                self.assertTrue(self.lookup_queries(url, table, column))
+                self.assertEqual(self.lookup_queries(url, table, column), [])
+
+    def test_context_objects_equal_models(self):
+        """Из кэша в контекст попадают объекты, равные моделям."""
+        url = reverse('posts:profile', args=(self.user.username,))
+        self.guest_client.get(url)
+        response = self.guest_client.get(url)
+        self.assertEqual(response.context['author'], self.user)
+
+    def test_rename_invalidates(self):
+        """Сохранение пользователя и группы сбрасывает кэш."""
+        self.guest_client.get(reverse('posts:profile', args=('auth',)))
+        self.user.username = 'renamed'
+        with run_on_commit():
+            self.user.save()
+        response = self.guest_client.get(
+            reverse('posts:profile', args=('auth',))
+        )
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+        url = reverse('posts:group_list', args=(self.group.slug,))
+        self.guest_client.get(url)
+        self.group.title = 'Новое название'
+        with run_on_commit():
+            self.group.save()
+        self.assertContains(self.guest_client.get(url), 'Новое название')
+
+    def test_signup_keeps_cache(self):
+        """Новый пользователь не сбрасывает кэш остальных."""
+        url = reverse('posts:profile', args=('auth',))
+        self.guest_client.get(url)
+        User.objects.create_user(username='newcomer')
+        self.assertEqual(self.lookup_queries(url, 'auth_user', 'username'), [])
+
+    def test_entries_expire(self):
+        """
+        Запись старше LOOKUP_CACHE_MAX_AGE перечитывается, даже если
+        сброс версии до процесса не дошёл.
+        """
+        url = reverse('posts:profile', args=('auth',))
+        self.guest_client.get(url)
+        User.objects.filter(id=self.user.id).update(first_name='Лев')
+        with override_settings(LOOKUP_CACHE_MAX_AGE=0):
+            self.guest_client.get(url)
+        self.assertEqual(
+            users.get_or_404('auth').first_name, 'Лев'
+        )
+
+    def test_lru_evicts_least_recently_used(self):
+        """LRU вытесняет запись, которую дольше всех не читали."""
+        lru = LRUCache(maxsize=2)
+        lru.set('a', 1)
+        lru.set('b', 2)
+        lru.get('a')
+        lru.set('c', 3)
+        self.assertIsNone(lru.get('b'))
+        self.assertEqual(lru.get('a'), 1)
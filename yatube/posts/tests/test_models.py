@@ -1,4 +1,7 @@
+from io import StringIO
+
 from django.contrib.auth import get_user_model
+from django.core.management import call_command
 from django.test import TestCase
 
 from ..models import Group, Post
@@ -65,3 +68,51 @@ class PostModelTest(TestCase):
             with self.subTest(field=field):
                 self.assertEqual(
                     post._meta.get_field(field).help_text, value)
+
+
+class PostTextHtmlTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+
+    def test_text_html_rendered_on_save(self):
+        """При сохранении текст поста рендерится в HTML."""
+        post = Post.objects.create(
+            author=self.user,
+            text='**Жирный** и *курсив* <b>\nhttps://yatube.ru',
+        )
+        self.assertEqual(
+            post.text_html,
+            '<p><strong>Жирный</strong> и <em>курсив</em> &lt;b&gt;<br>'
+            '<a href="https://yatube.ru" rel="nofollow">'
+            'https://yatube.ru</a></p>',
+        )
+        post.text = 'Новый текст'
+        post.save(update_fields=['text'])
+        post.refresh_from_db()
+        self.assertEqual(post.text_html, '<p>Новый текст</p>')
+
+    def test_emphasis_skips_links(self):
+        """Звёздочки в адресе ссылки не превращаются в разметку."""
+        post = Post.objects.create(
+            author=self.user,
+            text='*Смотрите* https://yatube.ru/*a*/**b** и *тут*',
+        )
+        self.assertEqual(
+            post.text_html,
+            '<p><em>Смотрите</em> <a href="https://yatube.ru/*a*/**b**" '
+            'rel="nofollow">https://yatube.ru/*a*/**b**</a> '
+            'и <em>тут</em></p>',
+        )
+
+    def test_render_posts_backfills_in_batches(self):
+        """Команда render_posts заполняет text_html у bulk_create постов."""
+        Post.objects.bulk_create(
+            Post(author=self.user, text=f'Пост {i}') for i in range(5)
+        )
+        call_command('render_posts', batch_size=2, stdout=StringIO())
+        self.assertFalse(Post.objects.filter(text_html='').exists())
+        self.assertEqual(
+            Post.objects.get(text='Пост 3').text_html, '<p>Пост 3</p>'
+        )
@@ -0,0 +1,90 @@
+import pickle
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from core.testing import run_on_commit
+
+from ..models import Group, Post
+from ..rows import PostRow, to_row
+
+
+User = get_user_model()
+
+
+@override_settings(FEED_ROW_CACHE_TIMEOUT=60)
+class FeedRowCacheTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.guest_client = Client()
+        cls.user = User.objects.create_user(
+            username='auth', first_name='Лев', last_name='Толстой',
+        )
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        for i in range(1, 13):
+            Post.objects.create(
+                author=cls.user,
+                text=f'Пост номер {i:02}',
+                group=cls.group if i % 2 else None,
+            )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_feeds_render_rows(self):
+        """Ленты рендерят те же посты строками PostRow."""
+        urls = (
+            reverse('posts:index'),
+            reverse('posts:group_list', args=(self.group.slug,)),
+            reverse('posts:profile', args=(self.user.username,)),
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                with override_settings(FEED_ROW_CACHE_TIMEOUT=0):
+                    expected = self.guest_client.get(url).content
+                response = self.guest_client.get(url)
+                page_obj = response.context['page_obj']
+                self.assertIsInstance(page_obj[0], PostRow)
+                self.assertEqual(response.content, expected)
+
+    def test_cached_page_served_without_post_queries(self):
+        """Повторная страница берётся из кэша без запросов к постам."""
+        url = reverse('posts:index')
+        self.guest_client.get(url, {'page': 2})
+        with self.assertNumQueries(0):
+            response = self.guest_client.get(url, {'page': 2})
+        self.assertContains(response, 'Пост номер 01')
+
+    def test_new_post_invalidates_rows(self):
+        """Новый пост сразу виден в закэшированной ленте."""
+        url = reverse('posts:index')
+        self.guest_client.get(url)
+        with run_on_commit():
+            Post.objects.create(author=self.user, text='Свежий пост')
+        response = self.guest_client.get(url)
+        self.assertEqual(response.context['page_obj'][0].text, 'Свежий пост')
+        self.assertEqual(response.context['page_obj'].paginator.count, 13)
+
+    def test_author_rename_invalidates_rows(self):
+        """Смена имени автора сбрасывает строки с его именем."""
+        url = reverse('posts:index')
+        self.guest_client.get(url)
+        self.user.first_name = 'Алексей'
+        with run_on_commit():
+            self.user.save()
+        self.assertContains(self.guest_client.get(url), 'Алексей Толстой')
+
+    def test_rows_smaller_than_models(self):
+        """Страница строками заметно меньше pickle моделей."""
+        posts = list(Post.objects.with_related()[:10])
+        rows = [to_row(post) for post in posts]
+        self.assertLess(
+            len(pickle.dumps(rows)) * 2, len(pickle.dumps(posts))
+        )
@@ -0,0 +1,131 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from core.testing import run_on_commit
+
+from ..archival import archive_old_posts
+from ..models import ArchivedPost, Group, Post
+
+
+User = get_user_model()
+
+
+@override_settings(SITEMAP_CHUNK_SIZE=3)
+class SitemapTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.guest_client = Client()
+        cls.user = User.objects.create_user(username='auth')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        cls.posts = [
+            Post.objects.create(author=cls.user, text=f'Пост {i}')
+            for i in range(7)
+        ]
+
+    def setUp(self):
+        cache.clear()
+
+    def chunk_url(self, section, chunk):
+        return reverse(
+            'posts:sitemap_chunk',
+            kwargs={'section': section, 'chunk': chunk},
+        )
+
+    def test_index_lists_chunks(self):
+        """Индекс ссылается на куски всех разделов."""
+        response = self.guest_client.get(reverse('posts:sitemap'))
+        for section, chunk in (
+            ('posts', 0), ('posts', 1), ('posts', 2),
+            ('profiles', 0), ('groups', 0),
+        ):
+            with self.subTest(section=section, chunk=chunk):
+                self.assertContains(response, self.chunk_url(section, chunk))
+        self.assertNotContains(response, self.chunk_url('posts', 3))
+
+    def test_chunks_follow_pub_date_order(self):
+        """Куски идут по (pub_date, id) от старых к новым."""
+        response = self.guest_client.get(self.chunk_url('posts', 0))
+        for post in self.posts[:3]:
+            self.assertContains(
+                response,
+                reverse('posts:post_detail', args=(post.id,)),
+            )
+        self.assertNotContains(
+            response,
+            reverse('posts:post_detail', args=(self.posts[3].id,)),
+        )
+        response = self.guest_client.get(self.chunk_url('groups', 0))
+        self.assertContains(
+            response, reverse('posts:group_list', args=(self.group.slug,))
+        )
+        response = self.guest_client.get(self.chunk_url('posts', 9))
+        self.assertEqual(response.status_code, 404)
+
+    def test_new_post_touches_only_last_chunk(self):
+        """Новый пост сбрасывает последний кусок, остальные из кэша."""
+        self.guest_client.get(reverse('posts:sitemap'))
+        for chunk in range(3):
+            self.guest_client.get(self.chunk_url('posts', chunk))
+        with run_on_commit():
+            new_posts = [
+                Post.objects.create(author=self.user, text=f'Новый пост {i}')
+                for i in range(3)
+            ]
+        with self.assertNumQueries(0):
+            self.guest_client.get(self.chunk_url('posts', 0))
+        response = self.guest_client.get(reverse('posts:sitemap'))
+        self.assertContains(response, self.chunk_url('posts', 3))
+        response = self.guest_client.get(self.chunk_url('posts', 3))
+        self.assertContains(
+            response,
+            reverse('posts:post_detail', args=(new_posts[-1].id,)),
+        )
+
+    def test_edit_regenerates_its_chunk(self):
+        """Правка поста сбрасывает кэш его куска."""
+        self.guest_client.get(reverse('posts:sitemap'))
+        self.guest_client.get(self.chunk_url('posts', 0))
+        self.guest_client.get(self.chunk_url('posts', 1))
+        self.posts[0].text = 'Исправленный пост'
+        with run_on_commit():
+            self.posts[0].save()
+        with self.assertNumQueries(0):
+            self.guest_client.get(self.chunk_url('posts', 1))
+        with self.assertNumQueries(1):
+            self.guest_client.get(self.chunk_url('posts', 0))
+
+    def test_index_rebuild_does_not_scan(self):
+        """Новый пост без переполнения куска не требует запросов индекса."""
+        self.guest_client.get(reverse('posts:sitemap'))
+        with run_on_commit():
+            post = Post.objects.create(author=self.user, text='Новый пост')
+        with self.assertNumQueries(0):
+            self.guest_client.get(reverse('posts:sitemap'))
+        response = self.guest_client.get(self.chunk_url('posts', 2))
+        self.assertContains(
+            response, reverse('posts:post_detail', args=(post.id,))
+        )
+
+    def test_archived_posts_listed(self):
+        """Архивные посты остаются в карте сайта."""
+        Post.objects.filter(id=self.posts[0].id).update(
+            pub_date=timezone.now() - timedelta(days=800)
+        )
+        archive_old_posts(timezone.now() - timedelta(days=365), 10)
+        self.assertTrue(
+            ArchivedPost.objects.filter(id=self.posts[0].id).exists()
+        )
+        response = self.guest_client.get(self.chunk_url('posts', 0))
+        self.assertContains(
+            response, reverse('posts:post_detail', args=(self.posts[0].id,))
+        )
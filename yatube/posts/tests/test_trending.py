@@ -0,0 +1,115 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from core.testing import run_on_commit
+
+from ..models import Group, Post
+from .. import trending
+from ..trending import compute_trending, get_trending
+
+
+User = get_user_model()
+
+
+@override_settings(TRENDING_SIZE=2)
+class TrendingTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.guest_client = Client()
+        cls.user = User.objects.create_user(username='auth')
+        cls.hot_group = Group.objects.create(
+            title='Горячая группа', slug='hot', description='Описание'
+        )
+        cls.quiet_group = Group.objects.create(
+            title='Тихая группа', slug='quiet', description='Описание'
+        )
+        cls.old_group = Group.objects.create(
+            title='Старая группа', slug='old', description='Описание'
+        )
+        for i in range(3):
+            Post.objects.create(
+                author=cls.user, text=f'Горячий {i}', group=cls.hot_group
+            )
+        Post.objects.create(
+            author=cls.user, text='Тихий', group=cls.quiet_group
+        )
+        old_post = Post.objects.create(
+            author=cls.user, text='Старый', group=cls.old_group
+        )
+        Post.objects.filter(pk=old_post.pk).update(
+            pub_date=timezone.now() - timedelta(days=30)
+        )
+
+    def setUp(self):
+        cache.clear()
+        trending.last_computed.clear()
+
+    def test_groups_ranked_by_window_activity(self):
+        """Группы упорядочены по числу постов в окне, старые не учтены."""
+        compute_trending('week')
+        groups = get_trending('week')['groups']
+        self.assertEqual(
+            [(group['slug'], group['posts']) for group in groups],
+            [('hot', 3), ('quiet', 1)],
+        )
+
+    def test_posts_from_hot_group_first(self):
+        """Посты активной группы выше, размер топа ограничен."""
+        compute_trending('day')
+        posts = get_trending('day')['posts']
+        self.assertEqual(len(posts), 2)
+        self.assertTrue(all(post['group_slug'] == 'hot' for post in posts))
+
+    def test_view_served_from_cache(self):
+        """Страница популярного берёт посчитанный топ из кэша."""
+        compute_trending('day')
+        with self.assertNumQueries(0):
+            response = self.guest_client.get(reverse('posts:popular'))
+        self.assertContains(response, 'Горячая группа')
+        response = self.guest_client.get(
+            reverse('posts:popular_window', args=('year',))
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_new_post_updates_without_recompute(self):
+        """Новый пост учитывается инкрементально."""
+        compute_trending('day')
+        with run_on_commit():
+            for i in range(3):
+                Post.objects.create(
+                    author=self.user, text=f'Тихий {i}',
+                    group=self.quiet_group,
+                )
+        with self.assertNumQueries(0):
+            trending = get_trending('day')
+        self.assertEqual(
+            [(group['slug'], group['posts']) for group in trending['groups']],
+            [('quiet', 4), ('hot', 3)],
+        )
+        self.assertEqual(trending['posts'][0]['text'], 'Тихий 2')
+
+    def test_miss_does_not_recompute(self):
+        """Без данных в кэше отдаётся прошлый результат или пустой топ."""
+        with self.assertNumQueries(0):
+            self.assertEqual(get_trending('day')['posts'], [])
+        compute_trending('day')
+        cache.clear()
+        with self.assertNumQueries(0):
+            posts = get_trending('day')['posts']
+        self.assertEqual(len(posts), 2)
+
+    def test_deleted_post_removed(self):
+        """Удалённый пост пропадает из топа и счётчиков групп."""
+        compute_trending('day')
+        post = Post.objects.filter(group=self.hot_group).latest('pub_date')
+        with run_on_commit():
+            post.delete()
+        trending = get_trending('day')
+        self.assertNotIn(post.id, [post['id'] for post in trending['posts']])
+        self.assertEqual(trending['groups'][0]['posts'], 2)
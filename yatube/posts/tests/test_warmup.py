@@ -0,0 +1,83 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import CommandError, call_command
+from django.test import Client, TransactionTestCase, override_settings
+from django.urls import reverse
+
+from ..models import Group, Post
+from ..warmup import WARM_ACCEPT_ENCODING, pick_urls, warm_on_start
+
+
+User = get_user_model()
+
+
+@override_settings(PAGE_CACHE_TIMEOUT=60)
+class WarmCacheTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+        self.quiet = User.objects.create_user(username='quiet')
+        self.busy = User.objects.create_user(username='busy')
+        self.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        Group.objects.create(title='Пустая', slug='empty', description='')
+        Post.objects.create(author=self.quiet, text='Единственный пост')
+        for i in range(14):
+            Post.objects.create(
+                author=self.busy, text=f'Пост номер {i}', group=self.group,
+            )
+
+    def test_pick_urls_by_activity(self):
+        """Страницы index по числу постов, активные группы и авторы."""
+        self.assertEqual(pick_urls(5, 10, 1, 3), [
+            reverse('posts:index'),
+            reverse('posts:index') + '?page=2',
+            reverse('posts:group_list', args=('test-slug',)),
+            reverse('posts:profile', args=('busy',)),
+        ])
+
+    def test_command_fills_page_cache(self):
+        """После прогрева страницы отдаются из кэша без запросов к БД."""
+        out = StringIO()
+        call_command(
+            'warm_cache', '--host', 'testserver', '--concurrency', '2',
+            stdout=out, stderr=StringIO(),
+        )
+        self.assertIn('Прогрето страниц: 5, ошибок: 0', out.getvalue())
+        for url in (
+            reverse('posts:index'),
+            reverse('posts:group_list', args=('test-slug',)),
+            reverse('posts:profile', args=('quiet',)),
+        ):
+            with self.subTest(url=url):
+                with self.assertNumQueries(0):
+                    response = self.guest_client.get(
+                        url, HTTP_ACCEPT_ENCODING=WARM_ACCEPT_ENCODING
+                    )
+                self.assertEqual(response.status_code, 200)
+
+    def test_zero_concurrency_rejected(self):
+        """Прогрев без потоков отклоняется, а не завершается молча."""
+        with self.assertRaises(CommandError):
+            call_command('warm_cache', '--concurrency', '0', stdout=StringIO())
+
+    @override_settings(WARM_CACHE_HOST='')
+    def test_missing_host_rejected(self):
+        """Без host прогрев не угадывает его из ALLOWED_HOSTS."""
+        with self.assertRaises(CommandError):
+            call_command('warm_cache', stdout=StringIO())
+        with self.assertRaises(ImproperlyConfigured):
+            warm_on_start()
+
+    @override_settings(WARM_CACHE_HOST='testserver')
+    def test_host_from_settings(self):
+        """Host по умолчанию берётся из WARM_CACHE_HOST."""
+        out = StringIO()
+        call_command('warm_cache', stdout=out, stderr=StringIO())
+        self.assertIn('Прогрето страниц: 5, ошибок: 0', out.getvalue())
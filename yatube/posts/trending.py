@@ -0,0 +1,193 @@
+import heapq
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+from django.utils import timezone
+
+from .models import Group, Post
+
+
+# Сколько кандидатов в популярные посты хранить на каждое место в топе.
+CANDIDATES_FACTOR = 5
+# Показатель затухания популярности поста со временем.
+GRAVITY = 1.5
+
+POST_FIELDS = (
+    'id',
+    'text',
+    'pub_date',
+    'group_id',
+    'author__username',
+    'author__first_name',
+    'author__last_name',
+)
+
+
+# Последние данные каждого окна в памяти процесса: на случай,
+# если их вытеснили из кэша.
+last_computed = {}
+
+
+def trending_key(window):
+    return f'posts:trending:{window}'
+
+
+def post_score(post, group_counts, now):
+    """
+    Активность поста: сколько постов за окно вышло в его группе,
+    с затуханием по возрасту поста.
+    """
+    activity = group_counts.get(post['group_id'], 0) + 1
+    age_hours = (now - post['pub_date']).total_seconds() / 3600
+    return activity / (max(age_hours, 0) + 2) ** GRAVITY
+
+
+def compute_trending(window):
+    """
+    Считает активность групп и кандидатов в популярные посты
+    за окно и кладёт результат в кэш. Запросы ограничены окном
+    по pub_date, поэтому не сканируют всю таблицу. Посты окна читаются
+    потоком узких строк (id, дата, группа) через кучу на число
+    кандидатов, полные поля загружаются только для кандидатов.
+    """
+    now = timezone.now()
+    since = now - timedelta(days=settings.TRENDING_WINDOWS[window])
+    recent = Post.objects.filter(pub_date__gte=since)
+    group_counts = dict(
+        recent.filter(group__isnull=False)
+        .values_list('group_id')
+        .annotate(posts=Count('id'))
+        .order_by()
+    )
+    groups = {
+        group['id']: group
+        for group in Group.objects.filter(id__in=group_counts).exclude(
+            slug__isnull=True
+        ).exclude(slug='').values('id', 'slug', 'title')
+    }
+    top = heapq.nlargest(
+        settings.TRENDING_SIZE * CANDIDATES_FACTOR,
+        recent.order_by().values('id', 'pub_date', 'group_id').iterator(),
+        key=lambda post: post_score(post, group_counts, now),
+    )
+    rows = {
+        post['id']: post
+        for post in Post.objects.filter(
+            id__in=[post['id'] for post in top]
+        ).values(*POST_FIELDS)
+    }
+    data = {
+        'computed_at': now,
+        'group_counts': group_counts,
+        'groups': groups,
+        'posts': [rows[post['id']] for post in top if post['id'] in rows],
+    }
+    cache.set(trending_key(window), data, None)
+    last_computed[window] = data
+    return data
+
+
+def empty_trending():
+    return {
+        'computed_at': None,
+        'group_counts': {},
+        'groups': {},
+        'posts': [],
+    }
+
+
+def get_trending(window):
+    """
+    Топ постов и групп за окно. Данные берутся из кэша,
+    так что ответ стоит O(N) от размера топа. Если кэш потерял
+    данные (вытеснение, перезапуск), отдаётся последний результат,
+    посчитанный этим процессом, или пустой топ: пересчёт делает
+    compute_trending по расписанию, а не запрос.
+    """
+    data = cache.get(trending_key(window))
+    if data is None:
+        data = last_computed.get(window) or empty_trending()
+    else:
+        last_computed[window] = data
+    now = timezone.now()
+    since = now - timedelta(days=settings.TRENDING_WINDOWS[window])
+    group_counts = data['group_counts']
+    posts = [post for post in data['posts'] if post['pub_date'] >= since]
+    posts.sort(
+        key=lambda post: post_score(post, group_counts, now), reverse=True
+    )
+    groups = sorted(
+        (
+            dict(data['groups'][group_id], posts=count)
+            for group_id, count in group_counts.items()
+            if group_id in data['groups']
+        ),
+        key=lambda group: group['posts'],
+        reverse=True,
+    )
+    for post in posts:
+        group = data['groups'].get(post['group_id'])
+        post['group_slug'] = group['slug'] if group else None
+    return {
+        'posts': posts[:settings.TRENDING_SIZE],
+        'groups': groups[:settings.TRENDING_SIZE],
+        'computed_at': data['computed_at'],
+    }
+
+
+def add_to_trending(post):
+    """
+    Учитывает новый пост в уже посчитанных окнах без пересчёта.
+    Возможные гонки между воркерами исправит периодический пересчёт.
+    """
+    row = {
+        'id': post.id,
+        'text': post.text,
+        'pub_date': post.pub_date,
+        'group_id': post.group_id,
+        'author__username': post.author.username,
+        'author__first_name': post.author.first_name,
+        'author__last_name': post.author.last_name,
+    }
+    for window in settings.TRENDING_WINDOWS:
+        data = cache.get(trending_key(window))
+        if data is None:
+            continue
+        if post.group_id is not None:
+            counts = data['group_counts']
+            counts[post.group_id] = counts.get(post.group_id, 0) + 1
+            if post.group_id not in data['groups'] and post.group.slug:
+                data['groups'][post.group_id] = {
+                    'id': post.group_id,
+                    'slug': post.group.slug,
+                    'title': post.group.title,
+                }
+        candidates = data['posts']
+        candidates.insert(0, row)
+        del candidates[settings.TRENDING_SIZE * CANDIDATES_FACTOR:]
+        cache.set(trending_key(window), data, None)
+        last_computed[window] = data
+
+
+def remove_from_trending(post):
+    """Убирает удалённый пост из кандидатов и счётчиков групп окон."""
+    for window in settings.TRENDING_WINDOWS:
+        data = cache.get(trending_key(window))
+        if data is None:
+            continue
+        data['posts'] = [
+            candidate for candidate in data['posts']
+            if candidate['id'] != post.id
+        ]
+        counts = data['group_counts']
+        if post.group_id in counts and post.pub_date >= (
+            data['computed_at']
+            - timedelta(days=settings.TRENDING_WINDOWS[window])
+        ):
+            counts[post.group_id] -= 1
+            if not counts[post.group_id]:
+                del counts[post.group_id]
+        cache.set(trending_key(window), data, None)
+        last_computed[window] = data
@@ -1,5 +1,5 @@
 from django.urls import path
-from . import views
+from . import feeds, fragments, sitemaps, views
 
 
 app_name = 'posts'
@@ -8,7 +8,66 @@ urlpatterns = [
     path('', views.index, name='index'),
     path('group/<slug:slug>/', views.group_posts, name='group_list'),
     path('profile/<str:username>/', views.profile, name='profile'),
+    path('more/', fragments.index_more, name='index_more'),
+    path(
+        'group/<slug:slug>/more/',
+        fragments.group_posts_more,
+        name='group_list_more'
+    ),
+    path(
+        'profile/<str:username>/more/',
+        fragments.profile_more,
+        name='profile_more'
+    ),
     path('posts/<int:post_id>/', views.post_detail, name='post_detail'),
     path('create/', views.post_create, name='post_create'),
+    path('popular/', views.popular, name='popular'),
+    path('archive/', views.post_archive, name='archive'),
+    path(
+        'archive/<int:year>/<int:month>/',
+        views.post_archive,
+        name='archive_month'
+    ),
+    path(
+        'group/<slug:slug>/archive/',
+        views.group_archive,
+        name='group_archive'
+    ),
+    path(
+        'group/<slug:slug>/archive/<int:year>/<int:month>/',
+        views.group_archive,
+        name='group_archive_month'
+    ),
+    path(
+        'profile/<str:username>/archive/',
+        views.profile_archive,
+        name='profile_archive'
+    ),
+    path(
+        'profile/<str:username>/archive/<int:year>/<int:month>/',
+        views.profile_archive,
+        name='profile_archive_month'
+    ),
+    path('popular/<str:window>/', views.popular, name='popular_window'),
     path('posts/<int:post_id>/edit/', views.post_edit, name='post_edit'),
+    path('rss/', feeds.latest_rss, name='feed_rss'),
+    path('atom/', feeds.latest_atom, name='feed_atom'),
+    path('group/<slug:slug>/rss/', feeds.group_rss, name='group_rss'),
+    path('group/<slug:slug>/atom/', feeds.group_atom, name='group_atom'),
+    path(
+        'profile/<str:username>/rss/',
+        feeds.author_rss,
+        name='profile_rss'
+    ),
+    path(
+        'profile/<str:username>/atom/',
+        feeds.author_atom,
+        name='profile_atom'
+    ),
+    path('sitemap.xml', sitemaps.sitemap_index, name='sitemap'),
+    path(
+        'sitemap-<str:section>-<int:chunk>.xml',
+        sitemaps.sitemap_chunk,
+        name='sitemap_chunk'
+    ),
 ]
@@ -1,8 +1,21 @@
+from urllib.parse import urlencode
+
+from django.conf import settings
 from django.core.paginator import Paginator
+from django.http import Http404
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
-from .models import Post, Group, User
+from django.urls import reverse
+from core.db import run_write
+from .archival import ChainedPosts
+from .counters import view_counter
+from .models import ArchivedPost, Post, PostMonthCount
 from .forms import PostForm
+from .lookups import get_group_or_404, get_user_or_404
+from .pagination import encode_cursor
+from .rollups import archive_months, month_range
+from .rows import cached_feed
+from .trending import get_trending
 
 
 DISPLAYED_POSTS = 10
@@ -14,45 +27,176 @@ def get_page(request, post_list):
     return paginator.get_page(page_number)
 
 
+def load_more_context(page_obj, more_url):
+    """
+    Для первой страницы - курсор и адрес фрагмента "Показать ещё"
+    (posts/fragments.py), с которых клиент продолжает ленту без
+    повторной загрузки первой порции.
+    """
+    if page_obj.number != 1 or not page_obj.has_next():
+        return {}
+    last = page_obj[len(page_obj) - 1]
+    next_cursor = encode_cursor(last.pub_date, last.id)
+    return {
+        'next_cursor': next_cursor,
+        'load_more_url': f'{more_url}?{urlencode({"cursor": next_cursor})}',
+    }
+
+
+def template_engine(view_name):
+    """Движок шаблонов для view: None - первый подходящий (Django)."""
+    return settings.POSTS_TEMPLATE_ENGINES.get(view_name)
+
+
 def index(request):
-    post_list = Post.objects.all()
+    post_list = cached_feed('index', Post.objects.with_related())
     page_obj = get_page(request, post_list)
     context = {
         'page_obj': page_obj,
+        **load_more_context(page_obj, reverse('posts:index_more')),
     }
-    return render(request, 'posts/index.html', context)
+    return render(
+        request, 'posts/index.html', context, using=template_engine('index')
+    )
 
 
 def group_posts(request, slug):
-    group = get_object_or_404(Group, slug=slug)
-    post_list = group.posts.all()
+    group = get_group_or_404(slug)
+    post_list = cached_feed(f'group:{slug}', group.posts.with_related())
     page_obj = get_page(request, post_list)
     context = {
         'group': group,
         'page_obj': page_obj,
+        **load_more_context(
+            page_obj, reverse('posts:group_list_more', args=(slug,))
+        ),
     }
-    return render(request, 'posts/group_list.html', context)
+    return render(
+        request,
+        'posts/group_list.html',
+        context,
+        using=template_engine('group_posts'),
+    )
 
 
 def profile(request, username):
-    user = get_object_or_404(User, username=username)
-    post_list = user.posts.all()
+    user = get_user_or_404(username)
+    post_list = cached_feed(f'profile:{username}', ChainedPosts(
+        user.posts.with_related(), user.archived_posts.with_related()
+    ), views=True)
     page_obj = get_page(request, post_list)
     context = {
         'page_obj': page_obj,
         'author': user,
+        **load_more_context(
+            page_obj, reverse('posts:profile_more', args=(username,))
+        ),
     }
-    return render(request, 'posts/profile.html', context)
+    return render(
+        request,
+        'posts/profile.html',
+        context,
+        using=template_engine('profile'),
+    )
 
 
 def post_detail(request, post_id):
-    post = get_object_or_404(Post, id=post_id)
+    post = Post.objects.with_related().filter(id=post_id).first()
+    if post is None:
+        # Старые посты перенесены командой archive_posts.
+        post = get_object_or_404(
+            ArchivedPost.objects.with_related(), id=post_id
+        )
     context = {
         'post': post,
+        'author_posts_count': (
+            post.author.posts.count() + post.author.archived_posts.count()
+        ),
+        'views': post.views + view_counter.pending(post.id),
     }
     return render(request, 'posts/post_detail.html', context)
 
 
+def archive_context(request, scope, scope_id, post_list, archived_list,
+                    year, month):
+    """
+    Список месяцев берётся из таблицы счётчиков, посты месяца -
+    диапазонными запросами по pub_date к основной и архивной таблицам
+    с обычной пагинацией.
+    """
+    context = {
+        'months': archive_months(scope, scope_id),
+        'archive_year': year,
+        'archive_month': month,
+    }
+    if year is not None:
+        try:
+            start, end = month_range(year, month)
+        except ValueError:
+            # Месяц вне 1..12 или год, для которого нет границ месяца.
+            raise Http404
+        month_filter = {'pub_date__gte': start, 'pub_date__lt': end}
+        context['page_obj'] = get_page(request, ChainedPosts(
+            post_list.filter(**month_filter),
+            archived_list.filter(**month_filter),
+        ))
+    return context
+
+
+def post_archive(request, year=None, month=None):
+    context = archive_context(
+        request,
+        PostMonthCount.GLOBAL,
+        0,
+        Post.objects.with_related(),
+        ArchivedPost.objects.with_related(),
+        year,
+        month,
+    )
+    return render(request, 'posts/archive.html', context)
+
+
+def group_archive(request, slug, year=None, month=None):
+    group = get_group_or_404(slug)
+    context = archive_context(
+        request,
+        PostMonthCount.GROUP,
+        group.id,
+        group.posts.with_related(),
+        group.archived_posts.with_related(),
+        year,
+        month,
+    )
+    context['group'] = group
+    return render(request, 'posts/archive.html', context)
+
+
+def profile_archive(request, username, year=None, month=None):
+    author = get_user_or_404(username)
+    context = archive_context(
+        request,
+        PostMonthCount.AUTHOR,
+        author.id,
+        author.posts.with_related(),
+        author.archived_posts.with_related(),
+        year,
+        month,
+    )
+    context['author'] = author
+    return render(request, 'posts/archive.html', context)
+
+
+def popular(request, window='day'):
+    if window not in settings.TRENDING_WINDOWS:
+        raise Http404
+    context = {
+        'window': window,
+        'windows': settings.TRENDING_WINDOWS,
+        'trending': get_trending(window),
+    }
+    return render(request, 'posts/popular.html', context)
+
+
 @login_required
 def post_create(request):
     if request.method == 'POST':
@@ -60,7 +204,7 @@ def post_create(request):
         if form.is_valid():
             post = form.save(commit=False)
             post.author = request.user
-            post.save()
+            run_write(post.save)
             return redirect('posts:profile', post.author)
         return render(request, 'posts/create_post.html', {'form': form})
     form = PostForm()
@@ -78,7 +222,9 @@ def post_edit(request, post_id):
     if request.user != post.author:
         return redirect('posts:post_detail', post_id=post_id)
     if form.is_valid():
-        form.save()
+        # Только поля формы: views, сброшенные в БД после загрузки
+        # поста (posts/counters.py), не затираются.
+        run_write(post.save, update_fields=form._meta.fields)
         return redirect('posts:post_detail', post_id=post_id)
 
     return render(request, 'posts/create_post.html', context)
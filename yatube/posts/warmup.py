@@ -0,0 +1,127 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.handlers.wsgi import WSGIHandler
+from django.db import connections
+from django.db.models import Sum
+from django.test import RequestFactory
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import Group, Post, PostMonthCount, User
+from .rollups import month_of
+from .views import DISPLAYED_POSTS
+
+# Полностраничный кэш хранит ответ для каждого сжатия отдельно:
+# прогреваются варианты, которые запрашивают браузеры.
+WARM_ACCEPT_ENCODING = 'gzip, deflate, br'
+
+
+def most_active(scope, months, limit):
+    """
+    id авторов или групп с наибольшим числом постов за последние months
+    месяцев. Считается по таблице счётчиков, без прохода по постам.
+    """
+    since = month_of(timezone.now() - timedelta(days=31 * (months - 1)))
+    return list(
+        PostMonthCount.objects.filter(scope=scope, month__gte=since)
+        .values('scope_id')
+        .annotate(total=Sum('count'))
+        .filter(total__gt=0)
+        .order_by('-total', 'scope_id')
+        .values_list('scope_id', flat=True)[:limit]
+    )
+
+
+def pick_urls(index_pages, groups, authors, months):
+    """Адреса для прогрева: страницы index, затем группы и авторы."""
+    index = reverse('posts:index')
+    pages = min(index_pages, -(-Post.objects.count() // DISPLAYED_POSTS))
+    urls = [index] + [
+        f'{index}?page={page}' for page in range(2, pages + 1)
+    ]
+    group_ids = most_active(PostMonthCount.GROUP, months, groups)
+    slugs = dict(Group.objects.filter(id__in=group_ids).values_list(
+        'id', 'slug'
+    ))
+    urls += [
+        reverse('posts:group_list', args=(slugs[group_id],))
+        for group_id in group_ids if slugs.get(group_id)
+    ]
+    author_ids = most_active(PostMonthCount.AUTHOR, months, authors)
+    usernames = dict(User.objects.filter(id__in=author_ids).values_list(
+        'id', 'username'
+    ))
+    urls += [
+        reverse('posts:profile', args=(usernames[author_id],))
+        for author_id in author_ids if author_id in usernames
+    ]
+    return urls
+
+
+def warm(urls, host, concurrency, pause=0):
+    """
+    Запрашивает urls анонимно через полный стек middleware в concurrency
+    потоков, так что ответы ложатся в те же кэши, что и при обычном
+    трафике. Запросы идут прямо в обработчик WSGI, без тестового клиента
+    с его cookies и перехватом шаблонов. pause - пауза в секундах после
+    каждого запроса потока, чтобы прогрев не забирал всю БД у живых
+    запросов.
+    Возвращает [(url, код ответа или имя исключения, мс)] в порядке urls.
+    """
+    if concurrency < 1:
+        raise ValueError('concurrency должно быть не меньше 1.')
+    results = [None] * len(urls)
+    pending = iter(enumerate(urls))
+    pending_lock = threading.Lock()
+    handler = WSGIHandler()
+    factory = RequestFactory(
+        HTTP_HOST=host, HTTP_ACCEPT_ENCODING=WARM_ACCEPT_ENCODING
+    )
+
+    def worker():
+        try:
+            while True:
+                with pending_lock:
+                    position, url = next(pending, (None, None))
+                if url is None:
+                    return
+                started = time.perf_counter()
+                try:
+                    response = handler.get_response(factory.get(url))
+                    outcome = response.status_code
+                except Exception as error:
+                    outcome = type(error).__name__
+                elapsed = (time.perf_counter() - started) * 1000
+                results[position] = (url, outcome, elapsed)
+                if pause:
+                    time.sleep(pause)
+        finally:
+            connections.close_all()
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for future in [pool.submit(worker) for _ in range(concurrency)]:
+            future.result()
+    return results
+
+
+def warm_on_start():
+    """Прогрев с настройками WARM_CACHE_* для core.startup.preload."""
+    if not settings.WARM_CACHE_HOST:
+        raise ImproperlyConfigured(
+            'YATUBE_WSGI_WARM_CACHE=1 требует YATUBE_WARM_CACHE_HOST.'
+        )
+    return warm(
+        pick_urls(
+            settings.WARM_CACHE_INDEX_PAGES,
+            settings.WARM_CACHE_GROUPS,
+            settings.WARM_CACHE_AUTHORS,
+            settings.WARM_CACHE_MONTHS,
+        ),
+        settings.WARM_CACHE_HOST,
+        settings.WARM_CACHE_CONCURRENCY,
+    )
@@ -0,0 +1,18 @@
+from django.contrib import admin
+from .models import OutboxEmail
+
+
+class OutboxEmailAdmin(admin.ModelAdmin):
+    list_display = (
+        'pk',
+        'subject',
+        'to',
+        'created',
+        'sent_at',
+        'attempts',
+    )
+    list_filter = ('sent_at',)
+    empty_value_display = '-пусто-'
+
+
+admin.site.register(OutboxEmail, OutboxEmailAdmin)
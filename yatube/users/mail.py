@@ -0,0 +1,126 @@
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+from django.db.models import F, Q
+from django.utils import timezone
+
+from core.db import run_write
+
+from .models import OutboxEmail
+
+
+class OutboxEmailBackend(BaseEmailBackend):
+    """
+    Вместо отправки кладёт письма в таблицу OutboxEmail.
+    Доставкой занимается команда send_outbox.
+    """
+
+    def send_messages(self, email_messages):
+        emails = [to_outbox(message) for message in email_messages]
+        OutboxEmail.objects.bulk_create(emails)
+        return len(emails)
+
+
+def to_outbox(message):
+    html_body = ''
+    for content, mimetype in getattr(message, 'alternatives', ()):
+        if mimetype == 'text/html':
+            html_body = content
+    return OutboxEmail(
+        subject=message.subject,
+        body=message.body,
+        html_body=html_body,
+        from_email=message.from_email,
+        to='\n'.join(message.to),
+        cc='\n'.join(message.cc),
+        bcc='\n'.join(message.bcc),
+    )
+
+
+def from_outbox(email, connection):
+    message = EmailMultiAlternatives(
+        subject=email.subject,
+        body=email.body,
+        from_email=email.from_email,
+        to=email.to.splitlines(),
+        cc=email.cc.splitlines(),
+        bcc=email.bcc.splitlines(),
+        connection=connection,
+    )
+    if email.html_body:
+        message.attach_alternative(email.html_body, 'text/html')
+    return message
+
+
+def claim_outbox(batch_size, max_attempts):
+    """
+    Захватывает пачку писем за этим воркером условным UPDATE:
+    письмо, которое уже захватил другой воркер, условию не подходит,
+    так что параллельные send_outbox не отправят его дважды.
+    Захват упавшего воркера истекает через OUTBOX_CLAIM_TIMEOUT.
+    """
+    token = uuid.uuid4().hex
+    now = timezone.now()
+    stale = now - timedelta(seconds=settings.OUTBOX_CLAIM_TIMEOUT)
+    pending = OutboxEmail.objects.filter(
+        Q(claimed_at__isnull=True) | Q(claimed_at__lt=stale),
+        sent_at__isnull=True,
+        attempts__lt=max_attempts,
+    )
+    ids = list(pending.values_list('pk', flat=True)[:batch_size])
+    if not ids:
+        return []
+    run_write(
+        pending.filter(pk__in=ids).update, claimed_by=token, claimed_at=now
+    )
+    return list(OutboxEmail.objects.filter(claimed_by=token))
+
+
+def finish_attempt(pks, **fields):
+    """Засчитывает попытку отправки и снимает захват писем."""
+    OutboxEmail.objects.filter(pk__in=pks).update(
+        attempts=F('attempts') + 1,
+        claimed_by='',
+        claimed_at=None,
+        **fields,
+    )
+
+
+def deliver_outbox(batch_size=None, max_attempts=None):
+    """
+    Отправляет пачку писем из очереди через одно соединение
+    с почтовым сервером. Возвращает число отправленных писем.
+    """
+    batch_size = batch_size or settings.OUTBOX_BATCH_SIZE
+    max_attempts = max_attempts or settings.OUTBOX_MAX_ATTEMPTS
+    emails = claim_outbox(batch_size, max_attempts)
+    if not emails:
+        return 0
+    connection = get_connection(settings.OUTBOX_DELIVERY_BACKEND)
+    try:
+        connection.open()
+    except Exception as error:
+        # Сервер недоступен: попытка засчитывается всей пачке, чтобы
+        # письма дошли до OUTBOX_MAX_ATTEMPTS, а захват снимается сразу.
+        finish_attempt(
+            [email.pk for email in emails], last_error=repr(error)
+        )
+        return 0
+    sent = 0
+    try:
+        for email in emails:
+            try:
+                connection.send_messages([from_outbox(email, connection)])
+            except Exception as error:
+                finish_attempt([email.pk], last_error=repr(error))
+            else:
+                # Отметка сразу после отправки: падение посреди пачки
+                # не отправит доставленные письма повторно.
+                finish_attempt([email.pk], sent_at=timezone.now())
+                sent += 1
+    finally:
+        connection.close()
+    return sent
@@ -0,0 +1,42 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from ...mail import deliver_outbox
+
+
+class Command(BaseCommand):
+    help = (
+        'Отправляет письма из очереди OutboxEmail пачками '
+        'через одно соединение с почтовым сервером.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.OUTBOX_BATCH_SIZE,
+            help='Сколько писем отправлять за одно соединение.',
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Работать постоянно, опрашивая очередь.',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=settings.OUTBOX_POLL_INTERVAL,
+            help='Пауза между опросами пустой очереди в секундах.',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            sent = deliver_outbox(options['batch_size'])
+            if sent:
+                self.stdout.write(f'Отправлено писем: {sent}')
+            if not options['loop']:
+                return
+            if sent < options['batch_size']:
+                time.sleep(options['interval'])
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from ...throttling import get_throttle_metrics
+
+
+class Command(BaseCommand):
+    help = (
+        'Показывает число принятых и отклонённых попыток входа, '
+        'регистрации и сброса пароля (нужен общий для воркеров кэш).'
+    )
+
+    def handle(self, *args, **options):
+        self.stdout.write(f'{"scope":<16}{"accepted":>10}{"rejected":>10}')
+        for scope, counts in get_throttle_metrics().items():
+            self.stdout.write(
+                f'{scope:<16}{counts["accepted"]:>10}{counts["rejected"]:>10}'
+            )
@@ -0,0 +1,38 @@
+# Generated by Django 2.2.16 on 2026-10-19 08:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RenameField(
+            model_name='outboxemail',
+            old_name='recipients',
+            new_name='to',
+        ),
+        migrations.AddField(
+            model_name='outboxemail',
+            name='bcc',
+            field=models.TextField(blank=True, help_text='По одному адресу в строке', verbose_name='Скрытая копия'),
+        ),
+        migrations.AddField(
+            model_name='outboxemail',
+            name='cc',
+            field=models.TextField(blank=True, help_text='По одному адресу в строке', verbose_name='Копия'),
+        ),
+        migrations.AddField(
+            model_name='outboxemail',
+            name='claimed_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Дата захвата воркером'),
+        ),
+        migrations.AddField(
+            model_name='outboxemail',
+            name='claimed_by',
+            field=models.CharField(blank=True, max_length=32, verbose_name='Воркер отправки'),
+        ),
+    ]
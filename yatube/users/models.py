@@ -0,0 +1,55 @@
+from django.db import models
+
+
+class OutboxEmail(models.Model):
+    subject = models.CharField(max_length=255, verbose_name='Тема')
+    body = models.TextField(verbose_name='Текст письма')
+    html_body = models.TextField(blank=True, verbose_name='HTML письма')
+    from_email = models.CharField(max_length=254, verbose_name='Отправитель')
+    to = models.TextField(
+        verbose_name='Получатели',
+        help_text='По одному адресу в строке',
+    )
+    cc = models.TextField(
+        blank=True,
+        verbose_name='Копия',
+        help_text='По одному адресу в строке',
+    )
+    bcc = models.TextField(
+        blank=True,
+        verbose_name='Скрытая копия',
+        help_text='По одному адресу в строке',
+    )
+    created = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Дата постановки в очередь',
+    )
+    sent_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        db_index=True,
+        verbose_name='Дата отправки',
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name='Попыток отправки',
+    )
+    last_error = models.TextField(blank=True, verbose_name='Последняя ошибка')
+    claimed_by = models.CharField(
+        max_length=32,
+        blank=True,
+        verbose_name='Воркер отправки',
+    )
+    claimed_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        verbose_name='Дата захвата воркером',
+    )
+
+    def __str__(self):
+        return self.subject
+
+    class Meta:
+        ordering = ['id']
+        verbose_name = 'Письмо в очереди'
+        verbose_name_plural = 'Очередь писем'
@@ -0,0 +1,180 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core import mail
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from .mail import deliver_outbox
+from .models import OutboxEmail
+from .throttling import get_throttle_metrics
+
+
+User = get_user_model()
+
+
+@override_settings(
+    EMAIL_BACKEND='users.mail.OutboxEmailBackend',
+    OUTBOX_DELIVERY_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+)
+class OutboxTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.guest_client = Client()
+        cls.user = User.objects.create_user(
+            username='test_user',
+            email='test_user@yatube.ru',
+            password='Sup3r-secret-pass',
+        )
+
+    def test_password_reset_is_queued(self):
+        """Письмо сброса пароля кладётся в очередь, а не отправляется."""
+        self.guest_client.post(
+            reverse('users:password_reset'),
+            data={'email': self.user.email},
+        )
+        self.assertEqual(len(mail.outbox), 0)
+        email = OutboxEmail.objects.get()
+        self.assertEqual(email.to, self.user.email)
+        self.assertIsNone(email.sent_at)
+
+    def test_signup_mail_is_queued(self):
+        """При регистрации в очередь попадает приветственное письмо."""
+        self.guest_client.post(
+            reverse('users:signup'),
+            data={
+                'username': 'new_user',
+                'email': 'new_user@yatube.ru',
+                'password1': 'Sup3r-secret-pass',
+                'password2': 'Sup3r-secret-pass',
+            },
+        )
+        email = OutboxEmail.objects.get()
+        self.assertEqual(email.to, 'new_user@yatube.ru')
+        self.assertIn('new_user', email.body)
+
+    def test_deliver_outbox_sends_in_batches(self):
+        """Воркер отправляет очередь пачками и помечает письма."""
+        for i in range(5):
+            mail.send_mail(f'Письмо {i}', 'Текст', None, ['to@yatube.ru'])
+        self.assertEqual(deliver_outbox(batch_size=3), 3)
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(deliver_outbox(batch_size=3), 2)
+        self.assertEqual(deliver_outbox(batch_size=3), 0)
+        self.assertFalse(
+            OutboxEmail.objects.filter(sent_at__isnull=True).exists()
+        )
+        self.assertEqual(mail.outbox[4].subject, 'Письмо 4')
+
+    def test_copies_kept_separately(self):
+        """Копия и скрытая копия не попадают в заголовок To."""
+        mail.EmailMessage(
+            'Тема', 'Текст', None, ['to@yatube.ru'],
+            cc=['cc@yatube.ru'], bcc=['bcc@yatube.ru'],
+        ).send()
+        deliver_outbox()
+        message = mail.outbox[0]
+        self.assertEqual(message.to, ['to@yatube.ru'])
+        self.assertEqual(message.cc, ['cc@yatube.ru'])
+        self.assertEqual(message.bcc, ['bcc@yatube.ru'])
+        self.assertNotIn('bcc@yatube.ru', message.message().as_string())
+
+    def test_claimed_emails_skipped(self):
+        """Письма, захваченные другим воркером, не отправляются повторно."""
+        for i in range(3):
+            mail.send_mail(f'Письмо {i}', 'Текст', None, ['to@yatube.ru'])
+        OutboxEmail.objects.filter(subject='Письмо 0').update(
+            claimed_by='other', claimed_at=timezone.now()
+        )
+        self.assertEqual(deliver_outbox(), 2)
+        self.assertEqual(deliver_outbox(), 0)
+        OutboxEmail.objects.filter(subject='Письмо 0').update(
+            claimed_at=timezone.now() - timedelta(hours=1)
+        )
+        self.assertEqual(deliver_outbox(), 1)
+
+    def test_connection_failure_counts_attempt(self):
+        """Недоступный сервер засчитывает попытку и снимает захват."""
+        mail.send_mail('Письмо', 'Текст', None, ['to@yatube.ru'])
+        with mock.patch(
+            'django.core.mail.backends.locmem.EmailBackend.open',
+            side_effect=ConnectionRefusedError,
+        ):
+            self.assertEqual(deliver_outbox(max_attempts=2), 0)
+            email = OutboxEmail.objects.get()
+            self.assertEqual(email.attempts, 1)
+            self.assertIn('ConnectionRefusedError', email.last_error)
+            self.assertEqual(email.claimed_by, '')
+            self.assertEqual(deliver_outbox(max_attempts=2), 0)
+        self.assertEqual(deliver_outbox(max_attempts=2), 0)
+        self.assertEqual(OutboxEmail.objects.get().attempts, 2)
+
+    def test_sent_marked_per_message(self):
+        """Падение посреди пачки не отменяет отметки отправленных писем."""
+        for i in range(2):
+            mail.send_mail(f'Письмо {i}', 'Текст', None, ['to@yatube.ru'])
+        with mock.patch(
+            'django.core.mail.backends.locmem.EmailBackend.send_messages',
+            side_effect=[1, KeyboardInterrupt],
+        ), self.assertRaises(KeyboardInterrupt):
+            deliver_outbox()
+        self.assertIsNotNone(
+            OutboxEmail.objects.get(subject='Письмо 0').sent_at
+        )
+
+
+@override_settings(THROTTLE_RATES={
+    'login': (2, 60),
+    'signup': (2, 60),
+    'password_reset': (2, 60),
+})
+class ThrottleTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+
+    def login(self, username, ip='10.0.0.1'):
+        return self.guest_client.post(
+            reverse('users:login'),
+            data={'username': username, 'password': 'wrong'},
+            REMOTE_ADDR=ip,
+        )
+
+    def test_login_rejected_after_bucket_is_empty(self):
+        """После исчерпания корзины вход отклоняется с кодом 429."""
+        self.assertEqual(self.login('victim').status_code, 200)
+        self.assertEqual(self.login('victim').status_code, 200)
+        response = self.login('victim')
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response)
+        self.assertEqual(
+            get_throttle_metrics()['login'],
+            {'accepted': 2, 'rejected': 1},
+        )
+
+    def test_username_bucket_shared_between_ips(self):
+        """Перебор одного имени с разных IP тоже ограничивается."""
+        for ip in ('10.0.0.1', '10.0.0.2'):
+            self.login('victim', ip)
+        self.assertEqual(self.login('victim', '10.0.0.3').status_code, 429)
+        self.assertEqual(self.login('other', '10.0.0.3').status_code, 200)
+
+    def test_get_is_not_throttled(self):
+        """GET-запросы страницы входа не расходуют токены."""
+        for _ in range(5):
+            response = self.guest_client.get(reverse('users:login'))
+            self.assertEqual(response.status_code, 200)
+
+
+class PasswordHasherTests(TestCase):
+    @override_settings(PASSWORD_HASH_ITERATIONS=1000)
+    def test_iterations_from_settings(self):
+        """Стоимость хэша берётся из PASSWORD_HASH_ITERATIONS."""
+        self.assertTrue(
+            make_password('secret').startswith('pbkdf2_sha256$1000$')
+        )
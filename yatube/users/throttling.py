@@ -0,0 +1,93 @@
+import hashlib
+import math
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+
+
+REJECTED_MESSAGE = 'Слишком много попыток. Попробуйте позже.'
+
+
+def take_token(key, capacity, refill_seconds):
+    """
+    Корзина токенов в кэше: возвращает True, если в корзине
+    нашёлся токен. Корзина полностью восстанавливается
+    за refill_seconds.
+    Чтение и запись не атомарны, при гонке возможна пара лишних попыток.
+    """
+    now = time.time()
+    rate = capacity / refill_seconds
+    tokens, updated = cache.get(key, (capacity, now))
+    tokens = min(capacity, tokens + (now - updated) * rate)
+    allowed = tokens >= 1
+    if allowed:
+        tokens -= 1
+    cache.set(key, (tokens, now), math.ceil(refill_seconds))
+    return allowed
+
+
+def client_ip(request):
+    if settings.THROTTLE_TRUST_X_FORWARDED_FOR:
+        forwarded = request.META.get('HTTP_X_FORWARDED_FOR')
+        if forwarded:
+            return forwarded.split(',')[0].strip()
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def throttle_keys(scope, request, username_field):
+    keys = [f'throttle:{scope}:ip:{client_ip(request)}']
+    username = request.POST.get(username_field, '').strip().lower()
+    if username:
+        digest = hashlib.md5(username.encode()).hexdigest()
+        keys.append(f'throttle:{scope}:user:{digest}')
+    return keys
+
+
+def count_attempt(scope, outcome):
+    key = f'throttle:metrics:{scope}:{outcome}'
+    cache.add(key, 0, None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, None)
+
+
+def get_throttle_metrics():
+    """Возвращает {scope: {'accepted': n, 'rejected': m}}."""
+    metrics = {}
+    for scope in settings.THROTTLE_RATES:
+        metrics[scope] = {
+            outcome: cache.get(f'throttle:metrics:{scope}:{outcome}', 0)
+            for outcome in ('accepted', 'rejected')
+        }
+    return metrics
+
+
+def throttle(scope, username_field='username'):
+    """
+    Ограничивает POST-запросы к view корзинами токенов
+    отдельно по IP и по имени пользователя из формы.
+    Запрос отклоняется до того, как view посчитает хэш пароля.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method != 'POST':
+                return view(request, *args, **kwargs)
+            capacity, refill_seconds = settings.THROTTLE_RATES[scope]
+            allowed = all([
+                take_token(key, capacity, refill_seconds)
+                for key in throttle_keys(scope, request, username_field)
+            ])
+            if not allowed:
+                count_attempt(scope, 'rejected')
+                response = HttpResponse(REJECTED_MESSAGE, status=429)
+                response['Retry-After'] = math.ceil(refill_seconds / capacity)
+                return response
+            count_attempt(scope, 'accepted')
+            return view(request, *args, **kwargs)
+        return wrapper
+    return decorator
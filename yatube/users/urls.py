@@ -4,6 +4,7 @@ from django.contrib.auth.views import (
     PasswordResetCompleteView)
 from django.urls import path
 from . import views
+from .throttling import throttle
 
 app_name = 'users'
 
@@ -15,18 +16,25 @@ urlpatterns = [
     ),
     path(
         'login/',
-        LoginView.as_view(template_name='users/login.html'),
+        throttle('login')(
+            LoginView.as_view(template_name='users/login.html')
+        ),
         name='login'
     ),
-    path('signup/', views.SignUp.as_view(), name='signup'),
+    path(
+        'signup/',
+        throttle('signup')(views.SignUp.as_view()),
+        name='signup'
+    ),
     path('password_change/', PasswordChangeView.as_view(
          template_name='users/password_change_form.html'),
          name='password_change'),
     path('password_change/done/', PasswordChangeDoneView.as_view(
          template_name='users/password_change_done.html'),
          name='password_change_done'),
-    path('password_reset/', PasswordResetView.as_view(
-         template_name='users/password_reset_form.html'),
+    path('password_reset/', throttle('password_reset', 'email')(
+         PasswordResetView.as_view(
+             template_name='users/password_reset_form.html')),
          name='password_reset'),
     path('password_reset/done/', PasswordResetDoneView.as_view(
          template_name='users/password_reset_done.html'),
@@ -10,7 +10,11 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/2.2/ref/settings/
 """
 
+import importlib.util
 import os
+import tempfile
+
+from django.core.exceptions import ImproperlyConfigured
 
 # Build paths inside the project like this: os.path.join(BASE_DIR, ...)
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -40,20 +44,27 @@ INSTALLED_APPS = [
     'users.apps.UsersConfig',
     'core.apps.CoreConfig',
     'about.apps.AboutConfig',
+    'api.apps.ApiConfig',
     'django.contrib.admin',
     'django.contrib.auth',
     'django.contrib.contenttypes',
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.sitemaps',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.PostViewCountMiddleware',
+    'core.middleware.AnonymousPageCacheMiddleware',
+    'core.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.middleware.ProfilingMiddleware',
+    'core.middleware.SlowQueryLogMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -61,12 +72,21 @@ MIDDLEWARE = [
 ROOT_URLCONF = 'yatube.urls'
 
 TEMPLATES_DIR = os.path.join(BASE_DIR, 'templates')
+# Шаблоны проекта сжимаются при загрузке, скомпилированные шаблоны
+# кэшируются и при DEBUG: сжатие выполняется один раз на процесс.
+# Правки шаблонов видны после перезапуска сервера.
+TEMPLATE_LOADERS = [
+    ('django.template.loaders.cached.Loader', [
+        'core.template_loaders.MinifyingFilesystemLoader',
+        'django.template.loaders.app_directories.Loader',
+    ]),
+]
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [TEMPLATES_DIR],
-        'APP_DIRS': True,
         'OPTIONS': {
+            'loaders': TEMPLATE_LOADERS,
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
@@ -78,6 +98,30 @@ TEMPLATES = [
     },
 ]
 
+# Jinja2 - необязательный бэкенд для горячих шаблонов лент. Включается,
+# если пакет jinja2 установлен; view из YATUBE_JINJA2_VIEWS (через запятую:
+# index, group_posts, profile) рендерятся им вместо шаблонов Django.
+JINJA2_AVAILABLE = importlib.util.find_spec('jinja2') is not None
+POSTS_TEMPLATE_ENGINES = {}
+if JINJA2_AVAILABLE:
+    TEMPLATES.append({
+        'BACKEND': 'django.template.backends.jinja2.Jinja2',
+        'NAME': 'jinja2',
+        'DIRS': [os.path.join(BASE_DIR, 'jinja2')],
+        'OPTIONS': {
+            'environment': 'core.jinja2.environment',
+            'context_processors': [
+                'django.contrib.auth.context_processors.auth',
+                'core.context_processors.year.year',
+            ],
+        },
+    })
+    POSTS_TEMPLATE_ENGINES = {
+        view: 'jinja2'
+        for view in os.getenv('YATUBE_JINJA2_VIEWS', '').split(',')
+        if view
+    }
+
 WSGI_APPLICATION = 'yatube.wsgi.application'
 
 
@@ -91,6 +135,121 @@ DATABASES = {
     }
 }
 
+# Настраиваются при открытии соединения (core.db.configure_sqlite).
+SQLITE_JOURNAL_MODE = 'WAL'
+SQLITE_BUSY_TIMEOUT = 5000
+
+# Повторы коротких транзакций записи при "database is locked":
+# число повторов и первая задержка в секундах, далее она удваивается.
+DB_LOCK_RETRIES = 5
+DB_LOCK_BACKOFF = 0.05
+
+
+# Cache
+# https://docs.djangoproject.com/en/2.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'yatube',
+    }
+}
+
+# Защита от одновременного пересчёта (core/cache.py): сколько секунд
+# держится блокировка пересчёта, как часто ждущие проверяют кэш, сколько
+# секунд после мягкого срока можно отдавать устаревшее значение
+# и коэффициент раннего обновления XFetch (0 выключает).
+CACHE_LOCK_TIMEOUT = 10
+CACHE_LOCK_POLL = 0.02
+CACHE_STALE_TIMEOUT = 60
+CACHE_XFETCH_BETA = 1.0
+
+
+# Sessions
+# https://docs.djangoproject.com/en/2.2/topics/http/sessions/
+
+SESSION_ENGINES = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'core.session_store',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+}
+session_engine = os.getenv('YATUBE_SESSION_ENGINE', 'db')
+if session_engine not in SESSION_ENGINES:
+    raise ImproperlyConfigured(
+        f'YATUBE_SESSION_ENGINE={session_engine!r}: допустимы '
+        f'{", ".join(SESSION_ENGINES)}.'
+    )
+# cached_db в кэше процесса: выход или смена пароля в одном воркере
+# не сбросили бы сессию в кэшах остальных.
+if (
+    session_engine == 'cached_db'
+    and CACHES['default']['BACKEND'].endswith('LocMemCache')
+):
+    raise ImproperlyConfigured(
+        'YATUBE_SESSION_ENGINE=cached_db требует общего для процессов '
+        'кэша (Memcached, Redis), а не LocMemCache.'
+    )
+SESSION_ENGINE = SESSION_ENGINES[session_engine]
+SESSION_PURGE_BATCH_SIZE = 1000
+
+
+# Full-page cache for anonymous users
+# Время жизни страницы в секундах; 0 выключает кэш, чтобы при разработке
+# и в тестах ответы всегда рендерились заново.
+
+PAGE_CACHE_TIMEOUT = int(os.getenv('YATUBE_PAGE_CACHE_TIMEOUT', 0))
+PAGE_CACHE_NAMESPACES = ('posts', 'about')
+
+
+# Response compression
+
+COMPRESSION_MIN_SIZE = 1024
+COMPRESSION_GZIP_LEVEL = 6
+COMPRESSION_BROTLI_LEVEL = 5
+
+# Профилирование запросов сотрудников: ?_profile или заголовок X-Profile.
+PROFILING_PARAM = '_profile'
+PROFILING_HEADER = 'HTTP_X_PROFILE'
+PROFILE_DIR = os.path.join(BASE_DIR, 'profiles')
+PROFILE_KEEP = 100
+PROFILE_TOP_FUNCTIONS = 30
+
+# Запросы к БД дольше порога (мс) попадают в SlowQuery, 0 выключает лог.
+SLOW_QUERY_THRESHOLD = float(os.getenv('YATUBE_SLOW_QUERY_THRESHOLD', 100))
+SLOW_QUERY_NAMESPACES = ('posts', 'admin', 'users')
+
+# При YATUBE_WSGI_PRELOAD=1 wsgi.py строит URLconf и компилирует шаблоны
+# при импорте, то есть в мастере gunicorn --preload до fork воркеров.
+WSGI_PRELOAD = os.getenv('YATUBE_WSGI_PRELOAD') == '1'
+# При YATUBE_WSGI_WARM_CACHE=1 preload ещё и прогревает кэши страниц
+# (posts/warmup.py): с кэшем в памяти процесса воркеры получают его от fork.
+WSGI_WARM_CACHE = os.getenv('YATUBE_WSGI_WARM_CACHE') == '1'
+
+# Что прогревает warm_cache: первые страницы index и самые активные
+# за WARM_CACHE_MONTHS месяцев группы и авторы, в столько потоков.
+WARM_CACHE_INDEX_PAGES = 5
+WARM_CACHE_GROUPS = 10
+WARM_CACHE_AUTHORS = 20
+WARM_CACHE_MONTHS = 3
+WARM_CACHE_CONCURRENCY = 4
+# Host, с которым приходят клиенты: он входит в ключи полностраничного
+# кэша. Без него warm_cache и прогрев при старте не запускаются.
+WARM_CACHE_HOST = os.getenv('YATUBE_WARM_CACHE_HOST', '')
+
+
+# Password hashing
+# https://docs.djangoproject.com/en/2.2/topics/auth/passwords/
+
+PASSWORD_HASHERS = [
+    'users.hashers.ConfigurablePBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+]
+PASSWORD_HASH_ITERATIONS = int(
+    os.getenv('YATUBE_PASSWORD_HASH_ITERATIONS', 150000)
+)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/2.2/ref/settings/#auth-password-validators
@@ -135,5 +294,76 @@ STATICFILES_DIRS = (os.path.join(BASE_DIR, 'static'),)
 LOGIN_URL = 'users:login'
 LOGIN_REDIRECT_URL = 'posts:index'
 
-EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+# Корзины токенов для попыток входа, регистрации и сброса пароля:
+# (ёмкость корзины, секунд на её полное восстановление).
+# Считаются отдельно по IP и по имени пользователя.
+THROTTLE_RATES = {
+    'login': (10, 60),
+    'signup': (5, 60),
+    'password_reset': (5, 300),
+}
+THROTTLE_TRUST_X_FORWARDED_FOR = False
+
+FEED_SIZE = 20
+FEED_CACHE_TIMEOUT = 60 * 15
+
+# Фрагменты ленты для подгрузки (posts/fragments.py) кэшируются по курсору.
+FRAGMENT_CACHE_TIMEOUT = 60 * 15
+
+# Страницы index, group_list и profile в кэше компактными строками
+# (posts/rows.py); 0 выключает кэш, и в page_obj попадают модели Post.
+FEED_ROW_CACHE_TIMEOUT = int(os.getenv('YATUBE_FEED_ROW_CACHE_TIMEOUT', 0))
+
+# Просмотры постов копятся в памяти процесса (posts/counters.py) и пишутся
+# в БД, когда их набралось столько, и фоновым потоком раз в столько секунд.
+# Кэшированные post_detail и profile показывают просмотры на момент
+# последнего сброса; SIGKILL теряет накопленное с него.
+VIEW_COUNT_FLUSH_THRESHOLD = 100
+VIEW_COUNT_FLUSH_INTERVAL = 10
+VIEW_COUNT_FLUSH_THREAD = True
+
+# Окна популярного в днях и размер топа. Топ считает команда
+# compute_trending по расписанию; пока она не отработала, страница
+# популярного пуста.
+TRENDING_WINDOWS = {
+    'day': 1,
+    'week': 7,
+}
+TRENDING_SIZE = 10
+
+# Команда archive_posts переносит посты старше стольких дней в ArchivedPost.
+POST_ARCHIVE_AFTER_DAYS = 365
+POST_ARCHIVE_BATCH_SIZE = 1000
+
+# Сколько авторов и групп по имени/slug помнит каждый процесс и сколько
+# секунд. Сброс при правках доходит до других процессов только через общий
+# кэш (memcached, redis); с LocMemCache они видят переименование
+# не позже чем через LOOKUP_CACHE_MAX_AGE.
+LOOKUP_CACHE_SIZE = 1000
+LOOKUP_CACHE_MAX_AGE = 60
+
+SITEMAP_CHUNK_SIZE = 50000
+SITEMAP_CACHE_TIMEOUT = 60 * 60 * 24
+
+EMAIL_BACKEND = 'users.mail.OutboxEmailBackend'
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
+DEFAULT_FROM_EMAIL = 'noreply@yatube.ru'
+
+# Письма копятся в таблице OutboxEmail, команда send_outbox отправляет
+# их пачками через этот бэкенд.
+OUTBOX_DELIVERY_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+OUTBOX_BATCH_SIZE = 100
+OUTBOX_MAX_ATTEMPTS = 5
+OUTBOX_POLL_INTERVAL = 5
+# Через столько секунд письма упавшего воркера снова доступны другим.
+OUTBOX_CLAIM_TIMEOUT = 300
+
+# Тесты запускаются на копии снимка мигрированной БД, снимок
+# пересобирается при изменении миграций. TEST_SEED_SCALE > 0 заполняет
+# снимок данными для нагрузочных фикстур.
+TEST_RUNNER = 'core.testing.SnapshotTestRunner'
+TEST_SNAPSHOT_DIR = os.getenv(
+    'YATUBE_TEST_SNAPSHOT_DIR',
+    os.path.join(tempfile.gettempdir(), 'yatube-test-snapshots'),
+)
+TEST_SEED_SCALE = int(os.getenv('YATUBE_TEST_SEED_SCALE', 0))